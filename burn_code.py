@@ -1,24 +1,138 @@
 import time
+import atexit
 import argparse
+import logging
+import logging.handlers
+import queue
+import threading
 
 import bittensor as bt
+from bittensor.core.chain_data.utils import decode_account_id
 from bittensor_wallet import Wallet
 
 MAINNET_NETUID = 79
 BLOCK_TIME = 12
+BLOCKS_PER_DAY = 7200
+# Blocks to wait after inclusion before checking the weights were finalized.
+FINALITY_BLOCKS = 3
+# Seconds the finality watcher waits for GRANDPA to pass the inclusion block.
+FINALITY_TIMEOUT = 600
+U16_MAX = 65535
+# Upper bound in seconds for the reconnect backoff.
+MAX_RECONNECT_BACKOFF = 120
+
+# SubtensorModule storages read on every loop iteration, all keyed by netuid.
+SUBNET_STATE_STORAGES = (
+    "ValidatorPermit",
+    "Tempo",
+    "BlocksSinceLastStep",
+    "WeightsVersionKey",
+    "SubnetOwnerHotkey",
+    "SubnetworkN",
+)
+
+log = logging.getLogger("taocolosseum.burn")
+
+
+def setup_logging(level=logging.INFO):
+    """
+    Routes log records through a QueueHandler so the weight-setting loop never
+    blocks on stdout/journald writes; a QueueListener thread does the I/O.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
+    )
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    log.setLevel(level)
+    log.propagate = False
+    return listener
+
+
+def _to_ss58(account):
+    """Returns an ss58 address for an AccountId decoded either as str or raw bytes."""
+    if isinstance(account, str):
+        return account
+    return decode_account_id(account)
+
+
+def _decode_compact(raw):
+    """Decodes a SCALE compact integer prefix, returning (value, prefix length)."""
+    mode = raw[0] & 0b11
+    if mode == 0:
+        return raw[0] >> 2, 1
+    if mode == 1:
+        return int.from_bytes(raw[:2], "little") >> 2, 2
+    if mode == 2:
+        return int.from_bytes(raw[:4], "little") >> 2, 4
+    length = (raw[0] >> 2) + 4
+    return int.from_bytes(raw[1 : 1 + length], "little"), 1 + length
+
+
+def _bool_vec_view(raw):
+    """
+    Returns a zero-copy view over the elements of a SCALE Vec<bool> (compact
+    length, then one byte per element), so a single index costs O(1) without
+    materializing the whole vector. Indexing yields 0/1.
+    """
+    length, offset = _decode_compact(raw)
+    return memoryview(raw)[offset : offset + length]
+
+
+def _decode_uint(raw):
+    """Decodes a little-endian SCALE fixed-width unsigned integer (u16/u64)."""
+    return int.from_bytes(raw, "little")
+
+
+# Raw-bytes decoders for SUBNET_STATE_STORAGES.
+_STATE_DECODERS = {
+    "ValidatorPermit": _bool_vec_view,
+    "Tempo": _decode_uint,
+    "BlocksSinceLastStep": _decode_uint,
+    "WeightsVersionKey": _decode_uint,
+    "SubnetOwnerHotkey": _to_ss58,
+    "SubnetworkN": _decode_uint,
+}
 
 
 class TempValidator:
     def __init__(self):
         self.config = self.get_config()
+        setup_logging(self.config.log_level)
 
         # Initialize wallet.
         self.wallet = Wallet(config=self.config)
-        print(f"Wallet: {self.wallet}")
+        log.info("Wallet: %s", self.wallet)
 
         # Initialize subtensor.
         self.subtensor = bt.subtensor(config=self.config)
-        print(f"Subtensor: {self.subtensor}")
+        log.info("Subtensor: %s", self.subtensor)
+
+        # Owner hotkey -> UID resolution, re-checked on hotkey change or daily.
+        self._burn_cache = {"hotkey": None, "uid": None, "expires_block": 0}
+
+        # Latest chain head seen by the block header subscription, and when.
+        self._last_block = 0
+        self._last_block_time = 0.0
+
+        # Composed set_weights call, keyed by (burn_uid, version_key).
+        self._weights_call = None
+
+        # Set by the finality watcher when the weights block was not finalized
+        # on the canonical chain; ends the interval wait so they are resubmitted.
+        self._rebroadcast = threading.Event()
+
+        # Storage keys for the per-iteration state read, built once.
+        self.subtensor.substrate.init_runtime()
+        self._state_keys = self._build_state_keys()
+
+        # This validator's UID; None until registered, reset on deregistration.
+        self._this_uid = self.get_this_uid()
 
     def get_config(self):
         # Set up the configuration parser.
@@ -44,6 +158,14 @@ class TempValidator:
             help="The interval to set weights in blocks.",
         )
 
+        run_command_parser.add_argument(
+            "--log_level",
+            type=str.upper,
+            default="INFO",
+            choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+            help="Log level for validator output.",
+        )
+
         # Adds subtensor specific arguments.
         bt.subtensor.add_args(run_command_parser)
         # Adds wallet specific arguments.
@@ -53,117 +175,442 @@ class TempValidator:
         try:
             config = bt.config(parser)
         except ValueError as e:
-            print(f"Error parsing config: {e}")
+            log.error("Error parsing config: %s", e)
             exit(1)
 
         return config
 
-    def get_burn_uid(self):
-        # Get the subtensor owner hotkey
-        sn_owner_hotkey = self.subtensor.query_subtensor(
-            "SubnetOwnerHotkey",
-            params=[self.config.netuid],
+    def _build_state_keys(self):
+        """
+        Builds the StorageKeys for SUBNET_STATE_STORAGES against the current
+        runtime, keyed by their hex encoding as returned by state_queryStorageAt.
+        """
+        substrate = self.subtensor.substrate
+        storage_keys = (
+            substrate.create_storage_key(
+                "SubtensorModule", storage_function, [self.config.netuid]
+            )
+            for storage_function in SUBNET_STATE_STORAGES
         )
-        print(f"SN Owner Hotkey: {sn_owner_hotkey}")
+        return {storage_key.to_hex(): storage_key for storage_key in storage_keys}
+
+    def _query_state_raw(self, block_hash):
+        """Returns {storage_function: raw bytes or None} from one state_queryStorageAt call."""
+        response = self.subtensor.substrate.rpc_request(
+            "state_queryStorageAt", [list(self._state_keys), block_hash]
+        )
+        raw = {}
+        for change_set in response["result"]:
+            for key_hex, value_hex in change_set["changes"]:
+                storage_key = self._state_keys.get(key_hex)
+                if storage_key is not None and value_hex is not None:
+                    raw[storage_key.storage_function] = bytes.fromhex(value_hex[2:])
+        return raw
+
+    def query_subnet_state(self, block=None):
+        """
+        Reads every per-iteration subnet storage in one state_queryStorageAt
+        round-trip, pinned to a single block hash so the values are consistent.
+
+        The storages have fixed SCALE layouts, so the raw bytes are decoded
+        directly; the metadata-driven decoder is only used when an entry is
+        unset and its default has to come from the runtime.
+
+        Args:
+            block: Block to read at. Defaults to the current chain head.
+
+        Returns:
+            dict: Decoded values keyed by storage name, plus "block".
+        """
+        substrate = self.subtensor.substrate
+        if block is None:
+            block = self.current_block()
+        block_hash = substrate.get_block_hash(block)
+
+        try:
+            raw = self._query_state_raw(block_hash)
+        except Exception:
+            # Keys may be stale after a runtime upgrade; rebuild once and retry.
+            substrate.init_runtime(block_hash=block_hash)
+            self._state_keys = self._build_state_keys()
+            raw = self._query_state_raw(block_hash)
+
+        state = {"block": block}
+        if len(raw) == len(SUBNET_STATE_STORAGES):
+            for storage_function, value in raw.items():
+                state[storage_function] = _STATE_DECODERS[storage_function](value)
+            return state
+
+        for storage_key, value in substrate.query_multi(
+            list(self._state_keys.values()), block_hash=block_hash
+        ):
+            state[storage_key.storage_function] = getattr(value, "value", value)
+        state["SubnetOwnerHotkey"] = _to_ss58(state["SubnetOwnerHotkey"])
+        return state
+
+    def get_this_uid(self):
+        """Resolves this validator's UID on the subnet (None if not registered)."""
+        return self.subtensor.get_uid_for_hotkey_on_subnet(
+            hotkey_ss58=self.wallet.hotkey.ss58_address,
+            netuid=self.config.netuid,
+        )
+
+    def get_burn_uid(self, sn_owner_hotkey=None, curr_block=None):
+        """
+        Returns the subnet owner's UID, resolving it over RPC only when the
+        owner hotkey changes or the cached entry is older than a day.
+
+        Args:
+            sn_owner_hotkey: Owner hotkey if already known (e.g. from the batched
+                state read). Queried when omitted.
+            curr_block: Current block, used for cache expiry.
+        """
+        cache = self._burn_cache
+        if curr_block is None:
+            curr_block = self.current_block()
+
+        if sn_owner_hotkey is None:
+            if cache["uid"] is not None and curr_block < cache["expires_block"]:
+                return cache["uid"]
+            # Get the subtensor owner hotkey
+            sn_owner_hotkey = _to_ss58(
+                self.subtensor.query_subtensor(
+                    "SubnetOwnerHotkey",
+                    params=[self.config.netuid],
+                )
+            )
+
+        if (
+            sn_owner_hotkey == cache["hotkey"]
+            and cache["uid"] is not None
+            and curr_block < cache["expires_block"]
+        ):
+            return cache["uid"]
+
+        log.debug("SN Owner Hotkey: %s", sn_owner_hotkey)
 
         # Get the UID of this hotkey
         sn_owner_uid = self.subtensor.get_uid_for_hotkey_on_subnet(
             hotkey_ss58=sn_owner_hotkey,
             netuid=self.config.netuid,
         )
-        print(f"SN Owner UID: {sn_owner_uid}")
+        log.info("SN Owner UID: %s", sn_owner_uid)
+
+        cache["hotkey"] = sn_owner_hotkey
+        cache["uid"] = sn_owner_uid
+        cache["expires_block"] = curr_block + BLOCKS_PER_DAY
 
         return sn_owner_uid
 
-    def run(self):
-        print("Running validator...")
+    def _get_set_weights_call(self, burn_uid, version_key):
+        """Returns the composed set_weights call, recomposing only when its inputs change."""
+        key = (burn_uid, version_key)
+        if self._weights_call is None or self._weights_call[0] != key:
+            call = self.subtensor.substrate.compose_call(
+                call_module="SubtensorModule",
+                call_function="set_weights",
+                call_params={
+                    "dests": [burn_uid],
+                    "weights": [U16_MAX],
+                    "netuid": self.config.netuid,
+                    "version_key": version_key,
+                },
+            )
+            self._weights_call = (key, call)
+        return self._weights_call[1]
 
-        while True:
-            print("Running validator loop...")
+    def set_burn_weights(self, burn_uid, version_key):
+        """
+        Submits the full weight to the burn UID, waiting for inclusion only.
+        Finality is checked separately so the loop is not held for it.
 
-            # Check if registered.
-            registered = self.subtensor.is_hotkey_registered_on_subnet(
-                hotkey_ss58=self.wallet.hotkey.ss58_address,
-                netuid=self.config.netuid,
-            )
-            print(f"Registered: {registered}")
-
-            if not registered:
-                print("Not registered, skipping...")
-                time.sleep(10)
-                continue
-
-            # Check Validator Permit
-            validator_permits = self.subtensor.query_subtensor(
-                "ValidatorPermit",
-                params=[self.config.netuid],
-            ).value
-            this_uid = self.subtensor.get_uid_for_hotkey_on_subnet(
-                hotkey_ss58=self.wallet.hotkey.ss58_address,
-                netuid=self.config.netuid,
+        Falls back to subtensor.set_weights if the direct extrinsic cannot be
+        submitted (e.g. when commit-reveal is enabled on the subnet).
+
+        Returns:
+            tuple: (success, message, block_hash). block_hash is None when the
+                fallback path was used.
+        """
+        substrate = self.subtensor.substrate
+        try:
+            call = self._get_set_weights_call(burn_uid, version_key)
+            extrinsic = substrate.create_signed_extrinsic(
+                call=call, keypair=self.wallet.hotkey, era={"period": 5}
             )
-            print(f"Validator UID: {this_uid}")
-            print(f"Validator Permit: {validator_permits[this_uid]}")
-            if not validator_permits[this_uid]:
-                print("No Validator Permit, wait until next epoch...")
-                curr_block = self.subtensor.get_current_block()
-                tempo = self.subtensor.query_subtensor(
-                    "Tempo",
-                    params=[self.config.netuid],
-                ).value
-                print(f"Tempo: {tempo}")
-                blocks_since_last_step = self.subtensor.query_subtensor(
-                    "BlocksSinceLastStep",
-                    block=curr_block,
-                    params=[self.config.netuid],
-                ).value
-                print(f"Blocks Since Last Step: {blocks_since_last_step}")
-                time_to_wait = (tempo - blocks_since_last_step) * BLOCK_TIME + 0.1
-                print(f"Sleeping until next epoch, {time_to_wait} seconds...")
-                time.sleep(time_to_wait)
-                continue
-
-            # Get the weights version key.
-            version_key = self.subtensor.query_subtensor(
-                "WeightsVersionKey",
-                params=[self.config.netuid],
-            ).value
-            print(f"Weights Version Key: {version_key}")
-
-            # Get the burn UID.
-            burn_uid = self.get_burn_uid()
-            subnet_n = self.subtensor.query_subtensor(
-                "SubnetworkN",
-                params=[self.config.netuid],
-            ).value
-            print(f"Subnet N: {subnet_n}")
-
-            # Set weights to burn UID.
-            uids = [burn_uid]
-            weights = [1.0]
-
-            # Set weights.
-            success, message = self.subtensor.set_weights(
-                self.wallet,
-                self.config.netuid,
-                uids,
-                weights,
-                version_key=version_key,
-                wait_for_inclusion=True,
-                wait_for_finalization=True,
+            response = substrate.submit_extrinsic(
+                extrinsic, wait_for_inclusion=True, wait_for_finalization=False
             )
-            if not success:
-                print(f"Error setting weights: {message}")
-                time.sleep(10)
-                continue
+            if response.is_success:
+                return True, "", response.block_hash
+            message = response.error_message
+        except Exception as e:
+            message = str(e)
+
+        log.warning("Direct set_weights failed: %s, retrying via subtensor...", message)
+        success, message = self.subtensor.set_weights(
+            self.wallet,
+            self.config.netuid,
+            [burn_uid],
+            [1.0],
+            version_key=version_key,
+            wait_for_inclusion=True,
+            wait_for_finalization=False,
+        )
+        return success, message, None
+
+    def watch_finality(self, block_hash, included_block):
+        """
+        Waits on a daemon thread until the finalized head reaches included_block,
+        then requests a rebroadcast if a different block was finalized at that
+        height. Uses its own connection, since the main loop's websocket is busy
+        with the header subscription.
+        """
+
+        def watch():
+            subtensor = None
+            try:
+                subtensor = bt.subtensor(config=self.config)
+                substrate = subtensor.substrate
+                time.sleep(FINALITY_BLOCKS * BLOCK_TIME)
+                deadline = time.monotonic() + FINALITY_TIMEOUT
+                while (
+                    substrate.get_block_number(substrate.get_chain_finalised_head())
+                    < included_block
+                ):
+                    if time.monotonic() >= deadline:
+                        log.warning(
+                            "Block %s not finalized after %ss, not rebroadcasting.",
+                            included_block,
+                            FINALITY_TIMEOUT,
+                        )
+                        return
+                    time.sleep(BLOCK_TIME)
+                if substrate.get_block_hash(included_block) == block_hash:
+                    log.info("Weights finalized in block %s.", included_block)
+                else:
+                    log.warning(
+                        "Weights block %s was not finalized, rebroadcasting...",
+                        included_block,
+                    )
+                    self._rebroadcast.set()
+            except Exception as e:
+                log.warning("Finality check failed: %s", e)
+            finally:
+                if subtensor is not None:
+                    try:
+                        subtensor.close()
+                    except Exception:
+                        pass
+
+        threading.Thread(target=watch, name="finality-watch", daemon=True).start()
+
+    def current_block(self):
+        """
+        Returns the chain head, reusing the block last seen by the header
+        subscription when it is less than one block old instead of an RPC.
+        """
+        if time.monotonic() - self._last_block_time < BLOCK_TIME:
+            return self._last_block
+        self._last_block = self.subtensor.get_current_block()
+        self._last_block_time = time.monotonic()
+        return self._last_block
+
+    def wait_for_block(self, target_block, max_wait):
+        """
+        Blocks until the chain head reaches target_block, waking on new block
+        headers rather than sleeping a fixed wall-clock duration.
 
-            print("Weights set.")
+        The subscription runs on a worker thread and the caller waits on an
+        Event, so max_wait holds even if no header ever arrives (stalled chain
+        or a silent websocket). On timeout the connection is replaced, which
+        also unblocks the worker.
 
-            # Wait for next time to set weights.
-            print(
-                f"Waiting {self.config.set_weights_interval} blocks before next weight set..."
+        Args:
+            target_block: Block number to wait for.
+            max_wait: Safety ceiling in seconds in case block production stalls.
+
+        Returns:
+            int: The last block number seen.
+        """
+        deadline = time.monotonic() + max_wait
+        done = threading.Event()
+        cancelled = threading.Event()
+        failure = []
+        substrate = self.subtensor.substrate
+
+        def handler(obj, update_nr, subscription_id):
+            self._last_block = obj["header"]["number"]
+            self._last_block_time = time.monotonic()
+            if (
+                self._last_block >= target_block
+                or cancelled.is_set()
+                or self._rebroadcast.is_set()
+            ):
+                return self._last_block
+            return None
+
+        def subscribe():
+            try:
+                substrate.subscribe_block_headers(handler)
+            except Exception as e:
+                if not cancelled.is_set():
+                    failure.append(e)
+            finally:
+                done.set()
+
+        threading.Thread(target=subscribe, name="block-headers", daemon=True).start()
+
+        if not done.wait(max_wait):
+            cancelled.set()
+            log.warning(
+                "Block %s not reached within %ss, reconnecting...", target_block, max_wait
+            )
+            self.reconnect()
+            done.wait(BLOCK_TIME)
+        elif failure:
+            log.warning(
+                "Block header subscription failed: %s, falling back to sleep...",
+                failure[0],
             )
-            time.sleep(self.config.set_weights_interval * BLOCK_TIME)
+            remaining = max(target_block - self._last_block, 0) * BLOCK_TIME
+            time.sleep(min(remaining, max(deadline - time.monotonic(), 0)))
+
+        return self._last_block
+
+    def wait_for_registration(self):
+        """
+        Blocks until this hotkey holds a UID on the subnet by subscribing to its
+        Uids storage entry, instead of re-polling the registration RPC.
+
+        Connection errors propagate to run(), which reconnects and retries.
+
+        Returns:
+            int: The newly assigned UID.
+        """
+
+        def handler(obj, update_nr, subscription_id):
+            uid = getattr(obj, "value", obj)
+            if uid is not None:
+                return uid
+            return None
+
+        return self.subtensor.substrate.query(
+            "SubtensorModule",
+            "Uids",
+            [self.config.netuid, self.wallet.hotkey.ss58_address],
+            subscription_handler=handler,
+        )
+
+    def reconnect(self):
+        """Replaces the substrate connection and rebuilds runtime-bound state."""
+        try:
+            self.subtensor.close()
+        except Exception:
+            pass
+        self.subtensor = bt.subtensor(config=self.config)
+        log.info("Subtensor: %s", self.subtensor)
+        self.subtensor.substrate.init_runtime()
+        self._state_keys = self._build_state_keys()
+        self._weights_call = None
+
+    def run(self):
+        log.info("Running validator...")
+
+        # All RPCs share the subtensor's single websocket; on connection errors
+        # replace it with exponential backoff rather than crashing the process.
+        backoff = 1
+        while True:
+            try:
+                self.run_once()
+                backoff = 1
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                log.error(
+                    "Validator loop error: %s, reconnecting in %ss...", e, backoff
+                )
+                time.sleep(backoff)
+                backoff = min(backoff * 2, MAX_RECONNECT_BACKOFF)
+                try:
+                    self.reconnect()
+                except Exception as e:
+                    log.error("Reconnect failed: %s", e)
+
+    def run_once(self):
+        log.debug("Running validator loop...")
+
+        # Check if registered.
+        registered = self.subtensor.is_hotkey_registered_on_subnet(
+            hotkey_ss58=self.wallet.hotkey.ss58_address,
+            netuid=self.config.netuid,
+        )
+        log.debug("Registered: %s", registered)
+
+        if not registered:
+            log.info("Not registered, waiting for registration...")
+            self._this_uid = self.wait_for_registration()
+            log.info("Registered with UID %s", self._this_uid)
+            return
+
+        # Read all subnet state for this iteration in one round-trip.
+        state = self.query_subnet_state()
+
+        # Check Validator Permit
+        validator_permits = state["ValidatorPermit"]
+        if self._this_uid is None:
+            self._this_uid = self.get_this_uid()
+        this_uid = self._this_uid
+        has_permit = this_uid < len(validator_permits) and bool(
+            validator_permits[this_uid]
+        )
+        log.debug("Validator UID: %s", this_uid)
+        log.debug("Validator Permit: %s", has_permit)
+        if not has_permit:
+            log.info("No Validator Permit, wait until next epoch...")
+            tempo = state["Tempo"]
+            log.debug("Tempo: %s", tempo)
+            blocks_since_last_step = state["BlocksSinceLastStep"]
+            log.debug("Blocks Since Last Step: %s", blocks_since_last_step)
+            blocks_to_wait = max(tempo - blocks_since_last_step, 1)
+            target_block = state["block"] + blocks_to_wait
+            log.info("Waiting until next epoch at block %s...", target_block)
+            self.wait_for_block(target_block, blocks_to_wait * BLOCK_TIME * 2)
+            return
+
+        # Get the weights version key.
+        version_key = state["WeightsVersionKey"]
+        log.debug("Weights Version Key: %s", version_key)
+
+        # Get the burn UID.
+        burn_uid = self.get_burn_uid(
+            state["SubnetOwnerHotkey"], curr_block=state["block"]
+        )
+        subnet_n = state["SubnetworkN"]
+        log.debug("Subnet N: %s", subnet_n)
+
+        # Set weights to burn UID.
+        self._rebroadcast.clear()
+        success, message, block_hash = self.set_burn_weights(
+            burn_uid, version_key
+        )
+        if not success:
+            log.error("Error setting weights: %s", message)
+            time.sleep(10)
+            return
+
+        log.info("Weights set.")
+
+        # Confirm finality in the background; a dropped block cuts the wait short.
+        if block_hash is not None:
+            included_block = self.subtensor.substrate.get_block_number(block_hash)
+            self.watch_finality(block_hash, included_block)
+
+        # Wait for next time to set weights.
+        interval = self.config.set_weights_interval
+        log.info("Waiting %s blocks before next weight set...", interval)
+        self.wait_for_block(state["block"] + interval, interval * BLOCK_TIME * 2)
+        if self._rebroadcast.is_set():
+            log.info("Resubmitting weights after finality check.")
 
 
 if __name__ == "__main__":
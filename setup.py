@@ -1,17 +1,24 @@
 # The MIT License (MIT)
 # Copyright © 2026 TAO Colosseum
 
-import re
+import ast
+from pathlib import Path
 from setuptools import setup, find_packages
 
+CONST_PATH = Path(__file__).parent / "taocolosseum" / "core" / "const.py"
+
 
 def get_version():
     """Read VERSION from const.py without importing the package."""
-    with open("taocolosseum/core/const.py") as f:
-        match = re.search(r'VERSION\s*=\s*"([^"]+)"', f.read())
-    if not match:
-        raise RuntimeError("VERSION not found in taocolosseum/core/const.py")
-    return match.group(1)
+    tree = ast.parse(CONST_PATH.read_text())
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and any(getattr(t, "id", None) == "VERSION" for t in node.targets)
+            and isinstance(node.value, ast.Constant)
+        ):
+            return node.value.value
+    raise RuntimeError("VERSION not found in taocolosseum/core/const.py")
 
 
 setup(
@@ -28,7 +35,9 @@ setup(
         "web3>=6.0.0",
         "eth-account>=0.10.0",
         "fastapi>=0.100.0",
-        "uvicorn>=0.23.0",
+        "uvicorn[standard]>=0.23.0",
+        "orjson>=3.9",
+        "websockets>=11",
         "substrate-interface",
     ],
     entry_points={
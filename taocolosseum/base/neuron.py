@@ -17,6 +17,7 @@
 
 import copy
 import typing
+import threading
 
 import bittensor as bt
 
@@ -54,9 +55,13 @@ class BaseNeuron(ABC):
     metagraph: "bt.Metagraph"
     spec_version: int = spec_version
 
+    # Serializes block refreshes so concurrent readers share one RPC
+    _block_lock = threading.Lock()
+
     @property
     def block(self):
-        return ttl_get_block(self)
+        with self._block_lock:
+            return ttl_get_block(self)
 
     def __init__(self, config=None):
         base_config = copy.deepcopy(config or BaseNeuron.config())
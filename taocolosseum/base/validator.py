@@ -17,6 +17,7 @@
 # DEALINGS IN THE SOFTWARE.
 
 
+import os
 import copy
 import numpy as np
 import asyncio
@@ -26,6 +27,7 @@ import bittensor as bt
 
 from typing import List, Union, Dict
 from traceback import print_exception
+from concurrent.futures import ThreadPoolExecutor
 
 from taocolosseum.base.neuron import BaseNeuron
 from taocolosseum.base.utils.weight_utils import (
@@ -36,7 +38,7 @@ from taocolosseum.utils.config import add_validator_args
 
 # TAO Colosseum imports
 from taocolosseum.validator.database import init_db, save_snapshot
-from taocolosseum.validator.api import start_api_server
+from taocolosseum.validator.api import start_api_server, invalidate_latest_snapshot
 from taocolosseum.core.const import API_PORT
 
 
@@ -88,8 +90,13 @@ class BaseValidatorNeuron(BaseNeuron):
 
         # ===== TAO Colosseum: Initialize volume tracking =====
         self.miner_volumes: Dict[int, float] = {}  # UID -> weighted volume
-        self.miner_daily_volumes: Dict[int, List[float]] = {}  # UID -> [day0, day1, ...]
+        # Row per UID: [day0, day1, ..., day6]
+        self.daily_vol_matrix = np.zeros((self.metagraph.n, 7), dtype=np.float64)
         self.miner_evm_addresses: Dict[int, str] = {}  # UID -> EVM address
+        # Same volumes as parallel numpy arrays (UIDs, weighted volume), for the API
+        self.miner_volumes_uids = np.zeros(0, dtype=np.int64)
+        self.miner_volumes_arr = np.zeros(0, dtype=np.float64)
+        self.miner_volume_totals: Dict[str, float] = {"total": 0.0, "nonzero_count": 0}
         
         # ===== TAO Colosseum: Initialize database =====
         bt.logging.info("Initializing TAO Colosseum database...")
@@ -97,6 +104,8 @@ class BaseValidatorNeuron(BaseNeuron):
             init_db()
         except Exception as e:
             bt.logging.error(f"Failed to initialize database: {e}")
+        # Snapshots are written off the weight-setting path, one at a time in commit order
+        self.snapshot_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot-writer")
 
         # Init sync with the network. Updates the metagraph.
         self.sync()
@@ -107,21 +116,22 @@ class BaseValidatorNeuron(BaseNeuron):
         else:
             bt.logging.warning("axon off, not serving ip to chain.")
 
+        # Create asyncio event loop to manage async tasks.
+        self.loop = asyncio.get_event_loop()
+
         # ===== TAO Colosseum: Start API server =====
+        # Served on self.loop; it starts accepting connections once run() drives the loop.
         if not getattr(self.config.neuron, 'disable_api', False):
             api_port = getattr(self.config.neuron, 'api_port', API_PORT)
             bt.logging.info(f"Starting API server on port {api_port}...")
             try:
-                self.api_thread = start_api_server(self, port=api_port)
+                self.api_server = start_api_server(self, port=api_port)
             except Exception as e:
                 bt.logging.error(f"Failed to start API server: {e}")
-                self.api_thread = None
+                self.api_server = None
         else:
             bt.logging.info("API server disabled")
-            self.api_thread = None
-
-        # Create asyncio event loop to manage async tasks.
-        self.loop = asyncio.get_event_loop()
+            self.api_server = None
 
         # Instantiate runners
         self.should_exit: bool = False
@@ -186,29 +196,41 @@ class BaseValidatorNeuron(BaseNeuron):
 
         bt.logging.info(f"Validator starting at block: {self.block}")
 
+        # The loop runs for the validator's lifetime, shared with the API server.
+        try:
+            self.loop.run_until_complete(self.run_async())
+
+        # If someone intentionally stops the validator, it'll safely terminate operations.
+        except KeyboardInterrupt:
+            self.axon.stop()
+            bt.logging.success("Validator killed by keyboard interrupt.")
+            exit()
+
+    async def run_async(self):
+        """
+        Validator step loop, run on self.loop alongside the API server.
+
+        Blocking chain calls (block lookup, metagraph sync, set_weights) go
+        through worker threads so API requests keep being served meanwhile.
+        """
         # This loop maintains the validator's operations until intentionally stopped.
         while True:
             try:
-                bt.logging.info(f"step({self.step}) block({self.block})")
+                block = await asyncio.to_thread(lambda: self.block)
+                bt.logging.info(f"step({self.step}) block({block})")
 
                 # Run multiple forwards concurrently.
-                self.loop.run_until_complete(self.concurrent_forward())
+                await self.concurrent_forward()
 
                 # Check if we should exit.
                 if self.should_exit:
                     break
 
                 # Sync metagraph and potentially set weights.
-                self.sync()
+                await asyncio.to_thread(self.sync)
 
                 self.step += 1
 
-            # If someone intentionally stops the validator, it'll safely terminate operations.
-            except KeyboardInterrupt:
-                self.axon.stop()
-                bt.logging.success("Validator killed by keyboard interrupt.")
-                exit()
-
             # In case of unforeseen errors, the validator will log the error and continue operations.
             except Exception as err:
                 bt.logging.error(f"Error during validation: {str(err)}")
@@ -216,6 +238,14 @@ class BaseValidatorNeuron(BaseNeuron):
                     str(print_exception(type(err), err, err.__traceback__))
                 )
 
+        if self.api_server is not None:
+            # Let in-flight API requests finish before the loop stops
+            self.api_server.should_exit = True
+            try:
+                await asyncio.wrap_future(self.api_server.serve_future)
+            except Exception as e:
+                bt.logging.warning(f"API server shutdown error: {e}")
+
     def run_in_background_thread(self):
         """
         Starts the validator's operations in a background thread upon entering the context.
@@ -238,6 +268,8 @@ class BaseValidatorNeuron(BaseNeuron):
             self.should_exit = True
             self.thread.join(5)
             self.is_running = False
+            # Let queued snapshots finish writing
+            self.snapshot_writer.shutdown(wait=True)
             bt.logging.debug("Stopped")
 
     def __enter__(self):
@@ -262,6 +294,8 @@ class BaseValidatorNeuron(BaseNeuron):
             self.should_exit = True
             self.thread.join(5)
             self.is_running = False
+            # Let queued snapshots finish writing
+            self.snapshot_writer.shutdown(wait=True)
             bt.logging.debug("Stopped")
 
     def set_weights(self):
@@ -330,25 +364,48 @@ class BaseValidatorNeuron(BaseNeuron):
             
             # ===== TAO Colosseum: Save snapshot after successful weight setting =====
             try:
-                scores_dict = {
-                    int(uid): float(self.scores[uid]) 
-                    for uid in range(len(self.scores))
-                }
-                volumes_dict = {
-                    int(uid): float(vol) 
-                    for uid, vol in self.miner_volumes.items()
-                }
-                save_snapshot(
-                    block_number=self.block,
-                    scores=scores_dict,
-                    volumes=volumes_dict
+                self.snapshot_writer.submit(
+                    self._save_snapshot, self.block, self.scores.copy(), dict(self.miner_volumes)
                 )
-                bt.logging.info(f"Snapshot saved at block {self.block}")
             except Exception as e:
                 bt.logging.error(f"Failed to save snapshot: {e}")
         else:
             bt.logging.error("set_weights failed", msg)
 
+    def _save_snapshot(self, block: int, scores: np.ndarray, volumes: Dict[int, float]):
+        """Persist a weight snapshot (runs on the snapshot writer thread)."""
+        try:
+            scores_dict = dict(enumerate(scores.tolist()))
+            volumes_dict = {
+                int(uid): float(vol) 
+                for uid, vol in volumes.items()
+            }
+            save_snapshot(
+                block_number=block,
+                scores=scores_dict,
+                volumes=volumes_dict
+            )
+            invalidate_latest_snapshot()
+            bt.logging.info(f"Snapshot saved at block {block}")
+        except Exception as e:
+            bt.logging.error(f"Failed to save snapshot: {e}")
+
+    @property
+    def miner_daily_volumes(self) -> Dict[int, List[float]]:
+        """UID -> [day0, day1, ...], built from daily_vol_matrix for the API."""
+        return dict(enumerate(self.daily_vol_matrix.tolist()))
+
+    def update_volume_totals(self):
+        """Rebuild the volume arrays and summary served by /volumes and /stats."""
+        n = len(self.miner_volumes)
+        uids = np.fromiter(self.miner_volumes.keys(), dtype=np.int64, count=n)
+        volumes = np.fromiter(self.miner_volumes.values(), dtype=np.float64, count=n)
+        self.miner_volumes_uids, self.miner_volumes_arr = uids, volumes
+        self.miner_volume_totals = {
+            "total": float(volumes.sum()),
+            "nonzero_count": int(np.count_nonzero(volumes > 0)),
+        }
+
     def resync_metagraph(self):
         """Resyncs the metagraph and updates the hotkeys and moving averages based on the new metagraph."""
         #bt.logging.info("resync_metagraph()")
@@ -372,8 +429,10 @@ class BaseValidatorNeuron(BaseNeuron):
                 self.scores[uid] = 0  # hotkey has been replaced
                 # TAO Colosseum: Also clear volume data for replaced hotkeys
                 self.miner_volumes.pop(uid, None)
-                self.miner_daily_volumes.pop(uid, None)
+                if uid < len(self.daily_vol_matrix):
+                    self.daily_vol_matrix[uid] = 0
                 self.miner_evm_addresses.pop(uid, None)
+        self.update_volume_totals()
 
         # Check to see if the metagraph has changed size.
         # If so, we need to add new hotkeys and moving averages.
@@ -384,6 +443,11 @@ class BaseValidatorNeuron(BaseNeuron):
             new_moving_average[:min_len] = self.scores[:min_len]
             self.scores = new_moving_average
 
+            new_daily_vol_matrix = np.zeros((self.metagraph.n, 7), dtype=np.float64)
+            min_len = min(len(self.hotkeys), len(self.daily_vol_matrix))
+            new_daily_vol_matrix[:min_len] = self.daily_vol_matrix[:min_len]
+            self.daily_vol_matrix = new_daily_vol_matrix
+
         # Update the hotkeys.
         self.hotkeys = list(self.metagraph.hotkeys)
 
@@ -438,20 +502,25 @@ class BaseValidatorNeuron(BaseNeuron):
         """Saves the state of the validator to a file."""
         bt.logging.info("Saving validator state.")
 
-        # Save the state of the validator to file.
-        np.savez(
-            self.config.neuron.full_path + "/state.npz",
-            step=self.step,
-            scores=self.scores,
-            hotkeys=self.hotkeys,
-        )
+        # Save the state of the validator to file. Written beside the old state and
+        # swapped in, so a crash mid-write never leaves a truncated state.npz.
+        path = self.config.neuron.full_path + "/state.npz"
+        with open(path + ".tmp", "wb") as f:
+            np.savez(
+                f,
+                step=self.step,
+                scores=self.scores,
+                hotkeys=self.hotkeys,
+            )
+        os.replace(path + ".tmp", path)
 
     def load_state(self):
         """Loads the state of the validator from a file."""
         bt.logging.info("Loading validator state.")
 
-        # Load the state of the validator from file.
-        state = np.load(self.config.neuron.full_path + "/state.npz")
-        self.step = state["step"]
-        self.scores = state["scores"]
-        self.hotkeys = state["hotkeys"]
+        # Load the state of the validator from file. Plain .npy members, no
+        # pickling; the archive is closed once the arrays are read.
+        with np.load(self.config.neuron.full_path + "/state.npz") as state:
+            self.step = int(state["step"])
+            self.scores = state["scores"]
+            self.hotkeys = state["hotkeys"]
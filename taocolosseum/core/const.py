@@ -5,26 +5,30 @@
 
 import os
 
-# Load .env from current directory (or parent) so env vars override defaults below
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+import numpy as np
+
+from taocolosseum.core.env import bootstrap_env
+
+# Env vars below are read at import time, so .env must be loaded first
+# (no-op if an entry point already bootstrapped it)
+bootstrap_env()
 
 # Subnet version — change this single value to update version everywhere
 # (setup.py, __init__.py, API, etc.)
 VERSION = "2.0.0"
 
 # RPC and contract: use env vars from .env if set, else these defaults
-# (see .env.example for TAO_COLOSSEUM_CONTRACT_ADDRESS, BITTENSOR_EVM_RPC, BITTENSOR_EVM_CHAIN_ID)
+# (see .env.example for TAO_COLOSSEUM_CONTRACT_ADDRESS, BITTENSOR_EVM_RPC, BITTENSOR_EVM_CHAIN_ID,
+# BITTENSOR_EVM_WS_RPC)
 _DEFAULT_CONTRACT = "0x2866c1f38629E3391614E54d1b63A7D0d3Ec2cDB"
 _DEFAULT_RPC = "https://archive.chain.opentensor.ai"
 _DEFAULT_CHAIN_ID = 964
 
 def _env(key: str, default: str) -> str:
-    v = os.environ.get(key, default)
-    return (v or default).strip().strip('"\'') or default
+    v = os.environ.get(key)
+    if v:
+        v = v.strip().strip('"\'')
+    return v or default
 
 
 def _env_int(key: str, default: int) -> int:
@@ -40,10 +44,17 @@ def _env_int(key: str, default: int) -> int:
 TAO_COLOSSEUM_CONTRACT_ADDRESS = _env("TAO_COLOSSEUM_CONTRACT_ADDRESS", _DEFAULT_CONTRACT)
 BITTENSOR_EVM_RPC = _env("BITTENSOR_EVM_RPC", _DEFAULT_RPC)
 BITTENSOR_EVM_CHAIN_ID = _env_int("BITTENSOR_EVM_CHAIN_ID", _DEFAULT_CHAIN_ID)
+# Optional ws(s):// endpoint; when set, BetPlaced logs are streamed via eth_subscribe instead of polled
+BITTENSOR_EVM_WS_RPC = _env("BITTENSOR_EVM_WS_RPC", "")
+
+# Env values are resolved once above; the helpers are not part of the module API.
+del _env, _env_int
 
 # Time decay weights for 7 days (index 0 = today, index 6 = 6 days ago)
-# Most recent activity gets highest weight
-TIME_DECAY_WEIGHTS = [1.0, 0.85, 0.70, 0.55, 0.40, 0.25, 0.10]
+# Most recent activity gets highest weight. Read-only array so consumers can
+# apply it with a single vectorized dot product.
+TIME_DECAY_WEIGHTS = np.array([1.0, 0.85, 0.70, 0.55, 0.40, 0.25, 0.10], dtype=np.float64)
+TIME_DECAY_WEIGHTS.setflags(write=False)
 
 # Volume check interval in seconds (5 minutes)
 VOLUME_CHECK_INTERVAL = 300
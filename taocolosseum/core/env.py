@@ -0,0 +1,27 @@
+# The MIT License (MIT)
+# Copyright © 2026 TAO Colosseum
+
+"""
+Process-wide environment bootstrap for TAO Colosseum.
+
+Loads the nearest .env file at most once per process so that every entry
+point (validator, API, scripts) can call it without re-reading the file.
+"""
+
+import functools
+
+
+@functools.lru_cache(maxsize=1)
+def bootstrap_env() -> bool:
+    """
+    Load .env into os.environ (existing variables win). Safe to call repeatedly;
+    only the first call touches the filesystem.
+
+    Returns:
+        bool: True if a .env file was found and loaded.
+    """
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return False
+    return load_dotenv()
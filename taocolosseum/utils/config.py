@@ -208,6 +208,13 @@ def add_validator_args(cls, parser):
         default=0.1,
     )
 
+    parser.add_argument(
+        "--neuron.full_rescore",
+        action="store_true",
+        help="On startup, rescan the full 7-day bet history instead of resuming from the last scanned block.",
+        default=False,
+    )
+
     parser.add_argument(
         "--neuron.axon_off",
         "--axon_off",
@@ -6,6 +6,11 @@ EVENTS_LEVEL_NUM = 38
 DEFAULT_LOG_BACKUP_COUNT = 10
 
 
+def debug_enabled() -> bool:
+    """Whether bt.logging.debug output is on; check before building costly messages."""
+    return logging.getLogger("bittensor").isEnabledFor(logging.DEBUG)
+
+
 def setup_events_logger(full_path, events_retention_size):
     logging.addLevelName(EVENTS_LEVEL_NUM, "EVENT")
 
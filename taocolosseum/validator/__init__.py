@@ -1,31 +1,59 @@
 # TAO Colosseum Validator modules
+#
+# Submodules are imported lazily on first attribute access (PEP 562) so that
+# importing the package does not pull in fastapi, web3, etc. until a symbol
+# that needs them is actually used.
 
-from .forward import forward
-from .reward import calculate_volume_rewards, apply_time_decay
+import importlib
 
-# Database module
-from .database import (
-    init_db,
-    save_snapshot,
-    get_latest_snapshot,
-    get_snapshots,
-    update_miner_data,
-    get_miner_data,
-    get_all_miner_data,
+_LAZY = {
+    "forward": "forward",
+    "calculate_volume_rewards": "reward",
+    "apply_time_decay": "reward",
+    "apply_time_decay_batch": "reward",
+    # Database module
+    "init_db": "database",
+    "db_optimize": "database",
+    "save_snapshot": "database",
+    "get_latest_snapshot": "database",
+    "get_snapshots": "database",
+    "update_miner_data": "database",
+    "update_miner_data_bulk": "database",
+    "get_miner_data": "database",
+    "get_miner_data_bulk": "database",
+    "get_all_miner_data": "database",
+    "iter_all_miner_data": "database",
     # Wallet mapping functions
-    save_wallet_mapping,
-    get_wallet_mapping,
-    get_evm_address_for_coldkey,
-    get_all_wallet_mappings,
-)
+    "save_wallet_mapping": "database",
+    "get_wallet_mapping": "database",
+    "get_evm_address_for_coldkey": "database",
+    "get_all_wallet_mappings": "database",
+    "load_all_wallet_mappings": "database",
+    # Contract interaction module
+    "ContractClient": "contract",
+    "get_contract_client": "contract",
+    "close_contract_client": "contract",
+    "get_miner_volume": "contract",
+    "get_miners_volumes": "contract",
+    "get_miners_volumes_async": "contract",
+    "calculate_time_decayed_volume": "contract",
+    # API module
+    "start_api_server": "api",
+}
 
-# Contract interaction module
-from .contract import (
-    ContractClient,
-    get_contract_client,
-    get_miner_volume,
-    calculate_time_decayed_volume,
-)
+__all__ = list(_LAZY)
 
-# API module
-from .api import start_api_server
+
+def __getattr__(name):
+    submodule = _LAZY.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{submodule}"), name)
+    # Cache on the package. This also replaces the submodule object that the
+    # import system binds for "forward", which shares its function's name.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,18 +6,27 @@ API module for TAO Colosseum validator.
 Provides REST endpoints to query validator state, scores, and volumes.
 """
 
+import asyncio
+import functools
+import hashlib
 import threading
-from typing import Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Optional
+import numpy as np
 import bittensor as bt
 
 try:
-    from fastapi import FastAPI, HTTPException, Query
+    import anyio
+    import orjson
+    from fastapi import FastAPI, HTTPException, Query, Response
     from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import ORJSONResponse, StreamingResponse
     import uvicorn
     FASTAPI_AVAILABLE = True
 except ImportError:
     FASTAPI_AVAILABLE = False
-    bt.logging.warning("fastapi not installed. Install with: pip install fastapi uvicorn")
+    bt.logging.warning("fastapi not installed. Install with: pip install fastapi 'uvicorn[standard]' orjson")
 
 from taocolosseum.core.const import API_HOST, API_PORT, VERSION
 from taocolosseum.validator.database import (
@@ -25,6 +34,7 @@ from taocolosseum.validator.database import (
     get_snapshots,
     get_snapshot_by_block,
     get_miner_data,
+    get_miner_data_bulk,
     get_all_miner_data,
     save_wallet_mapping,
     get_wallet_mapping,
@@ -33,7 +43,6 @@ from taocolosseum.validator.database import (
 
 # Signature verification imports - CRITICAL for security
 try:
-    from binascii import unhexlify
     from substrateinterface import Keypair
     SIGNATURE_VERIFICATION_AVAILABLE = True
 except ImportError as e:
@@ -47,36 +56,153 @@ except Exception as e:
     SIGNATURE_VERIFICATION_AVAILABLE = False
     bt.logging.error(f"⚠️  CRITICAL: Signature verification setup error: {e}")
 
+# Worker threads available to the read endpoints for blocking DB/RPC calls
+API_THREAD_LIMIT = 200
+
+# Bound on distinct (endpoint, query params) entries in the per-block cache
+RESPONSE_CACHE_SIZE = 256
+
+# Historical snapshots kept serialized by /snapshots/{block_number}
+SNAPSHOT_CACHE_SIZE = 256
+
+# Rows serialized per chunk by the streaming list endpoints
+STREAM_CHUNK_ROWS = 100
+
+# Bound on remembered coldkey signature verification results
+VERIFY_CACHE_SIZE = 8192
+
+# Maximum wallet mappings accepted by one batch request
+MAX_WALLET_MAPPING_BATCH = 64
+
+# Longest string field accepted in a request body (messages are ~130 chars)
+MAX_REQUEST_STR_LENGTH = 256
+
+
+# Routes whose browser preflights are answered before Starlette's stack
+_PREFLIGHT_PATHS = frozenset({"/api/wallet-mapping", "/api/wallet-mapping/batch"})
+
+# Fixed part of the preflight response; matches what CORSMiddleware below
+# sends for allow_origins/methods/headers=["*"] with allow_credentials=True
+_PREFLIGHT_HEADERS = (
+    (b"content-type", b"text/plain; charset=utf-8"),
+    (b"content-length", b"2"),
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", b"600"),
+    (b"access-control-allow-credentials", b"true"),
+    (b"vary", b"Origin"),
+)
+
+
+class PreflightMiddleware:
+    """
+    Pure ASGI middleware answering CORS preflights for the wallet-mapping routes
+    from prebuilt headers, without entering the CORS/routing stack.
+    
+    Middleware on this app must stay pure ASGI like this and CORSMiddleware;
+    BaseHTTPMiddleware subclasses wrap every request in extra tasks and streams.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "OPTIONS"
+            or scope["path"] not in _PREFLIGHT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+        
+        # Not a preflight (plain OPTIONS); let the app handle it
+        if origin is None or request_method is None:
+            await self.app(scope, receive, send)
+            return
+        
+        # Credentials are allowed, so the origin must be echoed rather than "*"
+        headers = [*_PREFLIGHT_HEADERS, (b"access-control-allow-origin", origin)]
+        if request_headers is not None:
+            headers.append((b"access-control-allow-headers", request_headers))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"OK"})
+
 
 # FastAPI app instance
 app = None
 if FASTAPI_AVAILABLE:
-    from pydantic import BaseModel, Field
+    from pydantic import BaseModel, ConfigDict, Field
+    
+    # Request bodies: reject unknown fields and oversized strings inside
+    # pydantic-core, before any of the Python-level checks or signature work.
+    # Instances are never mutated after validation, so freeze them too.
+    _REQUEST_MODEL_CONFIG = ConfigDict(
+        extra="forbid", frozen=True, str_max_length=MAX_REQUEST_STR_LENGTH
+    )
     
     # Pydantic models for request/response
     class WalletMappingData(BaseModel):
+        model_config = _REQUEST_MODEL_CONFIG
+        
         coldkey: str = Field(..., description="SS58 Bittensor coldkey address")
         evmAddress: str = Field(..., description="EVM wallet address with 0x prefix")
         signature: str = Field(..., description="Coldkey hex signature without 0x prefix")
         evmSignature: str = Field(..., description="EVM personal_sign hex signature (with or without 0x)")
         message: str = Field(..., description="Signed message wrapped in <Bytes>...</Bytes>")
         timestamp: int = Field(..., description="Unix timestamp in milliseconds")
-        verified: bool = Field(..., description="UI format validation passed")
+        verified: Optional[bool] = Field(None, description="UI format validation passed (informational only)")
     
     class WalletMappingRequest(BaseModel):
+        model_config = _REQUEST_MODEL_CONFIG
+        
         type: str = Field(..., description="Request type, should be 'wallet_mapping'")
         data: WalletMappingData
     
+    class WalletMappingBatchRequest(BaseModel):
+        model_config = _REQUEST_MODEL_CONFIG
+        
+        type: str = Field(..., description="Request type, should be 'wallet_mapping'")
+        items: List[WalletMappingData] = Field(
+            ..., min_length=1, max_length=MAX_WALLET_MAPPING_BATCH,
+            description="Wallet mappings to register"
+        )
+    
     class WalletMappingResponse(BaseModel):
+        model_config = ConfigDict(extra="forbid", frozen=True)
+        
         success: bool
     
     class ErrorResponse(BaseModel):
+        model_config = ConfigDict(extra="forbid", frozen=True)
+        
         error: str
     
+    # Shared body for successful wallet mapping registrations; never mutated
+    _SUCCESS = {"success": True}
+    
+    @asynccontextmanager
+    async def _lifespan(app):
+        # Read endpoints offload SQLite/RPC calls to AnyIO's worker threads;
+        # raise the default 40-token cap so dashboards don't queue behind it.
+        anyio.to_thread.current_default_thread_limiter().total_tokens = API_THREAD_LIMIT
+        yield
+    
     app = FastAPI(
         title="TAO Colosseum Validator API",
         description="API for querying TAO Colosseum validator state, miner scores, and betting volumes",
-        version=VERSION
+        version=VERSION,
+        lifespan=_lifespan,
+        # orjson with OPT_NON_STR_KEYS | OPT_SERIALIZE_NUMPY: int UID keys and
+        # numpy values serialize natively, several times faster than stdlib json
+        default_response_class=ORJSONResponse,
     )
     
     # Enable CORS for frontend access
@@ -87,11 +213,17 @@ if FASTAPI_AVAILABLE:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    # Added last, so it runs outermost
+    app.add_middleware(PreflightMiddleware)
+
+
+_BYTES_PREFIX = '<Bytes>'
+_BYTES_SUFFIX = '</Bytes>'
 
 
 def _message_plaintext(message: str) -> str:
     """Extract inner content from <Bytes>...</Bytes> wrapped message."""
-    if not message.startswith('<Bytes>') or not message.endswith('</Bytes>'):
+    if not message.startswith(_BYTES_PREFIX) or not message.endswith(_BYTES_SUFFIX):
         return ""
     return message[7:-8]  # strip <Bytes> and </Bytes>
 
@@ -105,9 +237,34 @@ def _verify_message_binding(plaintext: str, coldkey: str, evm_address: str) -> b
     return coldkey in plaintext and evm_lower in plaintext.lower()
 
 
+@functools.lru_cache(maxsize=4096)
+def _keypair_for(ss58_address: str):
+    """
+    Public-key-only Keypair for an SS58 address. Cached because the same
+    coldkeys re-register repeatedly and address decoding/checksum is per call.
+    Invalid addresses raise and are not cached.
+    """
+    from substrateinterface import Keypair
+    return Keypair(ss58_address=ss58_address, ss58_format=42)
+
+
+# blake2b(coldkey|signature|message) -> verification result, LRU-ordered
+_verify_cache = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+
+def _verify_cache_key(coldkey: str, message: str, signature: str) -> bytes:
+    return hashlib.blake2b(
+        f"{coldkey}|{signature}|{message}".encode(), digest_size=16
+    ).digest()
+
+
 def _verify_coldkey_signature(coldkey: str, message: str, signature: str) -> bool:
     """
     Verify a Bittensor coldkey signature.
+
+    Results are remembered per (coldkey, message, signature) so client retries
+    of the same signed request skip the sr25519 verification.
     
     Args:
         coldkey: SS58 coldkey address
@@ -117,20 +274,28 @@ def _verify_coldkey_signature(coldkey: str, message: str, signature: str) -> boo
     Returns:
         True if signature is valid, False otherwise
     """
+    cache_key = _verify_cache_key(coldkey, message, signature)
+    with _verify_cache_lock:
+        cached = _verify_cache.get(cache_key)
+        if cached is not None:
+            _verify_cache.move_to_end(cache_key)
+            return cached
+
     try:
-        # Try to import at runtime if not available at module load
-        from binascii import unhexlify
-        from substrateinterface import Keypair
-        
-        # Create keypair from SS58 address
-        keypair = Keypair(ss58_address=coldkey, ss58_format=42)
+        # Keypair from SS58 address (imports substrateinterface lazily)
+        keypair = _keypair_for(coldkey)
         
         # Convert hex signature to bytes
-        signature_bytes = unhexlify(signature.encode())
+        signature_bytes = bytes.fromhex(signature)
         
         # Verify the signature
         is_valid = keypair.verify(data=message, signature=signature_bytes)
         
+        with _verify_cache_lock:
+            _verify_cache[cache_key] = is_valid
+            if len(_verify_cache) > VERIFY_CACHE_SIZE:
+                _verify_cache.popitem(last=False)
+        
         if is_valid:
             bt.logging.info(f"Signature verified for coldkey: {coldkey[:10]}...")
         else:
@@ -192,11 +357,15 @@ def _verify_evm_signature(plaintext: str, evm_address: str, evm_signature_hex: s
 # Reference to validator instance (set during startup)
 _validator_instance = None
 
+# Serialized invariant head of the /info body, built on first use per validator
+_info_prefix: Optional[bytes] = None
+
 
 def set_validator(validator):
     """Set the validator instance for the API to reference."""
-    global _validator_instance
+    global _validator_instance, _info_prefix
     _validator_instance = validator
+    _info_prefix = None
 
 
 def get_validator():
@@ -206,73 +375,190 @@ def get_validator():
     return _validator_instance
 
 
+async def _run_sync(func, *args):
+    """Run a blocking call (SQLite query, subtensor RPC) on the worker thread pool."""
+    return await anyio.to_thread.run_sync(func, *args)
+
+
+def _scores_array(validator) -> np.ndarray:
+    """Validator scores as a float32 numpy array (numpy or torch storage)."""
+    scores = validator.scores
+    if hasattr(scores, "detach"):
+        scores = scores.detach().cpu().numpy()
+    return np.asarray(scores, dtype=np.float32)
+
+
+def _volume_totals(validator) -> dict:
+    """Volume summary maintained by the validator when volumes are recomputed."""
+    totals = getattr(validator, 'miner_volume_totals', None)
+    if totals is None:
+        volumes = getattr(validator, 'miner_volumes', {})
+        totals = {
+            'total': float(sum(volumes.values())),
+            'nonzero_count': sum(1 for v in volumes.values() if v > 0),
+        }
+    return totals
+
+
+# Serialized /snapshots/latest body; only changes when a new snapshot is saved.
+_latest_snapshot_bytes: Optional[bytes] = None
+_latest_snapshot_generation = 0
+_latest_snapshot_lock = threading.Lock()
+
+
+# block_number -> serialized snapshot, LRU-ordered. Past snapshots never
+# change, so entries need no invalidation. Only touched from the event loop.
+_snapshot_bytes_cache = OrderedDict()
+
+
+def invalidate_latest_snapshot():
+    """Drop the cached /snapshots/latest body. Call after save_snapshot()."""
+    global _latest_snapshot_bytes, _latest_snapshot_generation
+    with _latest_snapshot_lock:
+        _latest_snapshot_bytes = None
+        _latest_snapshot_generation += 1
+
+
+async def _stream_json_array(key: str, rows: list):
+    """
+    Yield {"count": n, key: [...]} a few rows at a time, so a large listing is
+    never held as a single serialized body next to its rows.
+    """
+    yield b'{"count":' + str(len(rows)).encode() + b',"' + key.encode() + b'":['
+    for start in range(0, len(rows), STREAM_CHUNK_ROWS):
+        chunk = b','.join(orjson.dumps(row) for row in rows[start:start + STREAM_CHUNK_ROWS])
+        yield chunk if start == 0 else b',' + chunk
+    yield b']}'
+
+
+def _read_block(validator) -> int:
+    """Current block; may hit subtensor when the 12s block cache expires."""
+    return int(validator.block)
+
+
+# (endpoint, query params) -> (block, serialized JSON body)
+_response_cache = {}
+
+
+def cached_by_block(func):
+    """
+    Serve an async endpoint's serialized response from memory until the block
+    advances, so concurrent dashboard polling recomputes it at most once per block.
+    Query params are part of the cache key.
+    """
+    @functools.wraps(func)
+    async def wrapper(**kwargs):
+        block = await _run_sync(_read_block, get_validator())
+        key = (func.__name__, tuple(sorted(kwargs.items())))
+        cached = _response_cache.get(key)
+        if cached is not None and cached[0] == block:
+            return Response(cached[1], media_type="application/json")
+
+        body = orjson.dumps(
+            await func(**kwargs),
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+        if key not in _response_cache and len(_response_cache) >= RESPONSE_CACHE_SIZE:
+            _response_cache.pop(next(iter(_response_cache)))
+        _response_cache[key] = (block, body)
+        return Response(body, media_type="application/json")
+
+    return wrapper
+
+
 if FASTAPI_AVAILABLE:
     
+    _ROOT_BYTES = orjson.dumps({
+        "status": "ok",
+        "service": "TAO Colosseum Validator",
+        "version": VERSION
+    })
+    
     @app.get("/", tags=["Health"])
-    def root():
+    async def root():
         """Root endpoint - service status."""
-        return {
-            "status": "ok",
-            "service": "TAO Colosseum Validator",
-            "version": VERSION
-        }
+        return Response(_ROOT_BYTES, media_type="application/json")
     
     
     @app.get("/health", tags=["Health"])
-    def health():
+    async def health():
         """Health check endpoint with validator status."""
         validator = get_validator()
-        return {
+        return ORJSONResponse({
             "status": "healthy",
-            "block": int(validator.block),
+            "block": await _run_sync(_read_block, validator),
             "step": int(validator.step),
             "netuid": int(validator.config.netuid),
             "uid": int(validator.uid)
-        }
+        })
     
     
     @app.get("/info", tags=["Health"])
-    def info():
+    async def info():
         """Get validator information."""
+        global _info_prefix
         validator = get_validator()
-        return {
-            "netuid": int(validator.config.netuid),
-            "uid": int(validator.uid),
-            "hotkey": validator.wallet.hotkey.ss58_address,
-            "block": int(validator.block),
-            "step": int(validator.step),
-            "total_miners": int(validator.metagraph.n),
-            "network": validator.subtensor.chain_endpoint
-        }
+        prefix = _info_prefix
+        if prefix is None:
+            # Fields fixed for the validator's lifetime, serialized once; the
+            # object is left open so per-request fields can be appended
+            prefix = orjson.dumps({
+                "netuid": int(validator.config.netuid),
+                "uid": int(validator.uid),
+                "hotkey": validator.wallet.hotkey.ss58_address,
+                "network": validator.subtensor.chain_endpoint
+            })[:-1] + b','
+            _info_prefix = prefix
+        block = await _run_sync(_read_block, validator)
+        body = prefix + b'"block":%d,"step":%d,"total_miners":%d}' % (
+            block, int(validator.step), int(validator.metagraph.n)
+        )
+        return Response(body, media_type="application/json")
     
     
     @app.get("/scores", tags=["Scores"])
-    def get_current_scores(
-        min_score: float = Query(0.0, description="Minimum score to include")
+    @cached_by_block
+    async def get_current_scores(
+        min_score: float = Query(0.0, description="Minimum score to include"),
+        with_db: bool = Query(False, description="Include stored EVM address and volume fields")
     ):
         """Get current miner scores."""
         validator = get_validator()
         
-        scores = {}
-        for uid in range(len(validator.scores)):
-            score = float(validator.scores[uid])
-            if score >= min_score:
-                scores[uid] = {
-                    'uid': uid,
-                    'hotkey': validator.metagraph.hotkeys[uid],
-                    'coldkey': validator.metagraph.coldkeys[uid],
-                    'score': score
-                }
+        all_scores = _scores_array(validator)
+        uids = np.flatnonzero(all_scores >= min_score)
+        hotkeys = validator.metagraph.hotkeys
+        coldkeys = validator.metagraph.coldkeys
+        scores = {
+            uid: {
+                'uid': uid,
+                'hotkey': hotkeys[uid],
+                'coldkey': coldkeys[uid],
+                'score': score
+            }
+            for uid, score in zip(uids.tolist(), all_scores[uids].tolist())
+        }
+        
+        if with_db:
+            # One bulk fetch rather than a get_miner_data() round trip per UID
+            miner_db_data = await _run_sync(get_miner_data_bulk, list(scores))
+            for uid, row in miner_db_data.items():
+                scores[uid].update({
+                    'evm_address': row.get('evm_address'),
+                    'daily_volumes': row.get('daily_volumes', []),
+                    'weighted_volume': row.get('weighted_volume', 0),
+                    'last_updated': row.get('last_updated')
+                })
         
         return {
-            'block': validator.block,
+            'block': await _run_sync(_read_block, validator),
             'total_miners': len(scores),
             'scores': scores
         }
     
     
     @app.get("/scores/{uid}", tags=["Scores"])
-    def get_miner_score(uid: int):
+    async def get_miner_score(uid: int):
         """Get specific miner's score and details."""
         validator = get_validator()
         
@@ -280,14 +566,14 @@ if FASTAPI_AVAILABLE:
             raise HTTPException(status_code=404, detail=f"Miner UID {uid} not found")
         
         # Get additional data from database
-        miner_db_data = get_miner_data(uid)
+        miner_db_data = await _run_sync(get_miner_data, uid)
         
         response = {
             'uid': uid,
             'hotkey': validator.metagraph.hotkeys[uid],
             'coldkey': validator.metagraph.coldkeys[uid],
             'score': float(validator.scores[uid]),
-            'block': validator.block
+            'block': await _run_sync(_read_block, validator)
         }
         
         if miner_db_data:
@@ -298,36 +584,43 @@ if FASTAPI_AVAILABLE:
                 'last_updated': miner_db_data.get('last_updated')
             })
         
-        return response
+        return ORJSONResponse(response)
     
     
     @app.get("/volumes", tags=["Volumes"])
-    def get_current_volumes():
+    @cached_by_block
+    async def get_current_volumes():
         """Get current miner volumes (time-decayed)."""
         validator = get_validator()
         
-        # Access cached volumes from validator
-        volumes = getattr(validator, 'miner_volumes', {})
+        # Build the UID -> volume map from the validator's parallel arrays
+        uids = getattr(validator, 'miner_volumes_uids', None)
+        volume_arr = getattr(validator, 'miner_volumes_arr', None)
+        if uids is not None and volume_arr is not None:
+            volumes = dict(zip(uids.tolist(), volume_arr.tolist()))
+        else:
+            volumes = getattr(validator, 'miner_volumes', {})
         daily_volumes = getattr(validator, 'miner_daily_volumes', {})
+        totals = _volume_totals(validator)
         
         return {
-            'block': validator.block,
-            'total_volume': sum(volumes.values()) if volumes else 0,
-            'miners_with_volume': len([v for v in volumes.values() if v > 0]),
+            'block': await _run_sync(_read_block, validator),
+            'total_volume': totals['total'],
+            'miners_with_volume': totals['nonzero_count'],
             'volumes': volumes,
             'daily_breakdown': daily_volumes
         }
     
     
     @app.get("/volumes/{uid}", tags=["Volumes"])
-    def get_miner_volume(uid: int):
+    async def get_miner_volume(uid: int):
         """Get specific miner's volume details."""
         validator = get_validator()
         
         if uid >= validator.metagraph.n or uid < 0:
             raise HTTPException(status_code=404, detail=f"Miner UID {uid} not found")
         
-        miner_data = get_miner_data(uid)
+        miner_data = await _run_sync(get_miner_data, uid)
         
         if not miner_data:
             return {
@@ -347,104 +640,278 @@ if FASTAPI_AVAILABLE:
     
     
     @app.get("/snapshots", tags=["Snapshots"])
-    def get_weight_snapshots(
+    async def get_weight_snapshots(
         limit: int = Query(50, ge=1, le=500, description="Number of snapshots to return")
     ):
         """Get historical weight snapshots (summary only)."""
-        snapshots = get_snapshots(limit)
-        return {
-            'count': len(snapshots),
-            'snapshots': snapshots
-        }
+        snapshots = await _run_sync(get_snapshots, limit)
+        return StreamingResponse(
+            _stream_json_array('snapshots', snapshots),
+            media_type="application/json"
+        )
     
     
     @app.get("/snapshots/latest", tags=["Snapshots"])
-    def get_latest_weight_snapshot():
+    async def get_latest_weight_snapshot():
         """Get the most recent weight snapshot with full details."""
-        snapshot = get_latest_snapshot()
+        global _latest_snapshot_bytes
+        body = _latest_snapshot_bytes
+        if body is not None:
+            return Response(body, media_type="application/json")
+
+        generation = _latest_snapshot_generation
+        snapshot = await _run_sync(get_latest_snapshot)
         if not snapshot:
             raise HTTPException(status_code=404, detail="No snapshots found")
-        return snapshot
+        body = orjson.dumps(snapshot)
+        with _latest_snapshot_lock:
+            # Don't cache a read that raced with a newer save_snapshot()
+            if generation == _latest_snapshot_generation:
+                _latest_snapshot_bytes = body
+        return Response(body, media_type="application/json")
     
     
     @app.get("/snapshots/{block_number}", tags=["Snapshots"])
-    def get_snapshot_at_block(block_number: int):
+    async def get_snapshot_at_block(block_number: int):
         """Get snapshot at a specific block number."""
-        snapshot = get_snapshot_by_block(block_number)
+        body = _snapshot_bytes_cache.get(block_number)
+        if body is not None:
+            _snapshot_bytes_cache.move_to_end(block_number)
+            return Response(body, media_type="application/json")
+        
+        snapshot = await _run_sync(get_snapshot_by_block, block_number)
         if not snapshot:
             raise HTTPException(
                 status_code=404, 
                 detail=f"No snapshot found for block {block_number}"
             )
-        return snapshot
+        body = orjson.dumps(snapshot)
+        _snapshot_bytes_cache[block_number] = body
+        if len(_snapshot_bytes_cache) > SNAPSHOT_CACHE_SIZE:
+            _snapshot_bytes_cache.popitem(last=False)
+        return Response(body, media_type="application/json")
     
     
     @app.get("/leaderboard", tags=["Leaderboard"])
-    def get_leaderboard(
+    @cached_by_block
+    async def get_leaderboard(
         limit: int = Query(20, ge=1, le=100, description="Number of miners to return")
     ):
         """Get top miners by score."""
         validator = get_validator()
         
-        # Sort miners by score
-        scored_miners = []
-        for uid in range(len(validator.scores)):
-            score = float(validator.scores[uid])
-            if score > 0:
-                scored_miners.append({
-                    'rank': 0,  # Will be set after sorting
-                    'uid': uid,
-                    'coldkey': validator.metagraph.coldkeys[uid],
-                    'score': score
-                })
+        scores = _scores_array(validator)
+        active = np.flatnonzero(scores > 0)
         
-        scored_miners.sort(key=lambda x: x['score'], reverse=True)
+        # Partition out the top `limit` in O(n), keeping every miner tied with
+        # the cutoff score, then sort only those (stable, so ties keep UID order)
+        candidates = active
+        if active.size > limit:
+            active_scores = scores[active]
+            cutoff = np.partition(active_scores, active.size - limit)[active.size - limit]
+            candidates = active[active_scores >= cutoff]
+        top = candidates[np.argsort(-scores[candidates], kind="stable")][:limit]
         
-        # Add ranks
-        for i, miner in enumerate(scored_miners[:limit]):
-            miner['rank'] = i + 1
+        coldkeys = validator.metagraph.coldkeys
+        leaderboard = [
+            {
+                'rank': rank,
+                'uid': uid,
+                'coldkey': coldkeys[uid],
+                'score': score
+            }
+            for rank, (uid, score) in enumerate(
+                zip(top.tolist(), scores[top].tolist()), start=1
+            )
+        ]
         
         return {
-            'block': validator.block,
-            'total_active_miners': len(scored_miners),
-            'leaderboard': scored_miners[:limit]
+            'block': await _run_sync(_read_block, validator),
+            'total_active_miners': int(active.size),
+            'leaderboard': leaderboard
         }
     
     
     @app.get("/miners", tags=["Miners"])
-    def get_all_miners():
+    async def get_all_miners():
         """Get all miners with their data from database."""
-        miners = get_all_miner_data()
-        return {
-            'count': len(miners),
-            'miners': miners
-        }
+        miners = await _run_sync(get_all_miner_data)
+        return StreamingResponse(
+            _stream_json_array('miners', miners),
+            media_type="application/json"
+        )
     
     
     @app.get("/stats", tags=["Statistics"])
-    def get_stats():
+    @cached_by_block
+    async def get_stats():
         """Get overall statistics."""
         validator = get_validator()
         
         # Calculate stats
-        total_score = sum(float(s) for s in validator.scores)
-        active_miners = sum(1 for s in validator.scores if s > 0)
-        volumes = getattr(validator, 'miner_volumes', {})
-        total_volume = sum(volumes.values()) if volumes else 0
+        scores = _scores_array(validator)
+        total_score = float(scores.sum(dtype=np.float64))
+        active_miners = int(np.count_nonzero(scores > 0))
+        totals = _volume_totals(validator)
         
         return {
-            'block': int(validator.block),
+            'block': await _run_sync(_read_block, validator),
             'step': int(validator.step),
             'total_miners': int(validator.metagraph.n),
             'active_miners': active_miners,
             'total_score': total_score,
-            'total_weighted_volume': float(total_volume),
-            'miners_with_volume': int(len([v for v in volumes.values() if v > 0]))
+            'total_weighted_volume': float(totals['total']),
+            'miners_with_volume': int(totals['nonzero_count'])
         }
     
     
     # ==================== WALLET MAPPING ENDPOINTS ====================
     
+    def _require_signature_verification():
+        """SECURITY: Reject all requests if signature verification is unavailable."""
+        if not SIGNATURE_VERIFICATION_AVAILABLE:
+            bt.logging.error("Wallet mapping rejected: signature verification not available")
+            raise HTTPException(
+                status_code=503,
+                detail="Signature verification unavailable. Install substrateinterface."
+            )
+    
+    
+    def _wallet_mapping_format_error(ck: str, addr: str, sig: str, evm_sig: str, msg: str) -> str:
+        """Detail message for the first field that failed the combined format check."""
+        if len(ck) < 47 or ck[:1] != '5':
+            return "Invalid coldkey format"
+        if len(addr) != 42 or addr[:2] != '0x':
+            return "Invalid EVM address format"
+        if len(sig) != 128:
+            return f"Invalid coldkey signature length: expected 128, got {len(sig)}"
+        if len(evm_sig) != 130:
+            return "Invalid EVM signature: expected 130 hex chars (with or without 0x prefix)"
+        return "Message must be wrapped in <Bytes>...</Bytes>"
+    
+    
+    def _check_wallet_mapping_format(data: WalletMappingData) -> str:
+        """
+        Cheap format checks on a wallet mapping, run before any signature work.
+        
+        Returns:
+            The signed plaintext (message without the <Bytes> wrapper)
+        
+        Raises:
+            HTTPException(400) describing the first failed check
+        """
+        ck = data.coldkey
+        addr = data.evmAddress
+        sig = data.signature
+        msg = data.message
+        evm_sig = data.evmSignature.strip()
+        if evm_sig[:2] == '0x':
+            evm_sig = evm_sig[2:]
+        
+        # One combined pass over the fixed-shape fields; the per-field detail is
+        # only worked out once something has already failed.
+        if (
+            len(ck) < 47 or ck[:1] != '5'
+            or len(addr) != 42 or addr[:2] != '0x'
+            or len(sig) != 128
+            or len(evm_sig) != 130
+            or msg[:7] != _BYTES_PREFIX or msg[-8:] != _BYTES_SUFFIX
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=_wallet_mapping_format_error(ck, addr, sig, evm_sig, msg)
+            )
+        
+        # Hex-decode both signatures (fromhex tolerates spaces, hence the length check)
+        try:
+            sig_ok = len(bytes.fromhex(sig)) == 64
+        except ValueError:
+            sig_ok = False
+        if not sig_ok:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid coldkey signature: expected 128 hex chars"
+            )
+        try:
+            evm_sig_ok = len(bytes.fromhex(evm_sig)) == 65
+        except ValueError:
+            evm_sig_ok = False
+        if not evm_sig_ok:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid EVM signature: expected 130 hex chars (with or without 0x prefix)"
+            )
+        
+        plaintext = msg[7:-8]
+        if not plaintext:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid message content"
+            )
+        
+        # Require message to bind this coldkey and EVM address (prevents claiming someone else's EVM)
+        if not _verify_message_binding(plaintext, ck, addr):
+            raise HTTPException(
+                status_code=400,
+                detail="Message must contain both coldkey and EVM address (format: Link <coldkey> to <evm> at <timestamp>)"
+            )
+        
+        return plaintext
+    
+    
+    def _verify_and_save_wallet_mapping(data: WalletMappingData, plaintext: str):
+        """
+        Verify both signatures on a format-checked wallet mapping and store it.
+        
+        Raises:
+            HTTPException(400) on a bad signature, HTTPException(500) if the save fails
+        """
+        # Verify coldkey signature
+        if not _verify_coldkey_signature(
+            coldkey=data.coldkey,
+            message=data.message,
+            signature=data.signature
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid coldkey signature"
+            )
+        
+        # Verify EVM signature (proves ownership of the EVM address)
+        if not _verify_evm_signature(
+            plaintext=plaintext,
+            evm_address=data.evmAddress,
+            evm_signature_hex=data.evmSignature
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid EVM signature or address mismatch"
+            )
+        
+        evm_sig_stored = data.evmSignature.strip()
+        if not evm_sig_stored.startswith('0x'):
+            evm_sig_stored = '0x' + evm_sig_stored
+        # Save the wallet mapping
+        success = save_wallet_mapping(
+            coldkey=data.coldkey,
+            evm_address=data.evmAddress,
+            signature=data.signature,
+            message=data.message,
+            timestamp=data.timestamp,
+            evm_signature=evm_sig_stored
+        )
+        
+        if not success:
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to save wallet mapping"
+            )
+        
+        bt.logging.info(
+            f"Wallet mapping registered: {data.coldkey[:10]}... -> {data.evmAddress[:10]}..."
+        )
+    
+    
     @app.post("/api/wallet-mapping", tags=["Wallet Mapping"])
     def register_wallet_mapping(request: WalletMappingRequest):
         """
@@ -462,18 +929,12 @@ if FASTAPI_AVAILABLE:
         - data.evmSignature: EVM personal_sign hex (130 hex chars, with or without 0x)
         - data.message: Signed message with <Bytes>...</Bytes> wrapper
         - data.timestamp: Unix timestamp in milliseconds
-        - data.verified: UI validation passed (server still verifies)
+        - data.verified: Optional UI validation hint (ignored; server always verifies)
 
         Both coldkey and EVM must sign the same binding message to prove ownership of both wallets.
         """
         try:
-            # SECURITY: Reject all requests if signature verification is unavailable
-            if not SIGNATURE_VERIFICATION_AVAILABLE:
-                bt.logging.error("Wallet mapping rejected: signature verification not available")
-                raise HTTPException(
-                    status_code=503,
-                    detail="Signature verification unavailable. Install substrateinterface."
-                )
+            _require_signature_verification()
             
             # Validate request type
             if request.type != "wallet_mapping":
@@ -482,108 +943,10 @@ if FASTAPI_AVAILABLE:
                     detail=f"Invalid request type: {request.type}"
                 )
             
-            data = request.data
+            plaintext = _check_wallet_mapping_format(request.data)
+            _verify_and_save_wallet_mapping(request.data, plaintext)
             
-            # Validate coldkey format (SS58, starts with 5, 47-48 chars)
-            if not data.coldkey.startswith('5') or len(data.coldkey) < 47:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid coldkey format"
-                )
-            
-            # Validate EVM address format (0x prefix, 42 chars)
-            if not data.evmAddress.startswith('0x') or len(data.evmAddress) != 42:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid EVM address format"
-                )
-            
-            # Validate coldkey signature format (128 hex chars, no 0x prefix)
-            if len(data.signature) != 128:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid coldkey signature length: expected 128, got {len(data.signature)}"
-                )
-            
-            # Validate EVM signature format (130 hex chars with or without 0x)
-            evm_sig = data.evmSignature.strip()
-            if evm_sig.startswith('0x'):
-                evm_sig_raw = evm_sig[2:]
-            else:
-                evm_sig_raw = evm_sig
-            if len(evm_sig_raw) != 130 or not all(c in '0123456789abcdefABCDEF' for c in evm_sig_raw):
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid EVM signature: expected 130 hex chars (with or without 0x prefix)"
-                )
-            
-            # Validate message format (must have <Bytes>...</Bytes> wrapper)
-            if not data.message.startswith('<Bytes>') or not data.message.endswith('</Bytes>'):
-                raise HTTPException(
-                    status_code=400,
-                    detail="Message must be wrapped in <Bytes>...</Bytes>"
-                )
-            
-            plaintext = _message_plaintext(data.message)
-            if not plaintext:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid message content"
-                )
-            
-            # Require message to bind this coldkey and EVM address (prevents claiming someone else's EVM)
-            if not _verify_message_binding(plaintext, data.coldkey, data.evmAddress):
-                raise HTTPException(
-                    status_code=400,
-                    detail="Message must contain both coldkey and EVM address (format: Link <coldkey> to <evm> at <timestamp>)"
-                )
-            
-            # Verify coldkey signature
-            if not _verify_coldkey_signature(
-                coldkey=data.coldkey,
-                message=data.message,
-                signature=data.signature
-            ):
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid coldkey signature"
-                )
-            
-            # Verify EVM signature (proves ownership of the EVM address)
-            if not _verify_evm_signature(
-                plaintext=plaintext,
-                evm_address=data.evmAddress,
-                evm_signature_hex=data.evmSignature
-            ):
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid EVM signature or address mismatch"
-                )
-            
-            evm_sig_stored = data.evmSignature.strip()
-            if not evm_sig_stored.startswith('0x'):
-                evm_sig_stored = '0x' + evm_sig_stored
-            # Save the wallet mapping
-            success = save_wallet_mapping(
-                coldkey=data.coldkey,
-                evm_address=data.evmAddress,
-                signature=data.signature,
-                message=data.message,
-                timestamp=data.timestamp,
-                evm_signature=evm_sig_stored
-            )
-            
-            if not success:
-                raise HTTPException(
-                    status_code=500,
-                    detail="Failed to save wallet mapping"
-                )
-            
-            bt.logging.info(
-                f"Wallet mapping registered: {data.coldkey[:10]}... -> {data.evmAddress[:10]}..."
-            )
-            
-            return {"success": True}
+            return _SUCCESS
             
         except HTTPException:
             raise
@@ -595,10 +958,65 @@ if FASTAPI_AVAILABLE:
             )
     
     
+    @app.post("/api/wallet-mapping/batch", tags=["Wallet Mapping"])
+    def register_wallet_mappings_batch(request: WalletMappingBatchRequest):
+        """
+        Register up to MAX_WALLET_MAPPING_BATCH wallet mappings in one request.
+        
+        Every item is format-checked first; only the survivors pay for signature
+        verification. Each item gets its own result, in request order, so one bad
+        item does not fail the batch.
+        
+        Request body:
+        - type: "wallet_mapping"
+        - items: list of wallet mapping data objects (same fields as data in
+          POST /api/wallet-mapping)
+        """
+        _require_signature_verification()
+        
+        if request.type != "wallet_mapping":
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid request type: {request.type}"
+            )
+        
+        errors = [None] * len(request.items)
+        
+        # Pass 1: cheap format checks
+        pending = []
+        for i, data in enumerate(request.items):
+            try:
+                pending.append((i, data, _check_wallet_mapping_format(data)))
+            except HTTPException as e:
+                errors[i] = e.detail
+        
+        # Pass 2: signature verification and storage for well-formed items
+        for i, data, plaintext in pending:
+            try:
+                _verify_and_save_wallet_mapping(data, plaintext)
+            except HTTPException as e:
+                errors[i] = e.detail
+            except Exception as e:
+                bt.logging.error(f"Error processing wallet mapping: {e}")
+                errors[i] = f"Internal error: {str(e)}"
+        
+        return {
+            "results": [
+                {
+                    "coldkey": data.coldkey,
+                    "evmAddress": data.evmAddress,
+                    "success": error is None,
+                    "error": error,
+                }
+                for data, error in zip(request.items, errors)
+            ]
+        }
+    
+    
     @app.get("/api/wallet-mapping/{coldkey}", tags=["Wallet Mapping"])
-    def get_wallet_mapping_for_coldkey(coldkey: str):
+    async def get_wallet_mapping_for_coldkey(coldkey: str):
         """Get the wallet mapping for a specific coldkey."""
-        mapping = get_wallet_mapping(coldkey)
+        mapping = await _run_sync(get_wallet_mapping, coldkey)
         
         if not mapping:
             raise HTTPException(
@@ -610,22 +1028,51 @@ if FASTAPI_AVAILABLE:
     
     
     @app.get("/api/wallet-mappings", tags=["Wallet Mapping"])
-    def list_wallet_mappings():
+    async def list_wallet_mappings():
         """Get all registered wallet mappings."""
-        mappings = get_all_wallet_mappings()
-        return {
-            'count': len(mappings),
-            'mappings': mappings
-        }
+        mappings = await _run_sync(get_all_wallet_mappings)
+        return StreamingResponse(
+            _stream_json_array('mappings', mappings),
+            media_type="application/json"
+        )
+
+
+if FASTAPI_AVAILABLE:
+    class _EmbeddedServer(uvicorn.Server):
+        """uvicorn server that leaves SIGINT/SIGTERM to the validator's own handlers."""
+        
+        # concurrent.futures.Future of serve() on the validator loop (set by start_api_server)
+        serve_future = None
+        
+        def install_signal_handlers(self):
+            # uvicorn < 0.29 replaces the loop's signal handlers here
+            pass
+        
+        @contextmanager
+        def capture_signals(self):
+            # uvicorn >= 0.29 takes the first signal here and re-raises it after shutdown
+            yield
+
+
+async def _serve(server: "uvicorn.Server"):
+    """Run the server, keeping bind/startup failures (uvicorn exits on those) out of the validator loop."""
+    try:
+        await server.serve()
+    except (Exception, SystemExit) as e:
+        bt.logging.error(f"API server stopped: {e}")
 
 
 def start_api_server(
     validator, 
     host: str = None, 
     port: int = None
-) -> Optional[threading.Thread]:
+) -> Optional["uvicorn.Server"]:
     """
-    Start the API server in a background thread.
+    Start the API server on the validator's asyncio event loop.
+    
+    The server is scheduled on validator.loop and begins accepting connections
+    once that loop is running, so handlers share the loop (and the live
+    validator instance) with the forward pass instead of a second thread.
     
     Args:
         validator: The validator instance
@@ -633,7 +1080,8 @@ def start_api_server(
         port: Port to bind to (default from const.py)
         
     Returns:
-        The thread running the server, or None if FastAPI not available
+        The uvicorn server (set should_exit and await serve_future to stop it),
+        or None if FastAPI not available
     """
     if not FASTAPI_AVAILABLE:
         bt.logging.warning("FastAPI not available, API server not started")
@@ -644,19 +1092,20 @@ def start_api_server(
     
     set_validator(validator)
     
-    def _run_server():
-        uvicorn.run(
-            app, 
-            host=host, 
-            port=port, 
-            log_level="warning",
-            access_log=False
-        )
-    
-    thread = threading.Thread(target=_run_server, daemon=True)
-    thread.start()
+    # Server.serve() runs on the caller's loop; "auto" still picks the
+    # httptools parser when installed (uvicorn[standard]), h11 otherwise.
+    config = uvicorn.Config(
+        app, 
+        host=host, 
+        port=port, 
+        http="auto",
+        log_level="warning",
+        access_log=False
+    )
+    server = _EmbeddedServer(config)
+    server.serve_future = asyncio.run_coroutine_threadsafe(_serve(server), validator.loop)
     
-    bt.logging.info(f"API server started at http://{host}:{port}")
+    bt.logging.info(f"API server scheduled at http://{host}:{port}")
     bt.logging.info(f"API docs available at http://{host}:{port}/docs")
     
-    return thread
+    return server
@@ -6,11 +6,23 @@ Contract interaction module for TAO Colosseum validator.
 Queries the TAO Colosseum smart contract on Bittensor EVM.
 """
 
-from typing import List, Dict, Optional
+import asyncio
+import functools
+import itertools
+import json
+import random
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional
 from datetime import datetime, timedelta
+import numpy as np
 import bittensor as bt
 
 try:
+    import requests
+    from requests.adapters import HTTPAdapter
     from web3 import Web3
     from web3.exceptions import ContractLogicError
     WEB3_AVAILABLE = True
@@ -18,14 +30,38 @@ except ImportError:
     WEB3_AVAILABLE = False
     bt.logging.warning("web3 not installed. Install with: pip install web3")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    bt.logging.warning("orjson not installed, JSON-RPC uses stdlib json. Install with: pip install orjson")
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
 from taocolosseum.core.const import (
     TAO_COLOSSEUM_CONTRACT_ADDRESS,
     BITTENSOR_EVM_RPC,
     BITTENSOR_EVM_CHAIN_ID,
+    BITTENSOR_EVM_WS_RPC,
     BLOCKS_PER_DAY,
     TIME_DECAY_WEIGHTS,
 )
-from taocolosseum.validator.database import cache_bet_event, get_cached_bet_events
+from taocolosseum.validator.database import (
+    cache_bet_event,
+    cache_bet_events_bulk,
+    get_cached_bet_events,
+    get_cached_bet_events_multi,
+    get_cached_bet_events_summary,
+    cache_block_timestamps,
+    get_cached_block_timestamps,
+    get_last_scanned_block,
+    set_last_scanned_block,
+)
 
 
 def _is_rate_limit_error(e: Exception) -> bool:
@@ -45,6 +81,217 @@ def _is_rate_limit_error(e: Exception) -> bool:
     )
 
 
+def _rpc_call_with_retry(
+    fn,
+    *args,
+    max_attempts: int = None,
+    base: float = None,
+    cap: float = None,
+    **kwargs
+):
+    """
+    Call fn(*args, **kwargs), retrying rate-limited failures with jittered exponential backoff.
+    
+    Sleeps min(base * 2**attempt + U(0, base), cap) between attempts. Other
+    errors, and the last rate-limit error, are re-raised.
+    """
+    max_attempts = max_attempts or RPC_RETRY_ATTEMPTS
+    base = RPC_RETRY_BASE if base is None else base
+    cap = RPC_RETRY_CAP if cap is None else cap
+    for attempt in range(max_attempts):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == max_attempts - 1 or not _is_rate_limit_error(e):
+                raise
+            delay = min(base * (2 ** attempt) + random.uniform(0, base), cap)
+            bt.logging.debug(
+                f"RPC rate limited ({type(e).__name__}), retry {attempt + 1}/{max_attempts - 1} in {delay:.2f}s"
+            )
+            time.sleep(delay)
+
+
+def _is_log_range_error(e: Exception) -> bool:
+    """Heuristic: get_logs failed because the block window was too wide or slow."""
+    if _is_rate_limit_error(e):
+        return True
+    s = (str(e) or "").lower()
+    return any(
+        x in s
+        for x in (
+            "timeout",
+            "timed out",
+            "range",
+            "too many",
+            "response size",
+            "query returned more than",
+        )
+    )
+
+
+# eth_getLogs block windows: start here, halve on range/timeout/rate-limit
+# errors down to the minimum, double after each success up to the maximum.
+# Log queries get disproportionately slower as the range grows, so a 7-day
+# scan (~50k blocks) is split into a handful of mid-sized windows.
+GET_LOGS_INITIAL_CHUNK = 10_000
+GET_LOGS_MIN_CHUNK = 500
+GET_LOGS_MAX_CHUNK = 50_000
+
+# Contract-wide scans are split into day-sized windows fetched in parallel
+# (each window still adapts its own chunk size)
+LOG_WINDOW_BLOCKS = BLOCKS_PER_DAY
+LOG_WINDOW_WORKERS = 7
+
+# Concurrent per-miner volume queries, and pooled HTTP connections to the RPC
+# (kept above the worker count so threads never wait on a free connection)
+VOLUME_QUERY_WORKERS = 16
+RPC_POOL_SIZE = 32
+
+# Wei per TAO; int / int true division is exact-rounded, with no Decimal round trip
+_WEI_PER_TAO = 10**18
+
+# Seconds a fetched eth.block_number is reused (EVM blocks land every ~12s)
+BLOCK_NUMBER_TTL = 5.0
+
+# get_miner_volume results are reused within a bucket of this many blocks
+# (~1 hour), so repeated sweeps don't re-query addresses that already ran
+VOLUME_MEMO_BLOCKS = BLOCKS_PER_DAY // 24
+VOLUME_MEMO_SIZE = 4096
+
+# Block timestamps remembered across scans (LRU; timestamps never change)
+BLOCK_TIMESTAMP_CACHE_SIZE = 10_000
+
+# Requests per JSON-RPC batch (providers commonly cap batches at 100-1000)
+RPC_BATCH_SIZE = 100
+
+# Rate-limit retries per RPC call: attempts, base delay and cap (seconds)
+RPC_RETRY_ATTEMPTS = 5
+RPC_RETRY_BASE = 0.25
+RPC_RETRY_CAP = 8.0
+
+# Multicall3 is deployed at the same address on most EVM chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Sub-calls packed into one aggregate3 eth_call (bounded by the node's eth_call gas cap)
+MULTICALL_BATCH_SIZE = 500
+
+# Reconnect backoff for the BetPlaced WebSocket subscription (seconds, doubled per failure)
+SUBSCRIPTION_BACKOFF_MIN = 1.0
+SUBSCRIPTION_BACKOFF_MAX = 60.0
+
+# Keepalive ping interval/timeout for the subscription socket (seconds)
+SUBSCRIPTION_PING_INTERVAL = 20.0
+
+# Padded bettor topics kept in memory (several times the metagraph size)
+ADDRESS_TOPIC_CACHE_SIZE = 4096
+
+# Event topics and selectors are fixed by the ABI; hashed once at import.
+# to_hex keeps the 0x prefix regardless of the installed HexBytes version.
+if WEB3_AVAILABLE:
+    # BetPlaced(uint256 indexed gameId, address indexed bettor, uint8 side, uint256 amount, uint256 newPoolTotal)
+    BET_PLACED_TOPIC = Web3.to_hex(
+        Web3.keccak(text="BetPlaced(uint256,address,uint8,uint256,uint256)")
+    )
+    GAME_RESOLVED_TOPIC = Web3.to_hex(
+        Web3.keccak(text="GameResolved(uint256,uint8,uint256,uint256,uint256,uint256)")
+    )
+    GET_USER_STATS_SELECTOR = bytes(Web3.keccak(text="getUserStats(address)")[:4])
+
+
+def _block_windows(from_block: int, to_block: int, size: int) -> List[tuple]:
+    """Split [from_block, to_block] into consecutive inclusive ranges of at most size blocks."""
+    return [
+        (start, min(start + size - 1, to_block))
+        for start in range(from_block, to_block + 1, size)
+    ]
+
+
+# Miners' addresses repeat every forward step, so each is padded once
+@functools.lru_cache(maxsize=ADDRESS_TOPIC_CACHE_SIZE)
+def _address_topic(address: str) -> str:
+    """Left-pad an EVM address to a 32-byte indexed-topic hex string."""
+    return f"0x{int(address, 16):064x}"
+
+
+def _hex_bytes(value) -> bytes:
+    """Raw bytes of a log field given as HexBytes/bytes or a 0x-prefixed hex string."""
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value[:2] in ('0x', '0X') else value)
+    return bytes(value)
+
+
+def _decode_bet_placed(log) -> Dict:
+    """
+    Decode a BetPlaced log by fixed offsets instead of web3's ABI machinery.
+    
+    Layout: topics[1] = gameId, topics[2] = bettor (last 20 bytes);
+    data = side (uint8), amount (uint256), newPoolTotal (uint256), one word each.
+    """
+    topics = log['topics']
+    data = _hex_bytes(log['data'])
+    if len(topics) < 3 or len(data) < 96:
+        raise ValueError(f"Malformed BetPlaced log: {len(topics)} topics, {len(data)} data bytes")
+    return {
+        'game_id': int.from_bytes(_hex_bytes(topics[1]), 'big'),
+        'bettor': '0x' + _hex_bytes(topics[2])[-20:].hex(),
+        'side': data[31],
+        'amount': int.from_bytes(data[32:64], 'big'),  # In wei
+        'new_pool_total': int.from_bytes(data[64:96], 'big'),
+    }
+
+
+def _rpc_json_default(obj):
+    """orjson fallback for RPC params: bytes/HexBytes as 0x-hex, mappings as dicts."""
+    if isinstance(obj, (bytes, bytearray)):
+        return '0x' + bytes(obj).hex()
+    if hasattr(obj, 'items'):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _install_orjson_codec(provider):
+    """
+    Encode requests and decode responses on a JSON-RPC provider with orjson
+    instead of stdlib json. Large eth_getLogs responses are mostly parse time.
+    Anything orjson rejects goes through the provider's original codec.
+    """
+    default_encode = provider.encode_rpc_request
+    default_decode = provider.decode_rpc_response
+    # Share the provider's id counter so ids stay unique across both paths
+    counter = getattr(provider, 'request_counter', None) or itertools.count()
+    
+    def encode_rpc_request(method, params):
+        try:
+            return orjson.dumps(
+                {"jsonrpc": "2.0", "method": method, "params": params or [], "id": next(counter)},
+                default=_rpc_json_default
+            )
+        except TypeError:
+            return default_encode(method, params)
+    
+    def decode_rpc_response(raw_response):
+        try:
+            return orjson.loads(raw_response)
+        except orjson.JSONDecodeError:
+            return default_decode(raw_response)
+    
+    provider.encode_rpc_request = encode_rpc_request
+    provider.decode_rpc_response = decode_rpc_response
+
+
+def _make_rpc_session() -> "requests.Session":
+    """HTTP session with a connection pool sized for concurrent RPC calls."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=RPC_POOL_SIZE, pool_maxsize=RPC_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# (rpc_url, contract_address) pairs whose chain ID and contract code already checked out
+_verified_endpoints: set = set()
+
+
 # TAO Colosseum contract ABI - only the functions/events we need
 # Matches TAO_Colosseum.sol: Underdog only, no referral, BetPlaced without referrer, UserStats without referralEarnings
 colosseum_ABI = [
@@ -90,6 +337,36 @@ colosseum_ABI = [
     }
 ]
 
+# Multicall3 ABI - only aggregate3
+multicall3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
 
 class ContractClient:
     """Client for interacting with the TAO Colosseum contract."""
@@ -101,18 +378,47 @@ class ContractClient:
         self.rpc_url = rpc_url or BITTENSOR_EVM_RPC
         self.contract_address = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
         
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        # Shared pooled session: keep-alive TCP/TLS across calls and threads
+        self._session = _make_rpc_session()
+        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url, session=self._session))
+        if ORJSON_AVAILABLE:
+            _install_orjson_codec(self.w3.provider)
+        self.checksum_address = Web3.to_checksum_address(self.contract_address)
         self.contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(self.contract_address),
+            address=self.checksum_address,
             abi=colosseum_ABI
         )
-        # Cache for resolved game IDs (same block range reused across miners in one volume check)
-        self._resolved_cache: Optional[tuple] = None  # (from_block, to_block, set) or None
+        self.multicall = self.w3.eth.contract(
+            address=Web3.to_checksum_address(MULTICALL3_ADDRESS),
+            abi=multicall3_ABI
+        )
+        # Whether Multicall3 has code on this chain; checked on first batch call
+        self._multicall_deployed: Optional[bool] = None
+        # block number -> timestamp, LRU-ordered; shared by volume-query threads
+        self._ts_cache: "OrderedDict[int, int]" = OrderedDict()
+        self._ts_cache_lock = threading.Lock()
+        # (monotonic fetch time, block number) for get_current_block
+        self._block_cache = (float("-inf"), 0)
+        # Resolved game_id -> GameResolved block, complete for _resolved_range
+        # ((first, last) block, or None); extended with only the new blocks each call
+        self._resolved_games: Dict[int, int] = {}
+        self._resolved_range: Optional[tuple] = None
+        self._resolved_lock = threading.Lock()
+        # Set while the BetPlaced subscription is connected and its backfill has finished
+        self._subscription_ready = threading.Event()
+        self._subscription_thread: Optional[threading.Thread] = None
         
         bt.logging.info(
             f"ContractClient initialized: contract={self.contract_address}, rpc={self.rpc_url}"
         )
         
+        # Chain ID and deployed bytecode never change for an endpoint, so only
+        # the first client per (rpc_url, contract_address) pays for the checks
+        endpoint = (self.rpc_url, self.contract_address)
+        if endpoint in _verified_endpoints:
+            return
+        chain_ok = code_ok = False
+        
         # Verify chain ID matches expected network
         try:
             actual_chain_id = self.w3.eth.chain_id
@@ -123,12 +429,13 @@ class ContractClient:
                 )
             else:
                 bt.logging.info(f"Chain ID verified: {actual_chain_id}")
+                chain_ok = True
         except Exception as e:
             bt.logging.warning(f"Could not verify chain ID: {e}")
         
         # Verify contract exists at address
         try:
-            code = self.w3.eth.get_code(Web3.to_checksum_address(self.contract_address))
+            code = self.w3.eth.get_code(self.checksum_address)
             if not code or len(code) <= 2:
                 bt.logging.warning(
                     f"NO CONTRACT CODE at {self.contract_address} on chain {BITTENSOR_EVM_CHAIN_ID}! "
@@ -136,8 +443,201 @@ class ContractClient:
                 )
             else:
                 bt.logging.info(f"Contract verified: {len(code)} bytes of code at {self.contract_address[:12]}...")
+                code_ok = True
         except Exception as e:
             bt.logging.warning(f"Could not verify contract code: {e}")
+        
+        # Failed or inconclusive checks are retried (and re-warned) by the next client
+        if chain_ok and code_ok:
+            _verified_endpoints.add(endpoint)
+    
+    @property
+    def subscription_healthy(self) -> bool:
+        """True when the bet_events cache is kept current by the WebSocket subscription."""
+        return self._subscription_ready.is_set()
+    
+    def close(self):
+        """Close the pooled HTTP session and its keep-alive connections."""
+        self._session.close()
+    
+    def start_subscription(self, start_block: int = None, ws_url: str = None) -> bool:
+        """
+        Follow BetPlaced logs over eth_subscribe and write them to the bet_events cache.
+        
+        Runs on a daemon thread with its own event loop. On every (re)connect the
+        range since the last seen block is backfilled with eth_getLogs; once that
+        finishes, get_bets_last_7_days reads from the cache without polling.
+        
+        Args:
+            start_block: First block to backfill (default: 7 days back)
+            ws_url: WebSocket RPC endpoint (default: BITTENSOR_EVM_WS_RPC)
+            
+        Returns:
+            True if the subscriber is running
+        """
+        ws_url = ws_url or BITTENSOR_EVM_WS_RPC
+        if not ws_url:
+            return False
+        if not WEBSOCKETS_AVAILABLE:
+            bt.logging.warning("websockets not installed, polling for bet events. Install with: pip install websockets")
+            return False
+        if self._subscription_thread is not None:
+            return True
+        
+        if start_block is None:
+            start_block = max(0, self.get_current_block() - (BLOCKS_PER_DAY * 7))
+        self._subscription_thread = threading.Thread(
+            target=asyncio.run,
+            args=(self._run_subscription(ws_url, start_block),),
+            name="bet-subscription",
+            daemon=True,
+        )
+        self._subscription_thread.start()
+        return True
+    
+    async def _run_subscription(self, ws_url: str, start_block: int):
+        """Subscribe, backfill and stream until cancelled, reconnecting with backoff."""
+        subscribe = json.dumps({
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "eth_subscribe",
+            "params": ["logs", {"address": self.contract_address, "topics": [BET_PLACED_TOPIC]}],
+        })
+        resume_block = start_block
+        backoff = SUBSCRIPTION_BACKOFF_MIN
+        
+        while True:
+            backfill = None
+            to_block = last_seen = resume_block
+            try:
+                async with websockets.connect(
+                    ws_url,
+                    ping_interval=SUBSCRIPTION_PING_INTERVAL,
+                    ping_timeout=SUBSCRIPTION_PING_INTERVAL,
+                    max_queue=None,
+                    max_size=None,
+                ) as ws:
+                    await ws.send(subscribe)
+                    reply = json.loads(await ws.recv())
+                    if 'result' not in reply:
+                        raise RuntimeError(f"eth_subscribe rejected: {reply.get('error')}")
+                    bt.logging.info(f"BetPlaced subscription {reply['result']} active on {ws_url}")
+                    backoff = SUBSCRIPTION_BACKOFF_MIN
+                    
+                    # Subscribed first, so the backfill overlaps the stream; duplicates are ignored by the cache
+                    to_block = await asyncio.to_thread(self.get_current_block)
+                    backfill = asyncio.create_task(
+                        asyncio.to_thread(self._backfill_bet_events, resume_block, to_block)
+                    )
+                    
+                    def on_backfill_done(task):
+                        # Healthy only once caught up; a failed backfill forces a reconnect
+                        if not task.cancelled() and task.exception() is None:
+                            self._subscription_ready.set()
+                        else:
+                            asyncio.ensure_future(ws.close())
+                    
+                    backfill.add_done_callback(on_backfill_done)
+                    
+                    async for message in ws:
+                        log = json.loads(message).get('params', {}).get('result')
+                        if not isinstance(log, dict) or log.get('removed'):
+                            continue
+                        try:
+                            block_number = await asyncio.to_thread(self._cache_streamed_log, log)
+                            last_seen = max(last_seen, block_number)
+                        except Exception as e:
+                            bt.logging.debug(f"Error caching streamed log: {e}")
+                    raise ConnectionError("subscription closed")
+            except Exception as e:
+                self._subscription_ready.clear()
+                if backfill is not None and backfill.done() and not backfill.cancelled() and backfill.exception() is None:
+                    resume_block = max(to_block, last_seen)
+                bt.logging.warning(
+                    f"BetPlaced subscription lost ({type(e).__name__}: {e}); "
+                    f"reconnecting in {backoff:.0f}s from block {resume_block}"
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, SUBSCRIPTION_BACKOFF_MAX)
+    
+    def _backfill_bet_events(self, from_block: int, to_block: int):
+        """Cache every BetPlaced event in a block range; raises if the scan failed."""
+        events_by_bettor = self.get_all_bet_events(from_block, to_block)
+        if events_by_bettor is None:
+            raise RuntimeError(f"backfill {from_block}..{to_block} failed")
+        self._cache_bet_events(events_by_bettor)
+    
+    def _cache_bet_events(self, events_by_bettor: Dict[str, List[Dict]]):
+        """Store get_all_bet_events output in the bet_events cache in one transaction."""
+        cache_bet_events_bulk(
+            [
+                (bettor, e['game_id'], e['amount'], e['side'], e['block_number'], e['timestamp'])
+                for bettor, events in events_by_bettor.items()
+                for e in events
+            ],
+            contract_address=self.contract_address
+        )
+    
+    def sync_bet_events(self, to_block: int = None) -> int:
+        """
+        Bring the bet_events cache up to to_block by scanning only blocks after
+        the last synced one (at most the last 7 days).
+        
+        Args:
+            to_block: Block to sync up to (default: latest)
+            
+        Day-sized windows are fetched concurrently and cached in order; the
+        recorded tip advances past each window as it is stored, so after a
+        failure only the remaining windows are fetched again.
+        
+        Returns:
+            First block scanned (to_block + 1 if already up to date)
+            
+        Raises:
+            RuntimeError: If a window's BetPlaced scan failed; the tip stays at
+                the last window cached before it
+        """
+        to_block = to_block if to_block is not None else self.get_current_block()
+        window_start = max(0, to_block - (BLOCKS_PER_DAY * 7))
+        last_block = get_last_scanned_block(self.contract_address)
+        from_block = window_start if last_block is None else max(window_start, last_block + 1)
+        
+        windows = _block_windows(from_block, to_block, LOG_WINDOW_BLOCKS)
+        if not windows:
+            return from_block
+        
+        with ThreadPoolExecutor(
+            max_workers=min(LOG_WINDOW_WORKERS, len(windows)),
+            thread_name_prefix="bet-sync"
+        ) as executor:
+            futures = [executor.submit(self.get_all_bet_events, start, end) for start, end in windows]
+            for (start, end), future in zip(windows, futures):
+                events_by_bettor = future.result()
+                if events_by_bettor is None:
+                    raise RuntimeError(f"bet event sync {start}..{end} failed")
+                self._cache_bet_events(events_by_bettor)
+                set_last_scanned_block(end, self.contract_address)
+        
+        bt.logging.debug(f"Synced bet events {from_block}..{to_block}")
+        return from_block
+    
+    def _cache_streamed_log(self, log: Dict) -> int:
+        """Decode and cache one eth_subscription log; returns its block number."""
+        decoded = _decode_bet_placed(log)
+        block_number = int(log['blockNumber'], 16)
+        timestamp = self.get_block_timestamps([block_number]).get(block_number)
+        if timestamp is None:
+            timestamp = int(datetime.utcnow().timestamp())
+        cache_bet_event(
+            evm_address=decoded['bettor'],
+            game_id=decoded['game_id'],
+            amount=decoded['amount'] / _WEI_PER_TAO,
+            side=decoded['side'],
+            block_number=block_number,
+            timestamp=timestamp,
+            contract_address=self.contract_address
+        )
+        return block_number
     
     def is_connected(self) -> bool:
         """Check if connected to the RPC."""
@@ -147,8 +647,14 @@ class ContractClient:
             return False
     
     def get_current_block(self) -> int:
-        """Get the current block number."""
-        return self.w3.eth.block_number
+        """Get the current block number, reusing a fetch from the last BLOCK_NUMBER_TTL seconds."""
+        now = time.monotonic()
+        fetched_at, block = self._block_cache
+        if now - fetched_at < BLOCK_NUMBER_TTL:
+            return block
+        block = self.w3.eth.block_number
+        self._block_cache = (now, block)
+        return block
     
     def get_user_stats(self, address: str) -> Optional[Dict]:
         """
@@ -177,6 +683,214 @@ class ContractClient:
             bt.logging.warning(f"Error getting user stats for {address}: {e}")
             return None
     
+    def _has_multicall(self) -> bool:
+        """Whether Multicall3 is deployed at MULTICALL3_ADDRESS (looked up once per client)."""
+        if self._multicall_deployed is None:
+            try:
+                code = self.w3.eth.get_code(self.multicall.address)
+            except Exception as e:
+                # Don't remember a failed lookup; try the multicall and let it fall back
+                bt.logging.debug(f"Multicall3 code lookup failed: {e}")
+                return True
+            self._multicall_deployed = len(code) > 0
+            if not self._multicall_deployed:
+                bt.logging.warning(
+                    f"Multicall3 not deployed at {MULTICALL3_ADDRESS}, querying user stats individually"
+                )
+        return self._multicall_deployed
+    
+    def get_user_stats_batch(self, addresses: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Get user stats for many addresses with Multicall3 aggregate3.
+        
+        Packs up to MULTICALL_BATCH_SIZE getUserStats calls into each eth_call;
+        falls back to get_user_stats per address if a batch fails or Multicall3
+        isn't deployed on this chain.
+        
+        Args:
+            addresses: EVM addresses to query
+            
+        Returns:
+            Dict of address -> stats dict (as get_user_stats), None where the call reverted
+        """
+        addresses = list(dict.fromkeys(addresses))
+        if not self._has_multicall():
+            return {a: self.get_user_stats(a) for a in addresses}
+        target = self.checksum_address
+        results: Dict[str, Optional[Dict]] = {}
+        
+        for i in range(0, len(addresses), MULTICALL_BATCH_SIZE):
+            batch = addresses[i:i + MULTICALL_BATCH_SIZE]
+            try:
+                # getUserStats(address): selector + address left-padded to one word
+                calls = [
+                    (target, True, GET_USER_STATS_SELECTOR + bytes.fromhex(f"{int(a, 16):064x}"))
+                    for a in batch
+                ]
+                returned = self.multicall.functions.aggregate3(calls).call()
+            except Exception as e:
+                bt.logging.warning(
+                    f"Multicall getUserStats failed for {len(batch)} address(es), "
+                    f"querying individually: {type(e).__name__}: {e}"
+                )
+                results.update((a, self.get_user_stats(a)) for a in batch)
+                continue
+            
+            for address, (success, data) in zip(batch, returned):
+                if not success or len(data) < 128:
+                    results[address] = None
+                    continue
+                # Four uint256 words: totalBets, totalWins, totalWinnings (wei), totalLosses
+                words = [int.from_bytes(data[j:j + 32], 'big') for j in range(0, 128, 32)]
+                results[address] = {
+                    'total_bets': words[0],
+                    'total_wins': words[1],
+                    'total_winnings': words[2],  # In wei
+                    'total_losses': words[3]
+                }
+        
+        return results
+    
+    def _get_logs_chunked(
+        self,
+        topics: list,
+        from_block: int,
+        to_block: int,
+        initial_chunk: int = GET_LOGS_INITIAL_CHUNK,
+        min_chunk: int = GET_LOGS_MIN_CHUNK,
+        max_chunk: int = GET_LOGS_MAX_CHUNK,
+    ) -> list:
+        """
+        eth_getLogs on the contract over [from_block, to_block] in adaptive windows.
+        
+        The window halves when the provider rejects or times out on a range and
+        doubles again after each success.
+        
+        Raises:
+            The provider's exception once the window is already at min_chunk,
+            or for errors unrelated to the range size
+        """
+        logs = []
+        cursor = from_block
+        chunk = initial_chunk
+        while cursor <= to_block:
+            end = min(cursor + chunk - 1, to_block)
+            try:
+                # Throttling is retried in place, so the scan resumes at cursor
+                logs.extend(_rpc_call_with_retry(self.w3.eth.get_logs, {
+                    'fromBlock': cursor,
+                    'toBlock': end,
+                    'address': self.checksum_address,
+                    'topics': topics
+                }))
+            except Exception as e:
+                if chunk > min_chunk and _is_log_range_error(e):
+                    chunk = max(min_chunk, chunk // 2)
+                    bt.logging.debug(
+                        f"get_logs {cursor}..{end} failed ({type(e).__name__}), "
+                        f"retrying with {chunk}-block window"
+                    )
+                    continue
+                raise
+            cursor = end + 1
+            chunk = min(chunk * 2, max_chunk)
+        return logs
+    
+    def _get_logs_windowed(self, topics: list, from_block: int, to_block: int) -> list:
+        """
+        _get_logs_chunked over LOG_WINDOW_BLOCKS-sized windows fetched concurrently.
+        
+        Logs are returned in block order; raises if any window fails.
+        """
+        windows = _block_windows(from_block, to_block, LOG_WINDOW_BLOCKS)
+        if len(windows) <= 1:
+            return self._get_logs_chunked(topics, from_block, to_block)
+        
+        with ThreadPoolExecutor(
+            max_workers=min(LOG_WINDOW_WORKERS, len(windows)),
+            thread_name_prefix="get-logs"
+        ) as executor:
+            parts = list(executor.map(lambda w: self._get_logs_chunked(topics, *w), windows))
+        return list(itertools.chain.from_iterable(parts))
+    
+    def get_block_timestamps(self, block_numbers) -> Dict[int, int]:
+        """
+        Get timestamps for a set of blocks: from the in-memory LRU, then the
+        block_timestamps table, and only the remaining misses in one JSON-RPC
+        batch (which are then stored in both).
+        
+        Args:
+            block_numbers: Iterable of block numbers (duplicates are fine)
+            
+        Returns:
+            Dict of block number -> unix timestamp (blocks that failed are omitted)
+        """
+        timestamps = {}
+        misses = []
+        with self._ts_cache_lock:
+            for block_number in set(block_numbers):
+                timestamp = self._ts_cache.get(block_number)
+                if timestamp is None:
+                    misses.append(block_number)
+                else:
+                    self._ts_cache.move_to_end(block_number)
+                    timestamps[block_number] = timestamp
+        if not misses:
+            return timestamps
+        
+        try:
+            fetched = get_cached_block_timestamps(misses)
+        except Exception as e:
+            bt.logging.debug(f"Block timestamp DB lookup failed: {e}")
+            fetched = {}
+        if len(fetched) < len(misses):
+            from_rpc = self._fetch_block_timestamps(sorted(set(misses) - fetched.keys()))
+            cache_block_timestamps(from_rpc)
+            fetched.update(from_rpc)
+        
+        timestamps.update(fetched)
+        with self._ts_cache_lock:
+            self._ts_cache.update(fetched)
+            while len(self._ts_cache) > BLOCK_TIMESTAMP_CACHE_SIZE:
+                self._ts_cache.popitem(last=False)
+        return timestamps
+    
+    def _fetch_block_timestamps(self, block_numbers: List[int]) -> Dict[int, int]:
+        """
+        Fetch timestamps for blocks in JSON-RPC batches of RPC_BATCH_SIZE.
+        
+        Falls back to one eth_getBlockByNumber per block when the installed
+        web3 or the RPC provider does not support batch requests.
+        """
+        timestamps = {}
+        batch_requests = getattr(self.w3, 'batch_requests', None)
+        if batch_requests is not None and len(block_numbers) > 1:
+            def fetch_batch(chunk):
+                with batch_requests() as batch:
+                    for block_number in chunk:
+                        batch.add(self.w3.eth.get_block(block_number))
+                    return batch.execute()
+            
+            try:
+                for start in range(0, len(block_numbers), RPC_BATCH_SIZE):
+                    chunk = block_numbers[start:start + RPC_BATCH_SIZE]
+                    blocks = _rpc_call_with_retry(fetch_batch, chunk)
+                    for block_number, block in zip(chunk, blocks):
+                        timestamps[block_number] = block['timestamp']
+                return timestamps
+            except Exception as e:
+                bt.logging.debug(f"Batch get_block failed, fetching remaining blocks one by one: {e}")
+        
+        # Blocks from batches that already succeeded are kept
+        for block_number in block_numbers:
+            if block_number in timestamps:
+                continue
+            try:
+                timestamps[block_number] = _rpc_call_with_retry(self.w3.eth.get_block, block_number)['timestamp']
+            except Exception as e:
+                bt.logging.debug(f"get_block({block_number}) failed: {e}")
+        return timestamps
+    
     def get_bet_events(
         self, 
         address: str, 
@@ -192,76 +906,70 @@ class ContractClient:
             to_block: Ending block (default: latest)
             
         Returns:
-            List of bet event dicts
+            List of bet event dicts (amount in TAO)
         """
         try:
-            checksum_address = Web3.to_checksum_address(address)
-            to_block_val = to_block if to_block else self.w3.eth.block_number
-            
-            # Get the event topic (BetPlaced event signature hash)
-            # BetPlaced(uint256 indexed gameId, address indexed bettor, uint8 side, uint256 amount, uint256 newPoolTotal)
-            event_signature = self.w3.keccak(text="BetPlaced(uint256,address,uint8,uint256,uint256)")
+            to_block_val = to_block if to_block else self.get_current_block()
             
             # Pad the address to 32 bytes for indexed parameter filtering
-            address_topic = '0x' + checksum_address[2:].lower().zfill(64)
+            address_topic = _address_topic(address)
             
             # Use eth.get_logs directly - most reliable approach
             bt.logging.info(
                 f"get_logs: address={address[:10]}...0x{address[-6:]} "
                 f"from_block={from_block} to_block={to_block_val} contract={self.contract_address[:10]}..."
             )
-            logs = self.w3.eth.get_logs({
-                'fromBlock': from_block,
-                'toBlock': to_block_val,
-                'address': self.contract_address,
-                'topics': [
-                    '0x' + event_signature.hex(),  # Event signature (0x-prefixed)
+            logs = self._get_logs_chunked(
+                [
+                    BET_PLACED_TOPIC,       # Event signature (0x-prefixed)
                     None,                   # gameId (indexed, but we want all)
                     address_topic           # bettor (indexed)
-                ]
-            })
+                ],
+                from_block,
+                to_block_val
+            )
             bt.logging.info(
                 f"get_logs returned {len(logs)} log(s) for {address[:10]}...0x{address[-6:]}"
             )
             
+            # One batched round trip for every distinct block, not one per log
+            block_timestamps = self.get_block_timestamps(log['blockNumber'] for log in logs)
+            
             bet_events = []
             for log in logs:
                 try:
                     # Decode the event data
-                    decoded = self.contract.events.BetPlaced().process_log(log)
+                    decoded = _decode_bet_placed(log)
                     
                     # Get block timestamp
-                    try:
-                        block = self.w3.eth.get_block(log['blockNumber'])
-                        timestamp = block['timestamp']
-                    except Exception:
+                    timestamp = block_timestamps.get(log['blockNumber'])
+                    if timestamp is None:
                         timestamp = int(datetime.utcnow().timestamp())
                     
                     bet_event = {
-                        'game_id': decoded['args']['gameId'],
-                        'bettor': decoded['args']['bettor'],
-                        'side': decoded['args']['side'],
-                        'amount': decoded['args']['amount'],  # In wei
+                        'game_id': decoded['game_id'],
+                        'bettor': decoded['bettor'],
+                        'side': decoded['side'],
+                        'amount': decoded['amount'] / _WEI_PER_TAO,  # In TAO
                         'block_number': log['blockNumber'],
                         'timestamp': timestamp,
-                        'tx_hash': log['transactionHash'].hex()
+                        'tx_hash': bytes(log['transactionHash'])  # Raw; '0x' + .hex() when displayed
                     }
                     bet_events.append(bet_event)
-                    
-                    # Cache the event with contract address
-                    cache_bet_event(
-                        evm_address=address.lower(),
-                        game_id=bet_event['game_id'],
-                        amount=float(self.w3.from_wei(bet_event['amount'], 'ether')),
-                        side=bet_event['side'],
-                        block_number=bet_event['block_number'],
-                        timestamp=bet_event['timestamp'],
-                        contract_address=self.contract_address
-                    )
                 except Exception as decode_err:
                     bt.logging.debug(f"Error decoding log: {decode_err}")
                     continue
             
+            # Cache the whole batch in one transaction
+            bettor = address.lower()
+            cache_bet_events_bulk(
+                [
+                    (bettor, e['game_id'], e['amount'], e['side'], e['block_number'], e['timestamp'])
+                    for e in bet_events
+                ],
+                contract_address=self.contract_address
+            )
+            
             return bet_events
             
         except Exception as e:
@@ -276,47 +984,133 @@ class ContractClient:
                 )
             return []
     
-    def get_resolved_game_ids(self, from_block: int, to_block: int = None) -> set:
+    def get_all_bet_events(
+        self,
+        from_block: int,
+        to_block: int = None,
+        bettors: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, List[Dict]]]:
         """
-        Get set of game IDs that were resolved with a winner in the block range.
-        Tied/cancelled games do not emit GameResolved, so their bets must be excluded from volume.
+        Get every BetPlaced event in a block range with one contract-wide scan,
+        bucketed by bettor.
+        
+        Replaces one bettor-filtered get_logs per miner over the same range.
         
         Args:
             from_block: Starting block
             to_block: Ending block (default: latest)
+            bettors: If given, only events from these addresses are kept; block
+                timestamps are then fetched only for blocks they appear in
             
         Returns:
-            Set of game_id (int) that have a winner
+            Dict of lowercase bettor address -> list of bet event dicts (amount
+            in TAO), or None if the scan failed
         """
         try:
-            to_block_val = to_block if to_block is not None else self.w3.eth.block_number
-            if self._resolved_cache is not None:
-                c_from, c_to, c_set = self._resolved_cache
-                if c_from == from_block and c_to == to_block_val:
-                    return c_set
-            resolved = set()
-            event_signature = self.w3.keccak(
-                text="GameResolved(uint256,uint8,uint256,uint256,uint256,uint256)"
+            to_block_val = to_block if to_block else self.get_current_block()
+            
+            logs = self._get_logs_windowed(
+                [BET_PLACED_TOPIC],
+                from_block,
+                to_block_val
+            )
+            bt.logging.info(
+                f"get_all_bet_events: {from_block}..{to_block_val} returned {len(logs)} log(s)"
             )
-            logs = self.w3.eth.get_logs({
-                'fromBlock': from_block,
-                'toBlock': to_block_val,
-                'address': self.contract_address,
-                'topics': ['0x' + event_signature.hex()]
-            })
+            
+            wanted = {b.lower() for b in bettors} if bettors is not None else None
+            decoded_logs = []
             for log in logs:
                 try:
-                    decoded = self.contract.events.GameResolved().process_log(log)
-                    resolved.add(decoded['args']['gameId'])
+                    decoded = _decode_bet_placed(log)
                 except Exception as decode_err:
-                    bt.logging.debug(f"Error decoding GameResolved log: {decode_err}")
+                    bt.logging.debug(f"Error decoding log: {decode_err}")
                     continue
-            if resolved:
-                bt.logging.debug(
-                    f"get_resolved_game_ids: {from_block}..{to_block_val} -> {len(resolved)} resolved game(s)"
+                if wanted is None or decoded['bettor'] in wanted:
+                    decoded_logs.append((log['blockNumber'], decoded))
+            
+            block_timestamps = self.get_block_timestamps(block for block, _ in decoded_logs)
+            
+            events_by_bettor = defaultdict(list)
+            for block_number, decoded in decoded_logs:
+                timestamp = block_timestamps.get(block_number)
+                if timestamp is None:
+                    timestamp = int(datetime.utcnow().timestamp())
+                
+                events_by_bettor[decoded['bettor']].append({
+                    'game_id': decoded['game_id'],
+                    'amount': decoded['amount'] / _WEI_PER_TAO,
+                    'side': decoded['side'],
+                    'block_number': block_number,
+                    'timestamp': timestamp
+                })
+            
+            return events_by_bettor
+            
+        except Exception as e:
+            bt.logging.warning(
+                f"get_all_bet_events failed from_block={from_block} "
+                f"to_block={to_block or 'latest'}: {type(e).__name__}: {e}"
+            )
+            if _is_rate_limit_error(e):
+                bt.logging.warning(
+                    "RPC rate limit or throttling suspected (429/rate limit in error). "
+                    "Consider using a dedicated RPC or increasing request spacing."
                 )
-            self._resolved_cache = (from_block, to_block_val, resolved)
-            return resolved
+            return None
+    
+    def get_resolved_game_ids(self, from_block: int, to_block: int = None) -> set:
+        """
+        Get set of game IDs that were resolved with a winner in the block range.
+        Tied/cancelled games do not emit GameResolved, so their bets must be excluded from volume.
+        
+        Resolutions already fetched are kept with their block, so a range that
+        only moved forward fetches GameResolved logs after the last scanned block.
+        
+        Args:
+            from_block: Starting block
+            to_block: Ending block (default: latest)
+            
+        Returns:
+            Set of game_id (int) that have a winner
+        """
+        try:
+            to_block_val = to_block if to_block is not None else self.get_current_block()
+            with self._resolved_lock:
+                cached = self._resolved_range
+                if cached is None or from_block < cached[0] or from_block > cached[1] + 1:
+                    # Nothing usable cached for this range: scan all of it
+                    games, last_block = {}, from_block - 1
+                else:
+                    games, last_block = self._resolved_games, cached[1]
+                
+                if to_block_val > last_block:
+                    logs = self._get_logs_windowed(
+                        [GAME_RESOLVED_TOPIC],
+                        last_block + 1,
+                        to_block_val
+                    )
+                    for log in logs:
+                        try:
+                            # gameId is the only indexed field (topics[1])
+                            game_id = int.from_bytes(_hex_bytes(log['topics'][1]), 'big')
+                            games[game_id] = log['blockNumber']
+                        except Exception as decode_err:
+                            bt.logging.debug(f"Error decoding GameResolved log: {decode_err}")
+                            continue
+                    bt.logging.debug(
+                        f"get_resolved_game_ids: scanned {last_block + 1}..{to_block_val}, "
+                        f"{len(logs)} new GameResolved log(s)"
+                    )
+                    last_block = to_block_val
+                
+                # Forget resolutions that fell out of the front of the window
+                if cached is not None and from_block > cached[0]:
+                    games = {g: b for g, b in games.items() if b >= from_block}
+                self._resolved_games = games
+                self._resolved_range = (from_block, last_block)
+                
+                return {g for g, b in games.items() if b <= to_block_val}
         except Exception as e:
             bt.logging.warning(
                 f"get_resolved_game_ids failed from_block={from_block} to_block={to_block}: {e}"
@@ -327,13 +1121,14 @@ class ContractClient:
                 )
             return set()
     
-    def get_bets_last_7_days(self, address: str) -> List[Dict]:
+    def get_bets_last_7_days(self, address: str, raise_errors: bool = False) -> List[Dict]:
         """
         Get bets from the last 7 days for an address that belong to resolved games only.
         Tied/cancelled games are excluded so volume cannot be gamed by refunded bets.
         
         Args:
             address: EVM address to query
+            raise_errors: Re-raise RPC/DB failures instead of returning an empty list
             
         Returns:
             List of bet event dicts (only from games that emitted GameResolved)
@@ -348,15 +1143,16 @@ class ContractClient:
             
             # First check cache (only for current contract)
             seven_days_ago = int((datetime.utcnow() - timedelta(days=7)).timestamp())
-            cached_events = get_cached_bet_events(
-                address.lower(), 
+            last_cached_block, cached_count = get_cached_bet_events_summary(
+                address.lower(),
                 seven_days_ago,
                 contract_address=self.contract_address
             )
             
             new_events = []
-            if cached_events:
-                last_cached_block = max(e['block_number'] for e in cached_events)
+            if self.subscription_healthy:
+                bt.logging.debug(f"Using streamed events for {address[:10]}...")
+            elif cached_count:
                 if last_cached_block < current_block - 100:
                     from_block = last_cached_block + 1
                     new_events = self.get_bet_events(address, from_block)
@@ -365,11 +1161,18 @@ class ContractClient:
             else:
                 new_events = self.get_bet_events(address, from_block)
             
+            # Rows are only loaded once the refetch decision is made
+            cached_events = get_cached_bet_events(
+                address.lower(), 
+                seven_days_ago,
+                contract_address=self.contract_address
+            ) if cached_count else []
+            
             # Combine cached and new events (or cached only if cache is fresh)
             all_events = cached_events + [
                 {
                     'game_id': e['game_id'],
-                    'amount': float(self.w3.from_wei(e['amount'], 'ether')),
+                    'amount': e['amount'],
                     'side': e['side'],
                     'block_number': e['block_number'],
                     'timestamp': e['timestamp']
@@ -410,6 +1213,8 @@ class ContractClient:
                     "RPC rate limit or throttling suspected (429/rate limit in error). "
                     "Consider using a dedicated RPC or increasing request spacing."
                 )
+            if raise_errors:
+                raise
             return []
 
 
@@ -423,38 +1228,53 @@ def calculate_time_decayed_volume(bet_events: List[Dict]) -> tuple:
     Returns:
         Tuple of (weighted_volume, daily_volumes_list)
     """
-    now = datetime.utcnow()
-    daily_volumes = [0.0] * 7  # [today, yesterday, ..., 6 days ago]
+    if not bet_events:
+        return 0.0, [0.0] * 7
     
-    for event in bet_events:
-        try:
-            event_time = datetime.utcfromtimestamp(event['timestamp'])
-            days_ago = (now - event_time).days
-            
-            if 0 <= days_ago < 7:
-                # Amount should already be in TAO (ether units)
-                amount = event.get('amount', 0)
-                if isinstance(amount, int):
-                    # If still in wei, convert
-                    amount = amount / 1e18
-                daily_volumes[days_ago] += amount
-        except Exception as e:
-            bt.logging.debug(f"Error processing bet event: {e}")
-            continue
+    n = len(bet_events)
+    try:
+        timestamps = np.fromiter((e['timestamp'] for e in bet_events), dtype=np.float64, count=n)
+        # Every event source converts to TAO once, at decode time
+        amounts = np.fromiter(
+            (e.get('amount', 0) for e in bet_events),
+            dtype=np.float64,
+            count=n
+        )
+    except Exception as e:
+        bt.logging.debug(f"Error processing bet events: {e}")
+        return 0.0, [0.0] * 7
+    
+    # Whole days elapsed, floored like timedelta.days: 0 = today ... 6 = 6 days ago.
+    # Computed in place in the timestamps buffer; future (-1) and older (7+) events
+    # fold into overflow bin 7, which is dropped, instead of masking copies.
+    days_ago = timestamps
+    np.subtract(time.time(), days_ago, out=days_ago)
+    np.floor_divide(days_ago, 86400.0, out=days_ago)
+    np.clip(days_ago, -1, 7, out=days_ago)
+    np.mod(days_ago, 8, out=days_ago)
+    daily = np.bincount(days_ago.astype(np.intp), weights=amounts, minlength=8)[:7]
     
     # Apply decay weights
-    weighted_volume = sum(
-        vol * weight 
-        for vol, weight in zip(daily_volumes, TIME_DECAY_WEIGHTS)
-    )
+    weighted_volume = float(daily @ TIME_DECAY_WEIGHTS)
     
-    return weighted_volume, daily_volumes
+    return weighted_volume, daily.tolist()
+
+
+@functools.lru_cache(maxsize=VOLUME_MEMO_SIZE)
+def _memoized_miner_volume(client: ContractClient, evm_address: str, block_bucket: int) -> tuple:
+    """Volume for one address and block bucket; errors propagate and are not cached."""
+    weighted_volume, daily_volumes = calculate_time_decayed_volume(
+        client.get_bets_last_7_days(evm_address, raise_errors=True)
+    )
+    return weighted_volume, tuple(daily_volumes)
 
 
 def get_miner_volume(client: ContractClient, evm_address: str) -> tuple:
     """
     Get time-decayed betting volume for a miner's EVM address.
     
+    Results are memoized per VOLUME_MEMO_BLOCKS bucket of the current block.
+    
     Args:
         client: ContractClient instance
         evm_address: Miner's EVM address
@@ -466,8 +1286,11 @@ def get_miner_volume(client: ContractClient, evm_address: str) -> tuple:
         return 0.0, [0.0] * 7
     
     try:
-        bet_events = client.get_bets_last_7_days(evm_address)
-        return calculate_time_decayed_volume(bet_events)
+        block_bucket = client.get_current_block() // VOLUME_MEMO_BLOCKS
+        weighted_volume, daily_volumes = _memoized_miner_volume(
+            client, evm_address.lower(), block_bucket
+        )
+        return weighted_volume, list(daily_volumes)
     except Exception as e:
         bt.logging.warning(f"Error getting miner volume for {evm_address[:10]}...: {type(e).__name__}: {e}")
         if _is_rate_limit_error(e):
@@ -477,6 +1300,90 @@ def get_miner_volume(client: ContractClient, evm_address: str) -> tuple:
         return 0.0, [0.0] * 7
 
 
+def get_miners_volumes(
+    client: ContractClient,
+    addresses: Iterable[str],
+    max_workers: int = VOLUME_QUERY_WORKERS
+) -> Dict[str, tuple]:
+    """
+    Get time-decayed betting volume for many EVM addresses.
+    
+    The bet_events cache is brought up to the chain tip (by the subscription,
+    or by sync_bet_events scanning only blocks since the last sync), then all
+    addresses' 7-day events are read from it in one query. If the sync fails,
+    each address falls back to get_miner_volume on a worker thread; those
+    calls are RPC-bound, so they overlap while waiting on the network.
+    
+    Args:
+        client: ContractClient instance
+        addresses: Miner EVM addresses (duplicates are queried once)
+        max_workers: Maximum concurrent queries
+        
+    Returns:
+        Dict of address -> (weighted_volume, daily_volumes)
+    """
+    addresses = list(dict.fromkeys(a for a in addresses if a))
+    if not addresses:
+        return {}
+    
+    events_by_bettor = None
+    try:
+        current_block = client.get_current_block()
+        from_block = max(0, current_block - (BLOCKS_PER_DAY * 7))
+        if not client.subscription_healthy:
+            # The subscription keeps the cache current; otherwise scan from the last synced block
+            client.sync_bet_events(current_block)
+        seven_days_ago = int((datetime.utcnow() - timedelta(days=7)).timestamp())
+        events_by_bettor = get_cached_bet_events_multi(
+            [address.lower() for address in addresses],
+            seven_days_ago,
+            contract_address=client.contract_address
+        )
+    except Exception as e:
+        bt.logging.warning(f"Bet event sync failed: {type(e).__name__}: {e}")
+    
+    if events_by_bettor is not None:
+        # Only count volume from games that were resolved with a winner (exclude tied/cancelled)
+        resolved_game_ids = client.get_resolved_game_ids(from_block, current_block)
+        return {
+            address: calculate_time_decayed_volume([
+                e for e in events_by_bettor[address.lower()]
+                if e['game_id'] in resolved_game_ids
+            ])
+            for address in addresses
+        }
+    
+    bt.logging.info(f"Falling back to per-miner volume queries for {len(addresses)} address(es)")
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(addresses)),
+        thread_name_prefix="volume-query"
+    ) as executor:
+        results = executor.map(lambda a: get_miner_volume(client, a), addresses)
+        return dict(zip(addresses, results))
+
+
+async def get_miners_volumes_async(
+    client: ContractClient,
+    addresses: Iterable[str],
+    max_workers: int = VOLUME_QUERY_WORKERS
+) -> Dict[str, tuple]:
+    """
+    Awaitable get_miners_volumes for the validator's event loop.
+    
+    The sweep runs on a worker thread and keeps the sync client's pooled
+    session and caches; the loop stays free while it waits on RPC.
+    
+    Args:
+        client: ContractClient instance
+        addresses: Miner EVM addresses (duplicates are queried once)
+        max_workers: Maximum concurrent queries
+        
+    Returns:
+        Dict of address -> (weighted_volume, daily_volumes)
+    """
+    return await asyncio.to_thread(get_miners_volumes, client, list(addresses), max_workers)
+
+
 # Singleton client instance
 _contract_client: Optional[ContractClient] = None
 
@@ -486,4 +1393,13 @@ def get_contract_client() -> ContractClient:
     global _contract_client
     if _contract_client is None:
         _contract_client = ContractClient()
+        _contract_client.start_subscription()
     return _contract_client
+
+
+def close_contract_client():
+    """Close the singleton contract client, if one was created."""
+    global _contract_client
+    if _contract_client is not None:
+        _contract_client.close()
+        _contract_client = None
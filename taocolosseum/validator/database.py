@@ -6,143 +6,486 @@ Database module for TAO Colosseum validator.
 Handles snapshots and miner volume tracking using SQLite.
 """
 
+import math
+import queue
 import sqlite3
 import json
+import threading
+from array import array
+from collections import OrderedDict
+from itertools import groupby
+from operator import itemgetter
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import bittensor as bt
 
 from taocolosseum.core.const import DB_PATH, TAO_COLOSSEUM_CONTRACT_ADDRESS
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    bt.logging.warning("orjson not installed, database uses stdlib json. Install with: pip install orjson")
+
+
+def _json_dumps(obj) -> str:
+    """Serialize to JSON text (orjson when available; stored as TEXT either way)."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def _pack_daily_volumes(daily_volumes: List[float]) -> bytes:
+    """Pack daily volumes as native float64s for the daily_volumes_blob column."""
+    return array('d', daily_volumes).tobytes()
+
+
+def _unpack_daily_volumes(value) -> List[float]:
+    """Daily volumes from daily_volumes_blob, or from legacy daily_volumes_json text."""
+    if not value:
+        return []
+    if isinstance(value, bytes):
+        return array('d', value).tolist()
+    return _json_loads(value)
+
+
+# Per-connection settings (not persisted in the file): WAL only needs NORMAL sync
+# to stay consistent, temp tables stay in memory, ~20 MB page cache, 128 MB mmap
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=134217728",
+)
+
+# Seconds to wait on a locked database before raising "database is locked"
+BUSY_TIMEOUT = 5.0
+
+# Compiled statements kept per connection; pooled connections live for the
+# process, so hot queries are parsed and planned once
+STATEMENT_CACHE_SIZE = 256
+
+# Idle reader connections kept open (WAL allows readers alongside the one writer)
+READER_POOL_SIZE = 4
+
+# Rows per fetchmany() batch when iterating miner_data
+MINER_ROW_BATCH = 256
+
+# Addresses per IN (...) list in multi-address queries, well under
+# SQLite's bound-parameter limit on older builds (999)
+IN_QUERY_CHUNK = 500
+
+# Rows deleted per transaction in cleanup_old_events, so each batch holds the
+# write lock briefly and other writers can interleave
+CLEANUP_BATCH_SIZE = 5000
+
+# Free pages returned to the filesystem per cleanup_old_events call
+INCREMENTAL_VACUUM_PAGES = 1000
+
+# Schema version stored in PRAGMA user_version; init_db migrates databases below it
+SCHEMA_VERSION = 2
+
+# get_snapshots results kept per (contract, limit); save_snapshot invalidates them
+SNAPSHOT_LIST_CACHE_SIZE = 32
+
+# Every Nth snapshot per contract stores the full scores/volumes; the ones in
+# between store only the entries that changed since the previous snapshot
+SNAPSHOT_FULL_INTERVAL = 24
+
 
 def _get_connection():
     """Get a database connection."""
-    return sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=BUSY_TIMEOUT,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        # No declared-type/column-name converter lookup per fetched value
+        detect_types=0,
+    )
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
 
 
-def init_db():
-    """Initialize the database tables."""
-    conn = _get_connection()
-    cursor = conn.cursor()
+# SQLite 3.45+ stores JSON as binary JSONB (no re-parse, smaller pages); older
+# builds keep text. json() renders either form as text, so mixed rows read fine.
+_JSONB_AVAILABLE = sqlite3.sqlite_version_info >= (3, 45, 0)
+_JSON_IN = "jsonb(?)" if _JSONB_AVAILABLE else "?"
+_JSON_OUT = "json({})" if _JSONB_AVAILABLE else "{}"
+
+_SQL_INSERT_SNAPSHOT = f'''
+    INSERT INTO snapshots (contract_address, block_number, total_miners, total_volume, scores_json, volumes_json, base_id)
+    VALUES (?, ?, ?, ?, {_JSON_IN}, {_JSON_IN}, ?)
+'''
+_SQL_SNAPSHOT_COLUMNS = (
+    "block_number, timestamp, total_miners, total_volume, "
+    f"{_JSON_OUT.format('scores_json')}, {_JSON_OUT.format('volumes_json')}, id, base_id"
+)
+# A delta snapshot's full base followed by the deltas up to (not including) it
+_SQL_SNAPSHOT_CHAIN = f'''
+    SELECT {_JSON_OUT.format('scores_json')}, {_JSON_OUT.format('volumes_json')}
+    FROM snapshots
+    WHERE contract_address = ? AND id >= ? AND id < ? AND (id = ? OR base_id = ?)
+    ORDER BY id
+'''
+
+# DELETE ... RETURNING (SQLite 3.35+) folds the remap lookup into the delete
+_RETURNING_AVAILABLE = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Packed float64 column, falling back to JSON text for rows written before it existed
+_DAILY_VOLUMES_COLUMN = "COALESCE(daily_volumes_blob, daily_volumes_json)"
+
+# Tables and indexes, created together by init_db in one executescript()
+_SCHEMA_SQL = '''
+BEGIN IMMEDIATE;
+
+-- Snapshots table - saved when weights are committed
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    contract_address TEXT,
+    block_number INTEGER NOT NULL,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    total_miners INTEGER,
+    total_volume REAL,
+    scores_json TEXT,
+    volumes_json TEXT,
+    -- NULL for a full snapshot; otherwise the full snapshot this delta builds on
+    base_id INTEGER
+);
+
+-- Miner data table - current state of each miner
+CREATE TABLE IF NOT EXISTS miner_data (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    contract_address TEXT NOT NULL,
+    uid INTEGER NOT NULL,
+    hotkey TEXT NOT NULL,
+    coldkey TEXT NOT NULL,
+    evm_address TEXT,
+    daily_volumes_json TEXT,
+    weighted_volume REAL DEFAULT 0,
+    score REAL DEFAULT 0,
+    last_updated DATETIME DEFAULT CURRENT_TIMESTAMP,
+    daily_volumes_blob BLOB,
+    UNIQUE(contract_address, uid)
+);
+
+-- Bet events cache - to avoid re-querying blockchain
+CREATE TABLE IF NOT EXISTS bet_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    contract_address TEXT NOT NULL,
+    evm_address TEXT NOT NULL,
+    game_id INTEGER,
+    amount REAL,
+    side INTEGER,
+    block_number INTEGER,
+    timestamp INTEGER,
+    UNIQUE(contract_address, evm_address, game_id, block_number, side)
+);
+
+-- Index for faster queries
+-- Range scan for the per-address 7-day window (summary and full fetch); read
+-- backwards it also serves ORDER BY timestamp DESC without a sort step
+CREATE INDEX IF NOT EXISTS idx_bet_events_address_timestamp
+ON bet_events(contract_address, evm_address, timestamp);
+-- Age-based pruning in cleanup_old_events
+CREATE INDEX IF NOT EXISTS idx_bet_events_timestamp
+ON bet_events(timestamp);
+
+-- Block timestamps - immutable, kept so restarts don't refetch them over RPC
+CREATE TABLE IF NOT EXISTS block_timestamps (
+    block_number INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL
+);
+
+-- Last block whose BetPlaced logs are in bet_events, per contract, so polling
+-- scans resume at the chain tip instead of rescanning the 7-day window
+CREATE TABLE IF NOT EXISTS scan_state (
+    contract_address TEXT PRIMARY KEY,
+    last_block INTEGER NOT NULL
+);
+
+-- Wallet mappings table - coldkey to EVM address mappings
+CREATE TABLE IF NOT EXISTS wallet_mappings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    coldkey TEXT NOT NULL UNIQUE,
+    evm_address TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    message TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    verified_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    evm_signature TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_wallet_mappings_evm_unique
+ON wallet_mappings(evm_address);
+
+COMMIT;
+'''
+
+# Hot statements, kept as single strings so every call hits the statement cache
+_SQL_INSERT_BET_EVENT = '''
+    INSERT OR IGNORE INTO bet_events 
+    (contract_address, evm_address, game_id, amount, side, block_number, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_SELECT_BET_EVENTS = '''
+    SELECT game_id, amount, side, block_number, timestamp
+    FROM bet_events 
+    WHERE contract_address = ? AND evm_address = ? AND timestamp >= ?
+    ORDER BY timestamp DESC
+'''
+_SQL_SELECT_BET_EVENTS_MULTI = '''
+    SELECT evm_address, game_id, amount, side, block_number, timestamp
+    FROM bet_events 
+    WHERE contract_address = ? AND timestamp >= ? AND evm_address IN ({placeholders})
+    ORDER BY evm_address, timestamp DESC
+'''
+_SQL_BET_EVENTS_SUMMARY = '''
+    SELECT MAX(block_number), COUNT(*)
+    FROM bet_events 
+    WHERE contract_address = ? AND evm_address = ? AND timestamp >= ?
+'''
+# Column list decoded by _miner_row; shared by every miner_data SELECT
+_SQL_MINER_COLUMNS = (
+    f"uid, hotkey, coldkey, evm_address, {_DAILY_VOLUMES_COLUMN}, weighted_volume, score, last_updated"
+)
+_SQL_SELECT_MINER = f'''
+    SELECT {_SQL_MINER_COLUMNS}
+    FROM miner_data WHERE contract_address = ? AND uid = ?
+'''
+_SQL_SELECT_MINERS_IN = f'''
+    SELECT {_SQL_MINER_COLUMNS}
+    FROM miner_data WHERE contract_address = ? AND uid IN ({{placeholders}})
+'''
+# One statement for insert-or-update; UNIQUE(contract_address, uid) is the conflict target
+_SQL_UPSERT_MINER = '''
+    INSERT INTO miner_data 
+    (contract_address, uid, hotkey, coldkey, evm_address, daily_volumes_blob, weighted_volume, score, last_updated)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(contract_address, uid) DO UPDATE SET
+        hotkey = excluded.hotkey,
+        coldkey = excluded.coldkey,
+        evm_address = excluded.evm_address,
+        daily_volumes_blob = excluded.daily_volumes_blob,
+        daily_volumes_json = NULL,
+        weighted_volume = excluded.weighted_volume,
+        score = excluded.score,
+        last_updated = CURRENT_TIMESTAMP
+'''
+# Re-registering a coldkey updates its row in place (INSERT OR REPLACE deleted and re-inserted it)
+_SQL_UPSERT_WALLET_MAPPING = '''
+    INSERT INTO wallet_mappings 
+    (coldkey, evm_address, signature, message, timestamp, verified_at, evm_signature)
+    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?)
+    ON CONFLICT(coldkey) DO UPDATE SET
+        evm_address = excluded.evm_address,
+        signature = excluded.signature,
+        message = excluded.message,
+        timestamp = excluded.timestamp,
+        verified_at = CURRENT_TIMESTAMP,
+        evm_signature = excluded.evm_signature
+'''
+_SQL_INSERT_BLOCK_TIMESTAMP = 'INSERT OR IGNORE INTO block_timestamps (block_number, timestamp) VALUES (?, ?)'
+
+
+# Single writer connection, serialized by its lock; opened on first use
+_writer_conn: Optional[sqlite3.Connection] = None
+_writer_lock = threading.Lock()
+
+# Idle reader connections; borrowed per call, opened on demand when empty
+_reader_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=READER_POOL_SIZE)
+
+
+# Snapshot read cache. Entries are shared between callers and must not be mutated.
+# The generation bumps on every save_snapshot, so a read that raced a save is not stored.
+_snapshot_cache_lock = threading.Lock()
+_snapshot_generation = 0
+_latest_snapshot_cache: Dict[str, dict] = {}
+_snapshot_list_cache: "OrderedDict[Tuple[str, int], List[dict]]" = OrderedDict()
+
+# contract -> (full snapshot id, deltas written since it, scores, volumes) of the
+# last snapshot saved by this process. Guarded by the writer lock.
+_snapshot_chain: Dict[str, tuple] = {}
+
+
+def _invalidate_snapshot_cache(contract_addr: Optional[str] = None):
+    """Drop cached snapshot reads for a contract (all contracts if None) after snapshots change."""
+    global _snapshot_generation
+    with _snapshot_cache_lock:
+        _snapshot_generation += 1
+        if contract_addr is None:
+            _latest_snapshot_cache.clear()
+            _snapshot_list_cache.clear()
+            return
+        _latest_snapshot_cache.pop(contract_addr, None)
+        for key in [k for k in _snapshot_list_cache if k[0] == contract_addr]:
+            del _snapshot_list_cache[key]
+
+
+# coldkey -> EVM address, loaded from wallet_mappings on first lookup and kept
+# current by save_wallet_mapping / delete_wallet_mapping (write-through)
+_wallet_cache_lock = threading.Lock()
+_coldkey_to_evm: Optional[Dict[str, str]] = None
+
+
+def _update_wallet_cache(coldkey: str, evm_address: Optional[str], old_coldkey: Optional[str] = None):
+    """Apply a committed wallet mapping change to the lookup cache, if it is loaded."""
+    with _wallet_cache_lock:
+        if _coldkey_to_evm is None:
+            return
+        if old_coldkey:
+            _coldkey_to_evm.pop(old_coldkey, None)
+        if evm_address:
+            _coldkey_to_evm[coldkey] = evm_address
+        else:
+            _coldkey_to_evm.pop(coldkey, None)
+
+
+@contextmanager
+def _writer():
+    """
+    Borrow the shared writer connection.
     
-    # Snapshots table - saved when weights are committed
-    # Check if we need to migrate old table (add contract_address column)
-    cursor.execute("PRAGMA table_info(snapshots)")
-    snapshot_columns = [col[1] for col in cursor.fetchall()]
+    Writes begin with BEGIN IMMEDIATE, taking the write lock up front instead
+    of upgrading from a read lock. The transaction commits when the block
+    exits and rolls back if it raises.
+    """
+    global _writer_conn
+    with _writer_lock:
+        if _writer_conn is None:
+            _writer_conn = _get_connection()
+            _writer_conn.isolation_level = "IMMEDIATE"
+        with _writer_conn:
+            yield _writer_conn
+
+
+@contextmanager
+def _reader():
+    """Borrow a pooled read connection (a new one if the pool is empty)."""
+    try:
+        conn = _reader_pool.get_nowait()
+    except queue.Empty:
+        conn = _get_connection()
+    try:
+        yield conn
+    finally:
+        try:
+            _reader_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def _table_columns(cursor: sqlite3.Cursor, table: str) -> List[str]:
+    """Column names of a table (empty if it doesn't exist)."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [col[1] for col in cursor.fetchall()]
+
+
+def _migrate_schema(cursor: sqlite3.Cursor):
+    """
+    Bring tables created by older releases up to the current layout.
     
-    if 'contract_address' not in snapshot_columns and len(snapshot_columns) > 0:
+    Runs before the CREATE TABLE IF NOT EXISTS statements in init_db; tables
+    that don't exist yet are left for those to create.
+    """
+    snapshot_columns = _table_columns(cursor, 'snapshots')
+    if snapshot_columns and 'contract_address' not in snapshot_columns:
         # Old table exists without contract_address - add column
         bt.logging.info("Migrating snapshots table: adding contract_address column")
         cursor.execute('ALTER TABLE snapshots ADD COLUMN contract_address TEXT')
+    if snapshot_columns and 'base_id' not in snapshot_columns:
+        # Existing rows are all full snapshots (base_id NULL)
+        cursor.execute('ALTER TABLE snapshots ADD COLUMN base_id INTEGER')
+        bt.logging.info("Added base_id column to snapshots")
     
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS snapshots (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            contract_address TEXT,
-            block_number INTEGER NOT NULL,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            total_miners INTEGER,
-            total_volume REAL,
-            scores_json TEXT,
-            volumes_json TEXT
-        )
-    ''')
-    
-    # Miner data table - current state of each miner
-    # Check if we need to migrate old table (add contract_address column)
-    cursor.execute("PRAGMA table_info(miner_data)")
-    miner_columns = [col[1] for col in cursor.fetchall()]
-    
-    if 'contract_address' not in miner_columns and len(miner_columns) > 0:
+    miner_columns = _table_columns(cursor, 'miner_data')
+    if miner_columns and 'contract_address' not in miner_columns:
         # Old table exists without contract_address - drop and recreate
         bt.logging.info("Migrating miner_data table: adding contract_address column")
         cursor.execute('DROP TABLE IF EXISTS miner_data')
+    elif miner_columns and 'daily_volumes_blob' not in miner_columns:
+        # Packed float64 volumes; existing rows keep their JSON until next written
+        cursor.execute('ALTER TABLE miner_data ADD COLUMN daily_volumes_blob BLOB')
+        bt.logging.info("Added daily_volumes_blob column to miner_data")
     
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS miner_data (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            contract_address TEXT NOT NULL,
-            uid INTEGER NOT NULL,
-            hotkey TEXT NOT NULL,
-            coldkey TEXT NOT NULL,
-            evm_address TEXT,
-            daily_volumes_json TEXT,
-            weighted_volume REAL DEFAULT 0,
-            score REAL DEFAULT 0,
-            last_updated DATETIME DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(contract_address, uid)
-        )
-    ''')
-    
-    # Bet events cache - to avoid re-querying blockchain
-    # Check if we need to migrate old table (add contract_address column)
-    cursor.execute("PRAGMA table_info(bet_events)")
-    columns = [col[1] for col in cursor.fetchall()]
-    
-    if 'contract_address' not in columns and len(columns) > 0:
+    bet_columns = _table_columns(cursor, 'bet_events')
+    if bet_columns and 'contract_address' not in bet_columns:
         # Old table exists without contract_address - drop and recreate
         # Old data is from different contract anyway
         bt.logging.info("Migrating bet_events table: adding contract_address column")
         cursor.execute('DROP TABLE IF EXISTS bet_events')
+    # (contract_address, evm_address) is a prefix of idx_bet_events_address_timestamp
+    cursor.execute('DROP INDEX IF EXISTS idx_bet_events_contract_address')
     
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS bet_events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            contract_address TEXT NOT NULL,
-            evm_address TEXT NOT NULL,
-            game_id INTEGER,
-            amount REAL,
-            side INTEGER,
-            block_number INTEGER,
-            timestamp INTEGER,
-            UNIQUE(contract_address, evm_address, game_id, block_number, side)
-        )
-    ''')
-    
-    # Index for faster queries
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_bet_events_contract_address 
-        ON bet_events(contract_address, evm_address)
-    ''')
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_bet_events_timestamp 
-        ON bet_events(timestamp)
-    ''')
-    
-    # Wallet mappings table - coldkey to EVM address mappings
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS wallet_mappings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            coldkey TEXT NOT NULL UNIQUE,
-            evm_address TEXT NOT NULL,
-            signature TEXT NOT NULL,
-            message TEXT NOT NULL,
-            timestamp INTEGER NOT NULL,
-            verified_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_wallet_mappings_coldkey 
-        ON wallet_mappings(coldkey)
-    ''')
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_wallet_mappings_evm 
-        ON wallet_mappings(evm_address)
-    ''')
-    
-    # Migration: add evm_signature column if missing (dual-signature requirement)
-    cursor.execute("PRAGMA table_info(wallet_mappings)")
-    columns = [row[1] for row in cursor.fetchall()]
-    if 'evm_signature' not in columns:
-        cursor.execute('ALTER TABLE wallet_mappings ADD COLUMN evm_signature TEXT')
-        bt.logging.info("Added evm_signature column to wallet_mappings")
-    
-    conn.commit()
-    conn.close()
+    wallet_columns = _table_columns(cursor, 'wallet_mappings')
+    if wallet_columns:
+        # One coldkey per EVM address is enforced by a unique index. Keep the
+        # newest row for any address mapped twice before it existed.
+        cursor.execute('''
+            DELETE FROM wallet_mappings WHERE id NOT IN (
+                SELECT MAX(id) FROM wallet_mappings GROUP BY evm_address
+            )
+        ''')
+        if cursor.rowcount > 0:
+            bt.logging.info(f"Removed {cursor.rowcount} duplicate EVM wallet mapping(s)")
+        if 'evm_signature' not in wallet_columns:
+            # Dual-signature requirement
+            cursor.execute('ALTER TABLE wallet_mappings ADD COLUMN evm_signature TEXT')
+            bt.logging.info("Added evm_signature column to wallet_mappings")
+    # Both were duplicates of the UNIQUE(coldkey) and evm_address unique indexes
+    cursor.execute('DROP INDEX IF EXISTS idx_wallet_mappings_coldkey')
+    cursor.execute('DROP INDEX IF EXISTS idx_wallet_mappings_evm')
+
+
+def init_db():
+    """Initialize the database tables."""
+    with _writer() as conn:
+        cursor = conn.cursor()
+        
+        # File-level settings. page_size and auto_vacuum only take effect on a new
+        # (empty) database; WAL is persistent and lets readers run during writes.
+        cursor.execute("PRAGMA page_size=32768")
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
+        # Migrations run once per database; user_version records that they did
+        cursor.execute("PRAGMA user_version")
+        schema_version = cursor.fetchone()[0]
+        if schema_version < SCHEMA_VERSION:
+            _migrate_schema(cursor)
+        
+        # One script and one commit for all tables and indexes; executescript()
+        # first commits the migration transaction, if any
+        conn.executescript(_SCHEMA_SQL)
+        
+        if schema_version < SCHEMA_VERSION:
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    # Refresh planner statistics for the (possibly new) indexes
+    db_optimize()
     bt.logging.info("Database initialized successfully")
 
 
+def db_optimize():
+    """
+    Run PRAGMA optimize so the query planner's statistics follow table growth.
+    
+    analysis_limit bounds the rows ANALYZE samples per index, keeping this cheap
+    enough to run at startup and periodically from the validator loop.
+    """
+    with _writer() as conn:
+        conn.execute("PRAGMA analysis_limit=400")
+        conn.execute("PRAGMA optimize")
+
+
 def save_snapshot(
     block_number: int, 
     scores: Dict[int, float], 
@@ -160,78 +503,134 @@ def save_snapshot(
         miner_details: Optional dict with additional miner info
         contract_address: Contract address (defaults to current)
     """
-    conn = _get_connection()
-    cursor = conn.cursor()
-    
     # Use current contract address if not specified
     contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
     
     # Convert int keys to strings for JSON
-    scores_json = json.dumps({str(k): v for k, v in scores.items()})
-    volumes_json = json.dumps({str(k): v for k, v in volumes.items()})
-    
-    cursor.execute('''
-        INSERT INTO snapshots (contract_address, block_number, total_miners, total_volume, scores_json, volumes_json)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (
-        contract_addr,
-        block_number,
-        len([s for s in scores.values() if s > 0]),
-        sum(volumes.values()),
-        scores_json,
-        volumes_json
-    ))
-    
-    conn.commit()
-    conn.close()
+    scores = {str(k): v for k, v in scores.items()}
+    volumes = {str(k): v for k, v in volumes.items()}
+    active_miners = sum(1 for s in scores.values() if s > 0)
+    total_volume = math.fsum(volumes.values())
+    
+    with _writer() as conn:
+        chain = _snapshot_chain.get(contract_addr)
+        # Deltas can't express removed UIDs, so those force a full snapshot
+        if (
+            chain is not None
+            and chain[1] < SNAPSHOT_FULL_INTERVAL - 1
+            and chain[2].keys() <= scores.keys()
+            and chain[3].keys() <= volumes.keys()
+        ):
+            base_id, deltas = chain[0], chain[1] + 1
+            stored_scores = _dict_delta(chain[2], scores)
+            stored_volumes = _dict_delta(chain[3], volumes)
+        else:
+            base_id, deltas = None, 0
+            stored_scores, stored_volumes = scores, volumes
+        
+        cursor = conn.execute(_SQL_INSERT_SNAPSHOT, (
+            contract_addr,
+            block_number,
+            active_miners,
+            total_volume,
+            _json_dumps(stored_scores),
+            _json_dumps(stored_volumes),
+            base_id
+        ))
+        _snapshot_chain[contract_addr] = (
+            cursor.lastrowid if base_id is None else base_id, deltas, scores, volumes
+        )
+    
+    _invalidate_snapshot_cache(contract_addr)
     bt.logging.info(f"Snapshot saved at block {block_number} for contract {contract_addr[:10]}...")
 
 
+def _dict_delta(previous: dict, current: dict) -> dict:
+    """Entries of current that are new or differ from previous."""
+    return {k: v for k, v in current.items() if previous.get(k) != v}
+
+
+def _snapshot_from_row(cursor: sqlite3.Cursor, contract_addr: str, row: tuple) -> dict:
+    """Build a snapshot dict from a _SQL_SNAPSHOT_COLUMNS row, replaying deltas onto their base."""
+    scores = _json_loads(row[4]) if row[4] else {}
+    volumes = _json_loads(row[5]) if row[5] else {}
+    snapshot_id, base_id = row[6], row[7]
+    if base_id is not None:
+        cursor.execute(
+            _SQL_SNAPSHOT_CHAIN, (contract_addr, base_id, snapshot_id, base_id, base_id)
+        )
+        full_scores, full_volumes = {}, {}
+        for scores_json, volumes_json in cursor.fetchall():
+            full_scores.update(_json_loads(scores_json) if scores_json else {})
+            full_volumes.update(_json_loads(volumes_json) if volumes_json else {})
+        full_scores.update(scores)
+        full_volumes.update(volumes)
+        scores, volumes = full_scores, full_volumes
+    return {
+        'block_number': row[0],
+        'timestamp': row[1],
+        'total_miners': row[2],
+        'total_volume': row[3],
+        'scores': scores,
+        'volumes': volumes
+    }
+
+
 def get_latest_snapshot(contract_address: str = None) -> Optional[dict]:
-    """Get the most recent snapshot for the current contract."""
-    conn = _get_connection()
-    cursor = conn.cursor()
-    
+    """Get the most recent snapshot for the current contract (cached until the next save)."""
     # Use current contract address if not specified
     contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
     
-    cursor.execute('''
-        SELECT block_number, timestamp, total_miners, total_volume, scores_json, volumes_json
-        FROM snapshots WHERE contract_address = ? ORDER BY id DESC LIMIT 1
-    ''', (contract_addr,))
-    
-    row = cursor.fetchone()
-    conn.close()
+    with _snapshot_cache_lock:
+        cached = _latest_snapshot_cache.get(contract_addr)
+        generation = _snapshot_generation
+    if cached is not None:
+        return cached
     
-    if row:
-        return {
-            'block_number': row[0],
-            'timestamp': row[1],
-            'total_miners': row[2],
-            'total_volume': row[3],
-            'scores': json.loads(row[4]) if row[4] else {},
-            'volumes': json.loads(row[5]) if row[5] else {}
-        }
-    return None
+    with _reader() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute(f'''
+            SELECT {_SQL_SNAPSHOT_COLUMNS}
+            FROM snapshots WHERE contract_address = ? ORDER BY id DESC LIMIT 1
+        ''', (contract_addr,))
+        
+        row = cursor.fetchone()
+        if not row:
+            return None
+        snapshot = _snapshot_from_row(cursor, contract_addr, row)
+    
+    with _snapshot_cache_lock:
+        if generation == _snapshot_generation:
+            _latest_snapshot_cache[contract_addr] = snapshot
+    return snapshot
 
 
 def get_snapshots(limit: int = 100, contract_address: str = None) -> List[dict]:
-    """Get recent snapshots (summary only) for the current contract."""
-    conn = _get_connection()
-    cursor = conn.cursor()
-    
+    """Get recent snapshots (summary only) for the current contract (cached until the next save)."""
     # Use current contract address if not specified
     contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
+    key = (contract_addr, limit)
+    
+    with _snapshot_cache_lock:
+        cached = _snapshot_list_cache.get(key)
+        if cached is not None:
+            _snapshot_list_cache.move_to_end(key)
+        generation = _snapshot_generation
+    if cached is not None:
+        return cached
+    
+    with _reader() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT block_number, timestamp, total_miners, total_volume
+            FROM snapshots WHERE contract_address = ? ORDER BY id DESC LIMIT ?
+        ''', (contract_addr, limit))
+        
+        rows = cursor.fetchall()
     
-    cursor.execute('''
-        SELECT block_number, timestamp, total_miners, total_volume
-        FROM snapshots WHERE contract_address = ? ORDER BY id DESC LIMIT ?
-    ''', (contract_addr, limit))
-    
-    rows = cursor.fetchall()
-    conn.close()
-    
-    return [
+    snapshots = [
         {
             'block_number': r[0],
             'timestamp': r[1],
@@ -240,33 +639,30 @@ def get_snapshots(limit: int = 100, contract_address: str = None) -> List[dict]:
         }
         for r in rows
     ]
+    with _snapshot_cache_lock:
+        if generation == _snapshot_generation:
+            _snapshot_list_cache[key] = snapshots
+            while len(_snapshot_list_cache) > SNAPSHOT_LIST_CACHE_SIZE:
+                _snapshot_list_cache.popitem(last=False)
+    return snapshots
 
 
 def get_snapshot_by_block(block_number: int, contract_address: str = None) -> Optional[dict]:
     """Get a specific snapshot by block number for the current contract."""
-    conn = _get_connection()
-    cursor = conn.cursor()
-    
-    # Use current contract address if not specified
-    contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
-    
-    cursor.execute('''
-        SELECT block_number, timestamp, total_miners, total_volume, scores_json, volumes_json
-        FROM snapshots WHERE contract_address = ? AND block_number = ?
-    ''', (contract_addr, block_number))
-    
-    row = cursor.fetchone()
-    conn.close()
-    
-    if row:
-        return {
-            'block_number': row[0],
-            'timestamp': row[1],
-            'total_miners': row[2],
-            'total_volume': row[3],
-            'scores': json.loads(row[4]) if row[4] else {},
-            'volumes': json.loads(row[5]) if row[5] else {}
-        }
+    with _reader() as conn:
+        cursor = conn.cursor()
+        
+        # Use current contract address if not specified
+        contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
+        
+        cursor.execute(f'''
+            SELECT {_SQL_SNAPSHOT_COLUMNS}
+            FROM snapshots WHERE contract_address = ? AND block_number = ?
+        ''', (contract_addr, block_number))
+        
+        row = cursor.fetchone()
+        if row:
+            return _snapshot_from_row(cursor, contract_addr, row)
     return None
 
 
@@ -281,102 +677,155 @@ def update_miner_data(
     contract_address: str = None
 ):
     """Update or insert miner data for the current contract."""
-    conn = _get_connection()
-    cursor = conn.cursor()
-    
     # Use current contract address if not specified
     contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
     
-    # Check if record exists for this contract + uid
-    cursor.execute(
-        'SELECT id FROM miner_data WHERE contract_address = ? AND uid = ?',
-        (contract_addr, uid)
-    )
-    existing = cursor.fetchone()
-    
-    if existing:
-        cursor.execute('''
-            UPDATE miner_data 
-            SET hotkey = ?, coldkey = ?, evm_address = ?, daily_volumes_json = ?, 
-                weighted_volume = ?, score = ?, last_updated = CURRENT_TIMESTAMP
-            WHERE contract_address = ? AND uid = ?
-        ''', (
-            hotkey, coldkey, evm_address, json.dumps(daily_volumes),
-            weighted_volume, score, contract_addr, uid
-        ))
-    else:
-        cursor.execute('''
-            INSERT INTO miner_data 
-            (contract_address, uid, hotkey, coldkey, evm_address, daily_volumes_json, weighted_volume, score, last_updated)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (
+    with _writer() as conn:
+        conn.execute(_SQL_UPSERT_MINER, (
             contract_addr, uid, hotkey, coldkey, evm_address,
-            json.dumps(daily_volumes), weighted_volume, score
+            _pack_daily_volumes(daily_volumes), weighted_volume, score
         ))
-    
-    conn.commit()
-    conn.close()
 
 
-def get_miner_data(uid: int, contract_address: str = None) -> Optional[dict]:
-    """Get miner data by UID for the current contract."""
-    conn = _get_connection()
-    cursor = conn.cursor()
+def update_miner_data_bulk(rows: List[tuple], contract_address: str = None):
+    """
+    Upsert many miners' data in one transaction.
+    
+    Args:
+        rows: (uid, hotkey, coldkey, evm_address, daily_volumes, weighted_volume, score)
+            tuples, as update_miner_data's arguments; later rows for a UID win
+        contract_address: Contract address (defaults to current)
+    """
+    if not rows:
+        return
     
     # Use current contract address if not specified
     contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
     
-    cursor.execute('''
-        SELECT uid, hotkey, coldkey, evm_address, daily_volumes_json, weighted_volume, score, last_updated
-        FROM miner_data WHERE contract_address = ? AND uid = ?
-    ''', (contract_addr, uid))
-    
-    row = cursor.fetchone()
-    conn.close()
+    with _writer() as conn:
+        conn.executemany(_SQL_UPSERT_MINER, (
+            (contract_addr, uid, hotkey, coldkey, evm_address, _pack_daily_volumes(daily_volumes), weighted_volume, score)
+            for uid, hotkey, coldkey, evm_address, daily_volumes, weighted_volume, score in rows
+        ))
+
+
+# Row factories are set per cursor (pooled connections are shared), so rows
+# become the returned dicts as they are fetched, with no intermediate tuple list
+
+def _miner_row(cursor: sqlite3.Cursor, r: tuple) -> dict:
+    """miner_data row (as selected by _SQL_SELECT_MINER) -> dict."""
+    return {
+        'uid': r[0],
+        'hotkey': r[1],
+        'coldkey': r[2],
+        'evm_address': r[3],
+        'daily_volumes': _unpack_daily_volumes(r[4]),
+        'weighted_volume': r[5],
+        'score': r[6],
+        'last_updated': r[7]
+    }
+
+
+def _bet_event_row(cursor: sqlite3.Cursor, r: tuple) -> dict:
+    """bet_events row (as selected by _SQL_SELECT_BET_EVENTS) -> dict."""
+    return {
+        'game_id': r[0],
+        'amount': r[1],
+        'side': r[2],
+        'block_number': r[3],
+        'timestamp': r[4]
+    }
+
+
+def _keyed_bet_event_row(cursor: sqlite3.Cursor, r: tuple) -> Tuple[str, dict]:
+    """bet_events row (as selected by _SQL_SELECT_BET_EVENTS_MULTI) -> (evm_address, dict)."""
+    return r[0], _bet_event_row(cursor, r[1:])
+
+
+def get_miner_data(uid: int, contract_address: str = None) -> Optional[dict]:
+    """Get miner data by UID for the current contract."""
+    with _reader() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = _miner_row
+        
+        # Use current contract address if not specified
+        contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
+        
+        cursor.execute(_SQL_SELECT_MINER, (contract_addr, uid))
+        
+        row = cursor.fetchone()
     
-    if row:
-        return {
-            'uid': row[0],
-            'hotkey': row[1],
-            'coldkey': row[2],
-            'evm_address': row[3],
-            'daily_volumes': json.loads(row[4]) if row[4] else [],
-            'weighted_volume': row[5],
-            'score': row[6],
-            'last_updated': row[7]
-        }
-    return None
+    return row
 
 
-def get_all_miner_data(contract_address: str = None) -> List[dict]:
-    """Get all miner data for the current contract."""
-    conn = _get_connection()
-    cursor = conn.cursor()
+def get_miner_data_bulk(uids: List[int], contract_address: str = None) -> Dict[int, dict]:
+    """
+    Get miner data for many UIDs with one connection and one IN (...) query
+    per chunk, instead of a get_miner_data() call per UID.
     
-    # Use current contract address if not specified
-    contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
+    Returns:
+        Dict of UID -> miner data (UIDs without a row are omitted)
+    """
+    if not uids:
+        return {}
     
-    cursor.execute('''
-        SELECT uid, hotkey, coldkey, evm_address, daily_volumes_json, weighted_volume, score, last_updated
-        FROM miner_data WHERE contract_address = ? ORDER BY score DESC
-    ''', (contract_addr,))
+    with _reader() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = _miner_row
+        
+        # Use current contract address if not specified
+        contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
+        
+        result = {}
+        uids = list(uids)
+        for start in range(0, len(uids), IN_QUERY_CHUNK):
+            chunk = uids[start:start + IN_QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(
+                _SQL_SELECT_MINERS_IN.format(placeholders=placeholders),
+                (contract_addr, *chunk)
+            )
+            for row in cursor.fetchall():
+                result[row['uid']] = row
     
-    rows = cursor.fetchall()
-    conn.close()
+    return result
+
+
+def iter_all_miner_data(contract_address: str = None) -> Iterator[dict]:
+    """
+    Yield all miner data for the current contract, best score first.
     
-    return [
-        {
-            'uid': r[0],
-            'hotkey': r[1],
-            'coldkey': r[2],
-            'evm_address': r[3],
-            'daily_volumes': json.loads(r[4]) if r[4] else [],
-            'weighted_volume': r[5],
-            'score': r[6],
-            'last_updated': r[7]
-        }
-        for r in rows
-    ]
+    Rows are fetched MINER_ROW_BATCH at a time, so only one batch is decoded
+    and held at once. A pooled read connection is held until the generator
+    is exhausted or closed.
+    """
+    with _reader() as conn:
+        cursor = conn.cursor()
+        cursor.arraysize = MINER_ROW_BATCH
+        cursor.row_factory = _miner_row
+        
+        # Use current contract address if not specified
+        contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
+        
+        cursor.execute(f'''
+            SELECT {_SQL_MINER_COLUMNS}
+            FROM miner_data WHERE contract_address = ? ORDER BY score DESC
+        ''', (contract_addr,))
+        
+        try:
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            # Reset the statement before the connection goes back to the pool
+            cursor.close()
+
+
+def get_all_miner_data(contract_address: str = None) -> List[dict]:
+    """Get all miner data for the current contract."""
+    return list(iter_all_miner_data(contract_address))
 
 
 def cache_bet_event(
@@ -389,23 +838,31 @@ def cache_bet_event(
     contract_address: str = None
 ):
     """Cache a bet event to avoid re-querying."""
-    conn = _get_connection()
-    cursor = conn.cursor()
+    cache_bet_events_bulk(
+        [(evm_address, game_id, amount, side, block_number, timestamp)],
+        contract_address=contract_address
+    )
+
+
+def cache_bet_events_bulk(rows: List[tuple], contract_address: str = None):
+    """
+    Cache many bet events in one transaction (one commit instead of one per event).
+    
+    Args:
+        rows: (evm_address, game_id, amount, side, block_number, timestamp) tuples
+        contract_address: Contract address (defaults to current)
+    """
+    if not rows:
+        return
     
     # Use current contract address if not specified
     contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
     
     try:
-        cursor.execute('''
-            INSERT OR IGNORE INTO bet_events 
-            (contract_address, evm_address, game_id, amount, side, block_number, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (contract_addr, evm_address, game_id, amount, side, block_number, timestamp))
-        conn.commit()
+        with _writer() as conn:
+            conn.executemany(_SQL_INSERT_BET_EVENT, ((contract_addr, *row) for row in rows))
     except Exception as e:
-        bt.logging.debug(f"Error caching bet event: {e}")
-    finally:
-        conn.close()
+        bt.logging.debug(f"Error caching bet events: {e}")
 
 
 def get_cached_bet_events(evm_address: str, since_timestamp: int, contract_address: str = None) -> List[dict]:
@@ -413,49 +870,182 @@ def get_cached_bet_events(evm_address: str, since_timestamp: int, contract_addre
     
     Only returns events from the specified contract (defaults to current contract).
     """
-    conn = _get_connection()
-    cursor = conn.cursor()
+    with _reader() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = _bet_event_row
+        
+        # Use current contract address if not specified
+        contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
+        
+        cursor.execute(_SQL_SELECT_BET_EVENTS, (contract_addr, evm_address, since_timestamp))
+        
+        return cursor.fetchall()
+
+
+def get_cached_bet_events_multi(
+    addresses: List[str],
+    since_timestamp: int,
+    contract_address: str = None
+) -> Dict[str, List[dict]]:
+    """Get cached bet events for many addresses since a given timestamp.
     
-    # Use current contract address if not specified
+    Args:
+        addresses: EVM addresses to look up
+        since_timestamp: Only events at or after this timestamp
+        contract_address: Contract to filter by (defaults to current contract)
+        
+    Returns:
+        Dict of evm_address -> events (newest first); every requested address is present
+    """
     contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
+    unique = list(dict.fromkeys(addresses))
+    result: Dict[str, List[dict]] = {addr: [] for addr in unique}
     
-    cursor.execute('''
-        SELECT game_id, amount, side, block_number, timestamp
-        FROM bet_events 
-        WHERE contract_address = ? AND evm_address = ? AND timestamp >= ?
-        ORDER BY timestamp DESC
-    ''', (contract_addr, evm_address, since_timestamp))
+    with _reader() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = _keyed_bet_event_row
+        
+        for i in range(0, len(unique), IN_QUERY_CHUNK):
+            chunk = unique[i:i + IN_QUERY_CHUNK]
+            sql = _SQL_SELECT_BET_EVENTS_MULTI.format(placeholders=",".join("?" * len(chunk)))
+            rows = cursor.execute(sql, (contract_addr, since_timestamp, *chunk)).fetchall()
+            
+            for addr, group in groupby(rows, key=itemgetter(0)):
+                result[addr] = [event for _, event in group]
     
-    rows = cursor.fetchall()
-    conn.close()
+    return result
+
+
+def get_cached_bet_events_summary(
+    evm_address: str,
+    since_timestamp: int,
+    contract_address: str = None
+) -> Tuple[Optional[int], int]:
+    """Get (max block number, event count) of cached bet events for an address since a timestamp.
     
-    return [
-        {
-            'game_id': r[0],
-            'amount': r[1],
-            'side': r[2],
-            'block_number': r[3],
-            'timestamp': r[4]
-        }
-        for r in rows
-    ]
+    Aggregated in SQLite so callers can decide whether to refetch without loading the rows.
+    """
+    with _reader() as conn:
+        cursor = conn.cursor()
+        
+        contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
+        
+        cursor.execute(_SQL_BET_EVENTS_SUMMARY, (contract_addr, evm_address, since_timestamp))
+        
+        max_block, count = cursor.fetchone()
+    return max_block, count
+
+
+def get_cached_block_timestamps(block_numbers: List[int]) -> Dict[int, int]:
+    """Get stored timestamps for the given blocks (blocks not stored are omitted)."""
+    if not block_numbers:
+        return {}
+    
+    with _reader() as conn:
+        cursor = conn.cursor()
+        
+        result = {}
+        block_numbers = list(block_numbers)
+        # Stay under SQLite's default host-parameter limit (999 on older builds)
+        for start in range(0, len(block_numbers), 500):
+            chunk = block_numbers[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(
+                f'SELECT block_number, timestamp FROM block_timestamps WHERE block_number IN ({placeholders})',
+                chunk
+            )
+            result.update(cursor.fetchall())
+        
+    return result
+
+
+def cache_block_timestamps(timestamps: Dict[int, int]):
+    """Store block timestamps in one transaction."""
+    if not timestamps:
+        return
+    
+    try:
+        with _writer() as conn:
+            conn.executemany(_SQL_INSERT_BLOCK_TIMESTAMP, timestamps.items())
+    except Exception as e:
+        bt.logging.debug(f"Error caching block timestamps: {e}")
+
+
+def get_last_scanned_block(contract_address: str = None) -> Optional[int]:
+    """Get the last block whose bet events are fully cached for a contract (None if never scanned)."""
+    contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
+    
+    with _reader() as conn:
+        row = conn.execute(
+            'SELECT last_block FROM scan_state WHERE contract_address = ?', (contract_addr,)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def set_last_scanned_block(block_number: int, contract_address: str = None):
+    """Record that bet events up to block_number are cached for a contract."""
+    contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
+    
+    with _writer() as conn:
+        conn.execute('''
+            INSERT INTO scan_state (contract_address, last_block) VALUES (?, ?)
+            ON CONFLICT(contract_address) DO UPDATE SET last_block = excluded.last_block
+        ''', (contract_addr, block_number))
+
+
+def reset_last_scanned_block(contract_address: str = None):
+    """Forget the scan tip for a contract, so the next sync rescans the full 7 days."""
+    contract_addr = contract_address or TAO_COLOSSEUM_CONTRACT_ADDRESS
+    
+    with _writer() as conn:
+        conn.execute('DELETE FROM scan_state WHERE contract_address = ?', (contract_addr,))
+
+
+def _delete_in_batches(table: str, cutoff: int) -> int:
+    """Delete rows with timestamp < cutoff, CLEANUP_BATCH_SIZE rows per transaction."""
+    total = 0
+    while True:
+        with _writer() as conn:
+            cursor = conn.execute(f'''
+                DELETE FROM {table} WHERE rowid IN (
+                    SELECT rowid FROM {table} WHERE timestamp < ? LIMIT ?
+                )
+            ''', (cutoff, CLEANUP_BATCH_SIZE))
+            batch = cursor.rowcount
+        total += batch
+        if batch < CLEANUP_BATCH_SIZE:
+            return total
 
 
 def cleanup_old_events(days: int = 14):
-    """Remove bet events older than specified days."""
-    conn = _get_connection()
-    cursor = conn.cursor()
+    """
+    Remove bet events older than specified days.
     
+    Afterwards the WAL is checkpointed and truncated, and up to
+    INCREMENTAL_VACUUM_PAGES free pages are released from the main file.
+    """
     cutoff = int(datetime.utcnow().timestamp()) - (days * 86400)
     
-    cursor.execute('DELETE FROM bet_events WHERE timestamp < ?', (cutoff,))
-    deleted = cursor.rowcount
+    deleted = _delete_in_batches('bet_events', cutoff)
+    _delete_in_batches('block_timestamps', cutoff)
     
-    conn.commit()
-    conn.close()
+    # PRAGMAs don't open an implicit transaction, so these run in autocommit
+    # mode as checkpointing and vacuuming require
+    with _writer() as conn:
+        pages_before = conn.execute("PRAGMA page_count").fetchone()[0]
+        # incremental_vacuum frees one page per step and returns no rows, so
+        # execute() would stop after the first page; executescript() steps to the end
+        conn.executescript(f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES})")
+        busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        pages_freed = pages_before - conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
     
     if deleted > 0:
         bt.logging.info(f"Cleaned up {deleted} old bet events")
+    if pages_freed > 0:
+        bt.logging.debug(f"Reclaimed {pages_freed * page_size} bytes from database file")
+    if busy:
+        bt.logging.debug("WAL checkpoint could not complete; readers still active")
 
 
 # ==================== WALLET MAPPING FUNCTIONS ====================
@@ -486,83 +1076,92 @@ def save_wallet_mapping(
     Returns:
         True if saved successfully, False otherwise
     """
-    conn = _get_connection()
-    cursor = conn.cursor()
     evm_normalized = evm_address.lower()
     
     try:
-        # Check if this EVM address is already mapped to another coldkey
-        cursor.execute(
-            'SELECT coldkey FROM wallet_mappings WHERE evm_address = ?',
-            (evm_normalized,)
-        )
-        old_row = cursor.fetchone()
-        old_coldkey = old_row[0] if old_row else None
-        
-        if old_coldkey and old_coldkey != coldkey:
-            # EVM is being remapped from old_coldkey -> new coldkey.
-            # 1) Remove the old wallet mapping
-            cursor.execute(
-                'DELETE FROM wallet_mappings WHERE evm_address = ?',
-                (evm_normalized,)
-            )
-            bt.logging.info(
-                f"Replaced existing EVM mapping for {evm_address[:10]}... "
-                f"(old coldkey {old_coldkey[:10]}... -> new coldkey {coldkey[:10]}...)"
-            )
+        with _writer() as conn:
+            cursor = conn.cursor()
+            # Lookup and rewrite form one write transaction
+            cursor.execute('BEGIN IMMEDIATE')
             
-            # 2) Zero out the old coldkey's miner_data so stale volume
-            #    doesn't persist for the previous owner
-            cursor.execute('''
-                UPDATE miner_data
-                SET evm_address = NULL,
-                    daily_volumes_json = ?,
-                    weighted_volume = 0,
-                    score = 0,
-                    last_updated = CURRENT_TIMESTAMP
-                WHERE coldkey = ? AND evm_address = ?
-            ''', (
-                json.dumps([0.0] * 7),
-                old_coldkey,
-                evm_normalized,
-            ))
-            if cursor.rowcount > 0:
-                bt.logging.info(
-                    f"Cleared miner_data for old coldkey {old_coldkey[:10]}... "
-                    f"(EVM {evm_address[:10]}... remapped)"
+            # Remove a mapping of this EVM address to another coldkey, if any
+            if _RETURNING_AVAILABLE:
+                cursor.execute(
+                    'DELETE FROM wallet_mappings WHERE evm_address = ? AND coldkey != ? RETURNING coldkey',
+                    (evm_normalized, coldkey)
+                )
+                old_row = cursor.fetchone()
+            else:
+                cursor.execute(
+                    'SELECT coldkey FROM wallet_mappings WHERE evm_address = ? AND coldkey != ?',
+                    (evm_normalized, coldkey)
                 )
+                old_row = cursor.fetchone()
+                if old_row:
+                    cursor.execute(
+                        'DELETE FROM wallet_mappings WHERE evm_address = ?',
+                        (evm_normalized,)
+                    )
+            old_coldkey = old_row[0] if old_row else None
             
-            # 3) Remove cached bet_events for this EVM address so the new
-            #    owner starts fresh from the blockchain
-            cursor.execute(
-                'DELETE FROM bet_events WHERE evm_address = ?',
-                (evm_normalized,)
-            )
-            if cursor.rowcount > 0:
+            if old_coldkey:
+                # EVM is being remapped from old_coldkey -> new coldkey.
+                # 1) The old wallet mapping was removed above
                 bt.logging.info(
-                    f"Cleared cached bet_events for {evm_address[:10]}... (EVM remapped)"
+                    f"Replaced existing EVM mapping for {evm_address[:10]}... "
+                    f"(old coldkey {old_coldkey[:10]}... -> new coldkey {coldkey[:10]}...)"
                 )
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO wallet_mappings 
-            (coldkey, evm_address, signature, message, timestamp, verified_at, evm_signature)
-            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?)
-        ''', (
-            coldkey,
-            evm_normalized,
-            signature,
-            message,
-            timestamp,
-            evm_signature or ''
-        ))
-        conn.commit()
+                
+                # 2) Zero out the old coldkey's miner_data so stale volume
+                #    doesn't persist for the previous owner
+                cursor.execute('''
+                    UPDATE miner_data
+                    SET evm_address = NULL,
+                        daily_volumes_blob = ?,
+                        daily_volumes_json = NULL,
+                        weighted_volume = 0,
+                        score = 0,
+                        last_updated = CURRENT_TIMESTAMP
+                    WHERE coldkey = ? AND evm_address = ?
+                ''', (
+                    _pack_daily_volumes([0.0] * 7),
+                    old_coldkey,
+                    evm_normalized,
+                ))
+                if cursor.rowcount > 0:
+                    bt.logging.info(
+                        f"Cleared miner_data for old coldkey {old_coldkey[:10]}... "
+                        f"(EVM {evm_address[:10]}... remapped)"
+                    )
+                
+                # 3) Remove cached bet_events for this EVM address so the new
+                #    owner starts fresh from the blockchain
+                cursor.execute(
+                    'DELETE FROM bet_events WHERE evm_address = ?',
+                    (evm_normalized,)
+                )
+                if cursor.rowcount > 0:
+                    bt.logging.info(
+                        f"Cleared cached bet_events for {evm_address[:10]}... (EVM remapped)"
+                    )
+                    # The cache no longer holds every event up to the recorded
+                    # tip, so the next polling scan covers the full window again
+                    cursor.execute('DELETE FROM scan_state')
+            
+            cursor.execute(_SQL_UPSERT_WALLET_MAPPING, (
+                coldkey,
+                evm_normalized,
+                signature,
+                message,
+                timestamp,
+                evm_signature or ''
+            ))
+        _update_wallet_cache(coldkey, evm_normalized, old_coldkey)
         bt.logging.info(f"Wallet mapping saved: {coldkey[:10]}... -> {evm_address[:10]}...")
         return True
     except Exception as e:
         bt.logging.error(f"Failed to save wallet mapping: {e}")
         return False
-    finally:
-        conn.close()
 
 
 def get_wallet_mapping(coldkey: str) -> Optional[dict]:
@@ -575,16 +1174,15 @@ def get_wallet_mapping(coldkey: str) -> Optional[dict]:
     Returns:
         Dict with mapping info or None if not found
     """
-    conn = _get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT coldkey, evm_address, signature, message, timestamp, verified_at
-        FROM wallet_mappings WHERE coldkey = ?
-    ''', (coldkey,))
-    
-    row = cursor.fetchone()
-    conn.close()
+    with _reader() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT coldkey, evm_address, signature, message, timestamp, verified_at
+            FROM wallet_mappings WHERE coldkey = ?
+        ''', (coldkey,))
+        
+        row = cursor.fetchone()
     
     if row:
         return {
@@ -602,28 +1200,57 @@ def get_evm_address_for_coldkey(coldkey: str) -> Optional[str]:
     """
     Get the EVM address mapped to a coldkey.
     
+    Served from an in-memory map of all mappings, loaded on first call,
+    updated by every save/delete in this process and reloaded by
+    load_all_wallet_mappings().
+    
     Args:
         coldkey: Bittensor coldkey (SS58 format)
         
     Returns:
         EVM address or None if not mapped
     """
-    mapping = get_wallet_mapping(coldkey)
-    return mapping['evm_address'] if mapping else None
+    with _wallet_cache_lock:
+        if _coldkey_to_evm is None:
+            _reload_wallet_cache()
+        return _coldkey_to_evm.get(coldkey)
 
 
-def get_all_wallet_mappings() -> List[dict]:
-    """Get all wallet mappings."""
-    conn = _get_connection()
-    cursor = conn.cursor()
+def _reload_wallet_cache():
+    """Replace the coldkey -> EVM map from the table. Caller holds _wallet_cache_lock."""
+    global _coldkey_to_evm
+    with _reader() as conn:
+        _coldkey_to_evm = dict(
+            conn.execute('SELECT coldkey, evm_address FROM wallet_mappings').fetchall()
+        )
+
+
+def load_all_wallet_mappings() -> Dict[str, str]:
+    """
+    Reload every coldkey -> EVM address mapping from the database.
     
-    cursor.execute('''
-        SELECT coldkey, evm_address, timestamp, verified_at
-        FROM wallet_mappings ORDER BY verified_at DESC
-    ''')
+    Picks up mappings written outside this process; the lookup cache behind
+    get_evm_address_for_coldkey is replaced with the result.
     
-    rows = cursor.fetchall()
-    conn.close()
+    Returns:
+        Dict of coldkey -> EVM address
+    """
+    with _wallet_cache_lock:
+        _reload_wallet_cache()
+        return dict(_coldkey_to_evm)
+
+
+def get_all_wallet_mappings() -> List[dict]:
+    """Get all wallet mappings."""
+    with _reader() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT coldkey, evm_address, timestamp, verified_at
+            FROM wallet_mappings ORDER BY verified_at DESC
+        ''')
+        
+        rows = cursor.fetchall()
     
     return [
         {
@@ -646,15 +1273,13 @@ def delete_wallet_mapping(coldkey: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    conn = _get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute('DELETE FROM wallet_mappings WHERE coldkey = ?', (coldkey,))
-    deleted = cursor.rowcount > 0
-    
-    conn.commit()
-    conn.close()
+    with _writer() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM wallet_mappings WHERE coldkey = ?', (coldkey,))
+        deleted = cursor.rowcount > 0
     
+    _update_wallet_cache(coldkey, None)
     return deleted
 
 
@@ -669,45 +1294,49 @@ def clear_contract_data(contract_address: str = None, clear_all_except_current:
                           clears all data NOT from current contract)
         clear_all_except_current: If True, clears data from all contracts except current
     """
-    conn = _get_connection()
-    cursor = conn.cursor()
-    
-    if clear_all_except_current:
-        # Clear data from all contracts except the current one
-        current_contract = TAO_COLOSSEUM_CONTRACT_ADDRESS
-        
-        cursor.execute('DELETE FROM bet_events WHERE contract_address != ?', (current_contract,))
-        bet_deleted = cursor.rowcount
-        
-        cursor.execute('DELETE FROM miner_data WHERE contract_address != ?', (current_contract,))
-        miner_deleted = cursor.rowcount
-        
-        cursor.execute('DELETE FROM snapshots WHERE contract_address != ? AND contract_address IS NOT NULL', 
-                      (current_contract,))
-        snapshot_deleted = cursor.rowcount
+    with _writer() as conn:
+        cursor = conn.cursor()
         
-        bt.logging.info(
-            f"Cleared old contract data: {bet_deleted} bet events, "
-            f"{miner_deleted} miner records, {snapshot_deleted} snapshots"
-        )
-    elif contract_address:
-        # Clear data for specific contract
-        cursor.execute('DELETE FROM bet_events WHERE contract_address = ?', (contract_address,))
-        bet_deleted = cursor.rowcount
-        
-        cursor.execute('DELETE FROM miner_data WHERE contract_address = ?', (contract_address,))
-        miner_deleted = cursor.rowcount
-        
-        cursor.execute('DELETE FROM snapshots WHERE contract_address = ?', (contract_address,))
-        snapshot_deleted = cursor.rowcount
+        if clear_all_except_current:
+            # Clear data from all contracts except the current one
+            current_contract = TAO_COLOSSEUM_CONTRACT_ADDRESS
+            
+            cursor.execute('DELETE FROM bet_events WHERE contract_address != ?', (current_contract,))
+            bet_deleted = cursor.rowcount
+            cursor.execute('DELETE FROM scan_state WHERE contract_address != ?', (current_contract,))
+            
+            cursor.execute('DELETE FROM miner_data WHERE contract_address != ?', (current_contract,))
+            miner_deleted = cursor.rowcount
+            
+            cursor.execute('DELETE FROM snapshots WHERE contract_address != ? AND contract_address IS NOT NULL', 
+                          (current_contract,))
+            snapshot_deleted = cursor.rowcount
+            
+            bt.logging.info(
+                f"Cleared old contract data: {bet_deleted} bet events, "
+                f"{miner_deleted} miner records, {snapshot_deleted} snapshots"
+            )
+        elif contract_address:
+            # Clear data for specific contract
+            cursor.execute('DELETE FROM bet_events WHERE contract_address = ?', (contract_address,))
+            bet_deleted = cursor.rowcount
+            cursor.execute('DELETE FROM scan_state WHERE contract_address = ?', (contract_address,))
+            
+            cursor.execute('DELETE FROM miner_data WHERE contract_address = ?', (contract_address,))
+            miner_deleted = cursor.rowcount
+            
+            cursor.execute('DELETE FROM snapshots WHERE contract_address = ?', (contract_address,))
+            snapshot_deleted = cursor.rowcount
+            
+            bt.logging.info(
+                f"Cleared data for contract {contract_address[:10]}...: "
+                f"{bet_deleted} bet events, {miner_deleted} miner records, {snapshot_deleted} snapshots"
+            )
         
-        bt.logging.info(
-            f"Cleared data for contract {contract_address[:10]}...: "
-            f"{bet_deleted} bet events, {miner_deleted} miner records, {snapshot_deleted} snapshots"
-        )
+        # The next snapshot must not be a delta against deleted rows
+        _snapshot_chain.clear()
     
-    conn.commit()
-    conn.close()
+    _invalidate_snapshot_cache()
 
 
 def get_contract_stats() -> Dict[str, dict]:
@@ -717,44 +1346,30 @@ def get_contract_stats() -> Dict[str, dict]:
     Returns:
         Dict mapping contract_address -> stats dict
     """
-    conn = _get_connection()
-    cursor = conn.cursor()
+    with _reader() as conn:
+        cursor = conn.cursor()
+        
+        # Bet events, miner data and snapshots by contract, in one statement
+        cursor.execute('''
+            SELECT 'bets', contract_address, COUNT(*), COALESCE(SUM(amount), 0)
+            FROM bet_events GROUP BY contract_address
+            UNION ALL
+            SELECT 'miners', contract_address, COUNT(*), 0
+            FROM miner_data GROUP BY contract_address
+            UNION ALL
+            SELECT 'snapshots', contract_address, COUNT(*), 0
+            FROM snapshots GROUP BY contract_address
+        ''')
+        rows = cursor.fetchall()
     
     stats = {}
-    
-    # Bet events by contract
-    cursor.execute('''
-        SELECT contract_address, COUNT(*) as count, SUM(amount) as total_amount
-        FROM bet_events GROUP BY contract_address
-    ''')
-    for row in cursor.fetchall():
-        contract = row[0] or 'unknown'
-        stats[contract] = {
-            'bet_events': row[1],
-            'total_bet_amount': row[2] or 0
-        }
-    
-    # Miner data by contract
-    cursor.execute('''
-        SELECT contract_address, COUNT(*) as count
-        FROM miner_data GROUP BY contract_address
-    ''')
-    for row in cursor.fetchall():
-        contract = row[0] or 'unknown'
-        if contract not in stats:
-            stats[contract] = {}
-        stats[contract]['miner_records'] = row[1]
-    
-    # Snapshots by contract
-    cursor.execute('''
-        SELECT contract_address, COUNT(*) as count
-        FROM snapshots GROUP BY contract_address
-    ''')
-    for row in cursor.fetchall():
-        contract = row[0] or 'unknown'
-        if contract not in stats:
-            stats[contract] = {}
-        stats[contract]['snapshots'] = row[1]
-    
-    conn.close()
+    for src, contract, count, total_amount in rows:
+        contract_stats = stats.setdefault(contract or 'unknown', {})
+        if src == 'bets':
+            contract_stats['bet_events'] = count
+            contract_stats['total_bet_amount'] = total_amount
+        elif src == 'miners':
+            contract_stats['miner_records'] = count
+        else:
+            contract_stats['snapshots'] = count
     return stats
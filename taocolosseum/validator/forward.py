@@ -22,20 +22,28 @@ Periodically checks betting volumes from the TAO Colosseum smart contract
 and updates miner scores based on time-decayed activity.
 """
 
-import time
+import asyncio
 from typing import Dict, Optional
 import numpy as np
 import bittensor as bt
 
 from taocolosseum.core.const import VOLUME_CHECK_INTERVAL
-from taocolosseum.validator.reward import calculate_volume_rewards
-from taocolosseum.validator.database import update_miner_data, cleanup_old_events, get_evm_address_for_coldkey
+from taocolosseum.utils.logging import debug_enabled
+from taocolosseum.validator.reward import calculate_volume_rewards, apply_time_decay_batch
+from taocolosseum.validator.database import (
+    update_miner_data_bulk,
+    cleanup_old_events,
+    db_optimize,
+    get_evm_address_for_coldkey,
+    load_all_wallet_mappings,
+    reset_last_scanned_block,
+)
 
 # Import contract client with error handling
 try:
     from taocolosseum.validator.contract import (
         get_contract_client,
-        get_miner_volume,
+        get_miners_volumes_async,
         ContractClient,
     )
     CONTRACT_AVAILABLE = True
@@ -43,6 +51,13 @@ except ImportError as e:
     CONTRACT_AVAILABLE = False
     bt.logging.warning(f"Contract module not available: {e}")
 
+# Forward steps between full reloads of the wallet mapping cache (picks up
+# mappings written outside this process)
+WALLET_MAPPING_REFRESH_STEPS = 50
+
+# Granularity (seconds) at which the wait between volume checks notices shutdown
+EXIT_POLL_INTERVAL = 1.0
+
 
 def _get_miner_evm_address(coldkey: str) -> Optional[str]:
     """
@@ -60,7 +75,7 @@ def _get_miner_evm_address(coldkey: str) -> Optional[str]:
     """
     try:
         evm_address = get_evm_address_for_coldkey(coldkey)
-        if evm_address:
+        if evm_address and debug_enabled():
             bt.logging.debug(f"Found EVM mapping for {coldkey[:10]}...: {evm_address[:10]}...")
         return evm_address
     except Exception as e:
@@ -68,64 +83,24 @@ def _get_miner_evm_address(coldkey: str) -> Optional[str]:
         return None
 
 
-async def forward(self):
+def _resolve_evm_addresses(self, miner_rows: list) -> Dict[int, str]:
     """
-    The forward function is called by the validator every time step.
+    Look up every miner's current EVM mapping and drop stale ones.
     
-    It queries the TAO Colosseum smart contract for each miner's betting
-    volume over the last 7 days, applies time decay weighting, and
-    updates miner scores accordingly.
+    UIDs whose mapping changed get a zeroed miner_data row appended to
+    miner_rows so stale volume doesn't persist.
     
-    The scores are later used to set weights on the Bittensor network.
+    Returns:
+        Dict of UID -> EVM address for mapped miners
     """
-    bt.logging.info(f"Forward step {self.step}: Checking betting volumes...")
-    
-    # Initialize volume tracking if not present
-    if not hasattr(self, 'miner_volumes'):
-        self.miner_volumes = {}
-    if not hasattr(self, 'miner_daily_volumes'):
-        self.miner_daily_volumes = {}
-    if not hasattr(self, 'miner_evm_addresses'):
-        self.miner_evm_addresses = {}
-    
-    # Check if contract client is available
-    if not CONTRACT_AVAILABLE:
-        bt.logging.warning("Contract module not available, skipping volume check")
-        time.sleep(VOLUME_CHECK_INTERVAL)
-        return
-    
-    try:
-        client = get_contract_client()
-        
-        if not client.is_connected():
-            bt.logging.warning("Not connected to Bittensor EVM RPC")
-            time.sleep(VOLUME_CHECK_INTERVAL)
-            return
-        
-        bt.logging.info(
-            f"Volume check: RPC={getattr(client, 'rpc_url', '?')} "
-            f"contract={getattr(client, 'contract_address', '?')[:18]}..."
-        )
-            
-    except Exception as e:
-        bt.logging.error(f"Failed to initialize contract client: {e}")
-        time.sleep(VOLUME_CHECK_INTERVAL)
-        return
-    
-    # Query volumes for all miners
-    volumes = {}
-    daily_volumes = {}
-    active_count = 0
-    miners_with_mapping_no_volume = 0
-    
-    bt.logging.info(f"Querying volumes for {self.metagraph.n} miners...")
+    evm_by_uid = {}
     
     for uid in range(self.metagraph.n):
         coldkey = self.metagraph.coldkeys[uid]
-        hotkey = self.metagraph.hotkeys[uid]
         
-        # Always query DB for the current EVM mapping (never rely solely on cache).
-        # This ensures remaps are picked up immediately on the next forward step.
+        # Look up the current EVM mapping every step (never rely solely on
+        # miner_evm_addresses) so remaps are picked up on the next forward step.
+        # Served from the database module's write-through mapping cache.
         evm_address = _get_miner_evm_address(coldkey)
         
         cached_evm = self.miner_evm_addresses.get(uid)
@@ -140,31 +115,57 @@ async def forward(self):
             # Clear stale cache entry — this coldkey no longer owns the old EVM
             self.miner_evm_addresses.pop(uid, None)
             # Zero out this UID's stored miner data so stale volume doesn't persist
-            update_miner_data(
-                uid=uid,
-                hotkey=hotkey,
-                coldkey=coldkey,
-                evm_address=evm_address,
-                daily_volumes=[0.0] * 7,
-                weighted_volume=0.0,
-                score=0.0
-            )
+            miner_rows.append((uid, self.metagraph.hotkeys[uid], coldkey, evm_address, [0.0] * 7, 0.0, 0.0))
         
         if evm_address:
             self.miner_evm_addresses[uid] = evm_address
-            
-            # Query betting volume from contract
-            weighted_vol, daily_vols = get_miner_volume(client, evm_address)
+            evm_by_uid[uid] = evm_address
+    
+    return evm_by_uid
+
+
+async def _sweep_volumes(self, client):
+    """
+    Query every mapped miner's betting volume and persist it.
+    
+    Mapping lookups and the SQLite write run in worker threads; the volume
+    queries for all miners are issued together through
+    get_miners_volumes_async rather than one blocking call per UID, so the
+    event loop it shares with the API server stays responsive.
+    
+    Returns:
+        (volumes, daily_matrix, active_count, miners_with_mapping_no_volume), where
+        daily_matrix is an (n, 7) float64 array of daily volumes indexed by UID
+    """
+    volumes = {}
+    daily_matrix = np.zeros((self.metagraph.n, 7), dtype=np.float64)
+    active_count = 0
+    miners_with_mapping_no_volume = 0
+    # miner_data rows, written in one transaction after the sweep
+    miner_rows = []
+    
+    if self.step % WALLET_MAPPING_REFRESH_STEPS == 0:
+        await asyncio.to_thread(load_all_wallet_mappings)
+    evm_by_uid = await asyncio.to_thread(_resolve_evm_addresses, self, miner_rows)
+    volumes_by_address = await get_miners_volumes_async(client, evm_by_uid.values())
+    log_debug = debug_enabled()
+    
+    for uid in range(self.metagraph.n):
+        evm_address = evm_by_uid.get(uid)
+        
+        if evm_address:
+            weighted_vol, daily_vols = volumes_by_address.get(evm_address, (0.0, [0.0] * 7))
             
             volumes[uid] = weighted_vol
-            daily_volumes[uid] = daily_vols
+            daily_matrix[uid] = daily_vols
             
             if weighted_vol > 0:
                 active_count += 1
-                bt.logging.debug(
-                    f"UID {uid}: {weighted_vol:.4f} TAO weighted volume "
-                    f"(daily: {[f'{v:.2f}' for v in daily_vols]})"
-                )
+                if log_debug:
+                    bt.logging.debug(
+                        f"UID {uid}: {weighted_vol:.4f} TAO weighted volume "
+                        f"(daily: {[f'{v:.2f}' for v in daily_vols]})"
+                    )
             else:
                 miners_with_mapping_no_volume += 1
                 bt.logging.info(
@@ -172,23 +173,118 @@ async def forward(self):
                     f"but volume=0 (no events in last 7d or RPC/get_logs issue)"
                 )
             
-            # Update database
-            update_miner_data(
-                uid=uid,
-                hotkey=hotkey,
-                coldkey=coldkey,
-                evm_address=evm_address,
-                daily_volumes=daily_vols,
-                weighted_volume=weighted_vol,
-                score=float(self.scores[uid]) if uid < len(self.scores) else 0.0
-            )
+            miner_rows.append((
+                uid, self.metagraph.hotkeys[uid], self.metagraph.coldkeys[uid], evm_address,
+                daily_vols, weighted_vol,
+                float(self.scores[uid]) if uid < len(self.scores) else 0.0
+            ))
         else:
             volumes[uid] = 0.0
-            daily_volumes[uid] = [0.0] * 7
+    
+    # Update database
+    await asyncio.to_thread(update_miner_data_bulk, miner_rows)
+    
+    return volumes, daily_matrix, active_count, miners_with_mapping_no_volume
+
+
+def _burn_vectors(self):
+    """
+    Cached (rewards, uids) arrays that send all weight to UID 0.
+    
+    Rebuilt only when the metagraph size changes; update_scores only reads
+    them, so they are safe to reuse across steps.
+    """
+    n = int(self.metagraph.n)
+    cached = getattr(self, '_burn_cache', None)
+    if cached is None or cached[1].size != n:
+        rewards = np.zeros(n, dtype=np.float32)
+        rewards[0] = 1.0
+        cached = (rewards, np.arange(n))
+        self._burn_cache = cached
+    return cached
+
+
+async def _wait_for_next_check(self):
+    """
+    Wait VOLUME_CHECK_INTERVAL without blocking the event loop.
+    
+    Returns early once self.should_exit is set, so stopping the validator
+    doesn't wait out the rest of the interval.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + VOLUME_CHECK_INTERVAL
+    while not getattr(self, 'should_exit', False):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(EXIT_POLL_INTERVAL, remaining))
+
+
+async def forward(self):
+    """
+    The forward function is called by the validator every time step.
+    
+    It queries the TAO Colosseum smart contract for each miner's betting
+    volume over the last 7 days, applies time decay weighting, and
+    updates miner scores accordingly.
+    
+    The scores are later used to set weights on the Bittensor network.
+    """
+    bt.logging.info(f"Forward step {self.step}: Checking betting volumes...")
+    
+    # Initialize volume tracking if not present
+    if not hasattr(self, 'miner_volumes'):
+        self.miner_volumes = {}
+    if not hasattr(self, 'daily_vol_matrix'):
+        self.daily_vol_matrix = np.zeros((self.metagraph.n, 7), dtype=np.float64)
+    if not hasattr(self, 'miner_evm_addresses'):
+        self.miner_evm_addresses = {}
+    
+    # Check if contract client is available
+    if not CONTRACT_AVAILABLE:
+        bt.logging.warning("Contract module not available, skipping volume check")
+        await _wait_for_next_check(self)
+        return
+    
+    try:
+        client = await asyncio.to_thread(get_contract_client)
+        
+        if not await asyncio.to_thread(client.is_connected):
+            bt.logging.warning("Not connected to Bittensor EVM RPC")
+            await _wait_for_next_check(self)
+            return
+        
+        bt.logging.info(
+            f"Volume check: RPC={getattr(client, 'rpc_url', '?')} "
+            f"contract={getattr(client, 'contract_address', '?')[:18]}..."
+        )
+            
+    except Exception as e:
+        bt.logging.error(f"Failed to initialize contract client: {e}")
+        await _wait_for_next_check(self)
+        return
+    
+    # Sweeps normally fetch only blocks since the last scan; --neuron.full_rescore
+    # rebuilds the cache from the whole 7-day window once, on the first pass
+    if getattr(self.config.neuron, 'full_rescore', False) and not getattr(self, '_full_rescore_done', False):
+        bt.logging.info("Full rescore: rescanning the last 7 days of bet events")
+        try:
+            await asyncio.to_thread(reset_last_scanned_block, client.contract_address)
+            await asyncio.to_thread(client.sync_bet_events)
+            self._full_rescore_done = True
+        except Exception as e:
+            bt.logging.warning(f"Full rescore failed, will retry next step: {e}")
+    
+    # Query volumes for all miners (blocking RPC/DB work, kept off the event loop)
+    bt.logging.info(f"Querying volumes for {self.metagraph.n} miners...")
+    volumes, daily_matrix, active_count, miners_with_mapping_no_volume = await _sweep_volumes(
+        self, client
+    )
     
     # Store volumes for API access
     self.miner_volumes = volumes
-    self.miner_daily_volumes = daily_volumes
+    self.daily_vol_matrix = daily_matrix
+    self.update_volume_totals()
     
     bt.logging.info(
         f"Volume check complete: {active_count}/{self.metagraph.n} miners with betting activity, "
@@ -197,44 +293,31 @@ async def forward(self):
     
     # Calculate rewards based on volumes
     if active_count > 0:
-        rewards = calculate_volume_rewards(volumes, daily_volumes)
-        
-        # Get UIDs in order
-        uids = list(range(self.metagraph.n))
-        
-        # Create rewards array aligned with all UIDs
-        reward_array = np.zeros(self.metagraph.n, dtype=np.float32)
-        sorted_uids = sorted(volumes.keys())
-        
-        # Ensure rewards is a 1D array (handles edge cases with single element)
-        rewards = np.atleast_1d(rewards)
-        
-        for i, uid in enumerate(sorted_uids):
-            if i < len(rewards):
-                reward_array[uid] = float(rewards[i])
+        # Rows are indexed by UID, so rewards come back aligned with all UIDs
+        uids = np.arange(self.metagraph.n)
+        reward_array = calculate_volume_rewards(apply_time_decay_batch(daily_matrix))
         
         bt.logging.info(
             f"Updating scores for {len(uids)} miners, "
             f"{active_count} with rewards, max reward: {reward_array.max():.4f}"
         )
-        self.update_scores(reward_array.tolist(), uids)
+        self.update_scores(reward_array, uids)
     else:
         bt.logging.info(
             "No miners with betting volume (active_count=0) - running burn code; "
             "check RPC/get_logs logs above for get_bets_last_7_days and get_logs"
         )
-        reward_array = np.zeros(self.metagraph.n, dtype=np.float32)
-        reward_array[0] = 1.0
-        uids = list(range(self.metagraph.n))
-        self.update_scores(reward_array.tolist(), uids)
+        reward_array, uids = _burn_vectors(self)
+        self.update_scores(reward_array, uids)
     
-    # Periodic cleanup of old cached events
+    # Periodic cleanup of old cached events, then refresh planner statistics
     if self.step % 100 == 0:
-        cleanup_old_events(days=14)
+        await asyncio.to_thread(cleanup_old_events, days=14)
+        await asyncio.to_thread(db_optimize)
     
     # Sleep before next check
     bt.logging.debug(f"Sleeping {VOLUME_CHECK_INTERVAL}s before next volume check")
-    time.sleep(VOLUME_CHECK_INTERVAL)
+    await _wait_for_next_check(self)
 
 
 async def forward_with_evm_mapping(self, evm_mapping: Dict[str, str]):
@@ -22,14 +22,14 @@ Calculates miner rewards based on time-decayed betting volumes.
 """
 
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Union
 import bittensor as bt
 
 from taocolosseum.core.const import TIME_DECAY_WEIGHTS
 
 
 def calculate_volume_rewards(
-    volumes: Dict[int, float],
+    volumes: Union[Dict[int, float], np.ndarray],
     daily_volumes: Dict[int, List[float]] = None
 ) -> np.ndarray:
     """
@@ -39,30 +39,34 @@ def calculate_volume_rewards(
     The reward for each miner is proportional to their share of total volume.
     
     Args:
-        volumes: Dict mapping UID -> weighted volume (already time-decayed)
+        volumes: Weighted volume (already time-decayed) per UID, either as an
+            array indexed by UID or a dict mapping UID -> volume
         daily_volumes: Optional dict mapping UID -> list of daily volumes
 
     Returns:
-        np.ndarray: Array of rewards for each UID
+        np.ndarray: Array of rewards for each UID (sorted UIDs for a dict)
     """
-    if not volumes:
+    if isinstance(volumes, np.ndarray):
+        raw_volumes = volumes.astype(np.float32, copy=False)
+    else:
+        uids = sorted(volumes)
+        raw_volumes = np.fromiter((volumes[uid] for uid in uids), dtype=np.float32, count=len(uids))
+    
+    if raw_volumes.size == 0:
         bt.logging.warning("No volumes provided for reward calculation")
         return np.array([])
     
-    uids = sorted(volumes.keys())
-    raw_volumes = np.array([volumes[uid] for uid in uids], dtype=np.float32)
-    
     total_volume = raw_volumes.sum()
     
     if total_volume == 0:
         bt.logging.info("Total betting volume is zero - no rewards to distribute")
-        return np.zeros(len(uids), dtype=np.float32)
+        return np.zeros(raw_volumes.size, dtype=np.float32)
     
     # Reward proportional to volume share
     rewards = raw_volumes / total_volume
     
     # Log summary
-    active_miners = (raw_volumes > 0).sum()
+    active_miners = np.count_nonzero(raw_volumes)
     bt.logging.info(
         f"Reward calculation: {active_miners} miners with volume, "
         f"total volume: {total_volume:.4f} TAO (weighted)"
@@ -89,9 +93,9 @@ def get_rewards_for_uids(
         return np.array([])
     
     # Get volumes for specified UIDs
-    uid_volumes = {uid: volumes.get(uid, 0.0) for uid in uids}
-    
-    raw_volumes = np.array([uid_volumes[uid] for uid in uids], dtype=np.float32)
+    raw_volumes = np.fromiter(
+        (volumes.get(uid, 0.0) for uid in uids), dtype=np.float32, count=len(uids)
+    )
     total_volume = raw_volumes.sum()
     
     if total_volume == 0:
@@ -111,18 +115,29 @@ def apply_time_decay(daily_volumes: List[float], weights: List[float] = None) ->
     Returns:
         Weighted sum of volumes
     """
-    weights = weights or TIME_DECAY_WEIGHTS
+    weights = TIME_DECAY_WEIGHTS if weights is None else np.asarray(weights, dtype=np.float64)
     
-    # Ensure we have enough data
-    if len(daily_volumes) < len(weights):
-        daily_volumes = daily_volumes + [0.0] * (len(weights) - len(daily_volumes))
+    # Missing trailing days count as zero volume
+    volumes = np.zeros(len(weights), dtype=np.float64)
+    head = np.asarray(daily_volumes[:len(weights)], dtype=np.float64)
+    volumes[:head.size] = head
     
-    weighted_sum = sum(
-        vol * weight 
-        for vol, weight in zip(daily_volumes[:len(weights)], weights)
-    )
+    return float(volumes @ weights)
+
+
+def apply_time_decay_batch(daily_matrix: np.ndarray, weights: List[float] = None) -> np.ndarray:
+    """
+    Apply time decay weights to many miners' daily volumes at once.
     
-    return weighted_sum
+    Args:
+        daily_matrix: (N, 7) array, one row of daily volumes per miner
+        weights: Optional custom weights (default: TIME_DECAY_WEIGHTS)
+        
+    Returns:
+        (N,) array of weighted volumes
+    """
+    weights = TIME_DECAY_WEIGHTS if weights is None else np.asarray(weights, dtype=np.float64)
+    return np.asarray(daily_matrix, dtype=np.float64) @ weights
 
 
 def normalize_rewards(rewards: np.ndarray) -> np.ndarray:
@@ -7,9 +7,14 @@ Usage:
 """
 
 import sys
+import time
+import asyncio
 import argparse
+import functools
 from datetime import datetime, timedelta
 
+import numpy as np
+
 # Use the same constants as the validator
 from taocolosseum.core.const import (
     TAO_COLOSSEUM_CONTRACT_ADDRESS,
@@ -26,6 +31,19 @@ except ImportError:
     print("ERROR: web3 not installed. Run: pip install web3")
     sys.exit(1)
 
+# New ABI event signature (Underdog-only, no referrer)
+NEW_BET_PLACED_SIG = Web3.keccak(text="BetPlaced(uint256,address,uint8,uint256,uint256)")
+# Old ABI event signature (had referrer address as 6th param)
+OLD_BET_PLACED_SIG = Web3.keccak(text="BetPlaced(uint256,address,uint8,uint256,uint256,address)")
+
+
+async def get_logs_concurrently(w3, filters):
+    """Run eth_getLogs for each filter at once; failures are returned in place of their logs."""
+    return await asyncio.gather(
+        *(asyncio.to_thread(w3.eth.get_logs, f) for f in filters),
+        return_exceptions=True
+    )
+
 
 def main():
     parser = argparse.ArgumentParser(description="Test bet fetching with same logic as validator")
@@ -140,36 +158,50 @@ def main():
         print(f"  Cached events: {cached_count}")
         if cached_count > 0:
             print(f"  Cached block range: {cached_min_block} - {cached_max_block}")
+            # Already decoded and timestamped; folded straight into the volumes in Step 6
+            cursor.execute(
+                "SELECT block_number, amount, timestamp "
+                "FROM bet_events WHERE evm_address = ? AND contract_address = ? AND timestamp >= ?",
+                (evm_address.lower(), contract_address, seven_days_ago),
+            )
+            cached_rows = cursor.fetchall()
+        else:
+            cached_rows = []
         conn.close()
     except Exception as e:
         print(f"  Cache check failed: {e}")
         cached_count = 0
+        cached_max_block = None
+        cached_rows = []
     print()
 
     # ---- Step 5: Call get_logs (same as validator) ----
     print("--- Step 5: Calling eth_getLogs (same as validator) ---")
 
-    # New ABI event signature (Underdog-only, no referrer)
-    new_sig = w3.keccak(text="BetPlaced(uint256,address,uint8,uint256,uint256)")
-    # Old ABI event signature (had referrer address as 6th param)
-    old_sig = w3.keccak(text="BetPlaced(uint256,address,uint8,uint256,uint256,address)")
+    new_sig = NEW_BET_PLACED_SIG
+    old_sig = OLD_BET_PLACED_SIG
 
     checksum_address = Web3.to_checksum_address(evm_address)
-    address_topic = '0x' + checksum_address[2:].lower().zfill(64)
+    address_topic = f"0x{int(checksum_address, 16):064x}"
 
     print(f"  NEW event sig (no referrer): 0x{new_sig.hex()}")
     print(f"  OLD event sig (w/ referrer): 0x{old_sig.hex()}")
     print(f"  Address topic:               {address_topic}")
     print(f"  Contract:                    {contract_address}")
     print(f"  Range:                       {from_block} -> {current_block}")
+
+    # Like the validator, only blocks past the cache are fetched for this bettor
+    bettor_from = from_block
+    if cached_max_block is not None:
+        bettor_from = max(from_block, cached_max_block + 1)
+        print(f"  Bettor range (after cache):  {bettor_from} -> {current_block}")
     print()
 
-    # 5a: Try NEW signature with bettor filter (what the validator does)
-    print("  [5a] NEW sig + bettor filter (validator logic)...")
-    logs = []
-    try:
-        logs = w3.eth.get_logs({
-            'fromBlock': from_block,
+    recent_from = max(from_block, current_block - 1000)
+    steps = [
+        # 5a: Try NEW signature with bettor filter (what the validator does)
+        ("[5a] NEW sig + bettor filter (validator logic)...", {
+            'fromBlock': bettor_from,
             'toBlock': current_block,
             'address': contract_address,
             'topics': [
@@ -177,17 +209,10 @@ def main():
                 None,
                 address_topic,
             ],
-        })
-        print(f"       -> {len(logs)} log(s)")
-    except Exception as e:
-        print(f"       -> FAILED: {type(e).__name__}: {e}")
-
-    # 5b: Try OLD signature with bettor filter
-    print("  [5b] OLD sig + bettor filter...")
-    logs_old_sig = []
-    try:
-        logs_old_sig = w3.eth.get_logs({
-            'fromBlock': from_block,
+        }),
+        # 5b: Try OLD signature with bettor filter
+        ("[5b] OLD sig + bettor filter...", {
+            'fromBlock': bettor_from,
             'toBlock': current_block,
             'address': contract_address,
             'topics': [
@@ -195,71 +220,62 @@ def main():
                 None,
                 address_topic,
             ],
-        })
-        print(f"       -> {len(logs_old_sig)} log(s)")
-    except Exception as e:
-        print(f"       -> FAILED: {type(e).__name__}: {e}")
-
-    # 5c: Try NEW signature WITHOUT bettor filter (all bettors)
-    print("  [5c] NEW sig, NO bettor filter (all bets on contract)...")
-    logs_all_new = []
-    try:
-        logs_all_new = w3.eth.get_logs({
+        }),
+        # 5c: Try NEW signature WITHOUT bettor filter (all bettors)
+        ("[5c] NEW sig, NO bettor filter (all bets on contract)...", {
             'fromBlock': from_block,
             'toBlock': current_block,
             'address': contract_address,
             'topics': [
                 '0x' + new_sig.hex(),
             ],
-        })
-        print(f"       -> {len(logs_all_new)} log(s)")
-    except Exception as e:
-        print(f"       -> FAILED: {type(e).__name__}: {e}")
-
-    # 5d: Try OLD signature WITHOUT bettor filter (all bettors)
-    print("  [5d] OLD sig, NO bettor filter (all bets on contract)...")
-    logs_all_old = []
-    try:
-        logs_all_old = w3.eth.get_logs({
+        }),
+        # 5d: Try OLD signature WITHOUT bettor filter (all bettors)
+        ("[5d] OLD sig, NO bettor filter (all bets on contract)...", {
             'fromBlock': from_block,
             'toBlock': current_block,
             'address': contract_address,
             'topics': [
                 '0x' + old_sig.hex(),
             ],
-        })
-        print(f"       -> {len(logs_all_old)} log(s)")
-    except Exception as e:
-        print(f"       -> FAILED: {type(e).__name__}: {e}")
-
-    # 5e: Query ALL events from contract (no topic filter)
-    print("  [5e] ALL events from contract (no topic filter, last 1000 blocks)...")
-    logs_any = []
-    try:
-        recent_from = max(from_block, current_block - 1000)
-        logs_any = w3.eth.get_logs({
+        }),
+        # 5e: Query ALL events from contract (no topic filter)
+        ("[5e] ALL events from contract (no topic filter, last 1000 blocks)...", {
             'fromBlock': recent_from,
             'toBlock': current_block,
             'address': contract_address,
-        })
-        print(f"       -> {len(logs_any)} event(s) in last 1000 blocks")
-        if logs_any:
-            # Show unique event topic0 values (event signatures present)
-            unique_sigs = set()
-            for l in logs_any:
-                if l.get('topics'):
-                    unique_sigs.add(l['topics'][0].hex())
-            print(f"       Unique event signatures found: {len(unique_sigs)}")
-            for sig in sorted(unique_sigs):
-                count = sum(1 for l in logs_any if l.get('topics') and l['topics'][0].hex() == sig)
-                marker = ""
-                if sig == new_sig.hex():
-                    marker = " <-- NEW BetPlaced"
-                elif sig == old_sig.hex():
-                    marker = " <-- OLD BetPlaced (with referrer!)"
-                print(f"         0x{sig}: {count} event(s){marker}")
-    except Exception as e:
-        print(f"       -> FAILED: {type(e).__name__}: {e}")
+        }),
+    ]
+
+    # The five queries are independent, so they go out together (one RTT, not five)
+    results = asyncio.run(get_logs_concurrently(w3, [f for _, f in steps]))
+
+    step_logs = []
+    for (label, _), result in zip(steps, results):
+        print(f"  {label}")
+        if isinstance(result, Exception):
+            print(f"       -> FAILED: {type(result).__name__}: {result}")
+            step_logs.append([])
+        else:
+            print(f"       -> {len(result)} log(s)")
+            step_logs.append(result)
+    logs, logs_old_sig, logs_all_new, logs_all_old, logs_any = step_logs
+
+    if logs_any:
+        # Show unique event topic0 values (event signatures present)
+        unique_sigs = set()
+        for l in logs_any:
+            if l.get('topics'):
+                unique_sigs.add(l['topics'][0].hex())
+        print(f"       Unique event signatures found: {len(unique_sigs)}")
+        for sig in sorted(unique_sigs):
+            count = sum(1 for l in logs_any if l.get('topics') and l['topics'][0].hex() == sig)
+            marker = ""
+            if sig == new_sig.hex():
+                marker = " <-- NEW BetPlaced"
+            elif sig == old_sig.hex():
+                marker = " <-- OLD BetPlaced (with referrer!)"
+            print(f"         0x{sig}: {count} event(s){marker}")
 
     print()
 
@@ -268,6 +284,9 @@ def main():
     if len(logs) > 0:
         print("  OK: NEW event signature matched. Validator logic should work.")
         use_logs = logs
+    elif cached_count > 0 and len(logs_old_sig) == 0:
+        print(f"  OK: {cached_count} cached event(s), no new ones since block {cached_max_block}.")
+        use_logs = []
     elif len(logs_old_sig) > 0:
         print("  ** PROBLEM FOUND: OLD event signature matches but NEW does not! **")
         print("     The deployed contract still emits BetPlaced WITH referrer param.")
@@ -293,42 +312,66 @@ def main():
     print()
 
     # ---- Step 6: Decode events and compute volume (same as validator) ----
-    if use_logs:
-        print(f"--- Step 6: Decoding {len(use_logs)} event(s) ---")
-        daily_volumes = [0.0] * 7
-        now = datetime.utcnow()
-
-        for i, log in enumerate(use_logs[:20]):  # cap at 20 for display
+    if use_logs or cached_rows:
+        print(f"--- Step 6: Decoding {len(use_logs)} new event(s), "
+              f"{len(cached_rows)} from cache ---")
+        daily_volumes = np.zeros(7)
+        now_ts = int(time.time())
+
+        # Many bets share a block; fetch each block's timestamp once
+        @functools.lru_cache(maxsize=8192)
+        def get_block_ts(block_num):
+            return w3.eth.get_block(block_num)['timestamp']
+
+        # side = first 32 bytes, amount = next 32 bytes
+        amount_words = []
+        block_nums = []
+        for i, log in enumerate(use_logs):
+            data = log['data']
+            if isinstance(data, str):
+                data = bytes.fromhex(data[2:])
+            if len(data) < 64:
+                print(f"  [{i}] decode error: data is {len(data)} bytes, expected 64")
+                continue
+            amount_words.append(data[32:64])
+            block_nums.append(log['blockNumber'])
+
+        # All amounts in one pass: each uint256 as four big-endian uint64 words.
+        # Wei amounts stay far below 2**128, so the low two words carry the value.
+        words = np.frombuffer(b''.join(amount_words), dtype='>u8').reshape(-1, 4)
+        amounts_tao = (words[:, 2].astype(np.float64) * 2.0 ** 64 + words[:, 3]) / 1e18
+
+        timestamps = []
+        for block_num in block_nums:
             try:
-                block_num = log['blockNumber']
-                data = log['data']
-                if isinstance(data, str):
-                    data = bytes.fromhex(data[2:])
-                # side = first 32 bytes, amount = next 32 bytes
-                amount_wei = int.from_bytes(data[32:64], 'big')
-                amount_tao = amount_wei / 1e18
-
-                try:
-                    block_info = w3.eth.get_block(block_num)
-                    ts = block_info['timestamp']
-                except Exception:
-                    ts = int(now.timestamp())
-
-                event_time = datetime.utcfromtimestamp(ts)
-                days_ago = (now - event_time).days
-
-                print(f"  [{i}] block={block_num} amount={amount_tao:.4f} TAO "
-                      f"ts={ts} ({event_time.isoformat()}) days_ago={days_ago}")
-
-                if 0 <= days_ago < 7:
-                    daily_volumes[days_ago] += amount_tao
-            except Exception as e:
-                print(f"  [{i}] decode error: {e}")
-
-        if len(use_logs) > 20:
-            print(f"  ... and {len(use_logs) - 20} more events (not shown)")
-
-        weighted_volume = sum(v * w for v, w in zip(daily_volumes, TIME_DECAY_WEIGHTS))
+                timestamps.append(get_block_ts(block_num))
+            except Exception:
+                timestamps.append(now_ts)
+        ts_arr = np.array(timestamps, dtype=np.int64)
+
+        # Cached rows are already decoded and timestamped; bucket them with the new ones
+        if cached_rows:
+            cached = np.array([(amount, ts) for _, amount, ts in cached_rows], dtype=np.float64)
+            all_amounts = np.concatenate([cached[:, 0], amounts_tao])
+            all_ts = np.concatenate([cached[:, 1].astype(np.int64), ts_arr])
+        else:
+            all_amounts, all_ts = amounts_tao, ts_arr
+
+        # Whole days since each bet, same as timedelta.days
+        days_ago = (now_ts - all_ts) // 86400
+        in_window = (days_ago >= 0) & (days_ago < 7)
+        np.add.at(daily_volumes, days_ago[in_window], all_amounts[in_window])
+        days_ago = days_ago[len(cached_rows):]
+
+        for i in range(min(len(block_nums), 20)):  # cap at 20 for display
+            event_time = datetime.utcfromtimestamp(timestamps[i])
+            print(f"  [{i}] block={block_nums[i]} amount={amounts_tao[i]:.4f} TAO "
+                  f"ts={timestamps[i]} ({event_time.isoformat()}) days_ago={days_ago[i]}")
+
+        if len(block_nums) > 20:
+            print(f"  ... and {len(block_nums) - 20} more events (not shown)")
+
+        weighted_volume = float(np.dot(daily_volumes, TIME_DECAY_WEIGHTS))
 
         print()
         print("--- Volume Summary ---")
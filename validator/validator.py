@@ -37,14 +37,19 @@ API Endpoints (default port 8000):
     GET /snapshots     - Historical weight snapshots
 """
 
-import time
+import signal
+import asyncio
+import numpy as np
 import bittensor as bt
 
 # Import base validator class which takes care of most of the boilerplate
 from taocolosseum.base.validator import BaseValidatorNeuron
 
 # Import the forward function for volume checking
-from taocolosseum.validator import forward
+from taocolosseum.validator import forward, close_contract_client
+
+# Seconds between heartbeat log lines
+HEARTBEAT_INTERVAL = 60
 
 
 class Validator(BaseValidatorNeuron):
@@ -91,12 +96,65 @@ class Validator(BaseValidatorNeuron):
         """
         return await forward(self)
 
+    async def run_async(self):
+        """Step loop plus the heartbeat task, both on the validator's event loop."""
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        try:
+            await super().run_async()
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat_loop(self):
+        """Log a heartbeat every HEARTBEAT_INTERVAL seconds until the validator exits."""
+        last_block = 0
+        while not self.should_exit:
+            try:
+                # The block read may go to the chain; keep it off the loop
+                last_block = await asyncio.to_thread(log_heartbeat, self, last_block)
+            except Exception as e:
+                bt.logging.warning(f"Heartbeat failed: {e}")
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        # Release the RPC connection pool once the forward loop has stopped
+        close_contract_client()
+
+
+def log_heartbeat(validator: Validator, last_block: int) -> int:
+    """Log a one-line status summary; returns the block it reported."""
+    # Array reductions; the volume total is kept current by forward()
+    active_miners = int(np.count_nonzero(validator.scores > 0))
+    total_volume = validator.miner_volume_totals["total"]
+    
+    # TTL-cached and shared with the weight setter, so this rarely hits the RPC
+    try:
+        last_block = validator.block
+    except Exception:
+        pass  # Use cached value
+    
+    bt.logging.info(
+        f"Heartbeat | Block: {last_block} | "
+        f"Step: {validator.step} | "
+        f"Active miners: {active_miners} | "
+        f"Total volume: {total_volume:.4f} TAO"
+    )
+    return last_block
+
+
+def _request_exit(validator: Validator):
+    """Signal handler: stop the validator cooperatively; a second signal stops it now."""
+    if validator.should_exit:
+        raise KeyboardInterrupt
+    bt.logging.info("Shutdown signal received, finishing the current step...")
+    validator.should_exit = True
+
 
 def main():
     """
     Main entry point for the TAO Colosseum validator.
     
-    Runs the validator in an infinite loop that:
+    Runs the validator on the main thread until SIGINT/SIGTERM:
     - Checks betting volumes every 5 minutes
     - Sets weights every 360 blocks (~72 min)
     - Saves snapshots when weights are committed
@@ -107,46 +165,23 @@ def main():
     bt.logging.info("TAO Colosseum Validator Starting")
     bt.logging.info("=" * 60)
     
-    with Validator() as validator:
-        bt.logging.info(f"Validator UID: {validator.uid}")
-        bt.logging.info(f"Network: {validator.subtensor.chain_endpoint}")
-        bt.logging.info(f"Netuid: {validator.config.netuid}")
-        bt.logging.info(f"API Port: {getattr(validator.config.neuron, 'api_port', 8000)}")
-        bt.logging.info("=" * 60)
-        
-        # Main loop - just keep alive, the validator handles everything
-        step = 0
-        last_block = 0
-        while True:
-            try:
-                # Log heartbeat every minute
-                if step % 60 == 0:
-                    active_miners = sum(1 for s in validator.scores if s > 0)
-                    total_volume = sum(validator.miner_volumes.values()) if validator.miner_volumes else 0
-                    
-                    # Cache block to avoid concurrent RPC calls
-                    try:
-                        last_block = validator.metagraph.block
-                    except Exception:
-                        pass  # Use cached value
-                    
-                    bt.logging.info(
-                        f"Heartbeat | Block: {last_block} | "
-                        f"Step: {validator.step} | "
-                        f"Active miners: {active_miners} | "
-                        f"Total volume: {total_volume:.4f} TAO"
-                    )
-                
-                time.sleep(1)
-                step += 1
-                
-            except KeyboardInterrupt:
-                bt.logging.info("Keyboard interrupt received, shutting down...")
-                break
-            except Exception as e:
-                bt.logging.warning(f"Error in main loop: {e}")
-            time.sleep(1)
-            step += 1
+    validator = Validator()
+    bt.logging.info(f"Validator UID: {validator.uid}")
+    bt.logging.info(f"Network: {validator.subtensor.chain_endpoint}")
+    bt.logging.info(f"Netuid: {validator.config.netuid}")
+    bt.logging.info(f"API Port: {getattr(validator.config.neuron, 'api_port', 8000)}")
+    bt.logging.info("=" * 60)
+    
+    # Ctrl-C / SIGTERM let the current step finish, then run() returns
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        validator.loop.add_signal_handler(sig, _request_exit, validator)
+    
+    # Step loop, heartbeat and API server all run on validator.loop in this thread
+    try:
+        validator.run()
+    finally:
+        validator.snapshot_writer.shutdown(wait=True)
+        close_contract_client()
 
 
 if __name__ == "__main__":